@@ -0,0 +1,111 @@
+"""
+Compares the MemoryHandler backends on a synthetic world (see synthetic_world.py).
+
+    python benchmarks/bench_backends.py [--objects 300] [--ticks 50] [--reads 20000]
+
+The world is hosted in a helper process so the live backends read across processes like they
+would from the client: pymem and ReadProcessMemory on Windows, process_vm_readv on Linux.
+The in-process image backend is the no-syscall baseline. Per backend it reports:
+  raw read   - backend.read of one 4-byte field + unpack_from (no page cache), us per read
+  tick       - ObjectManager.refresh() + full get_objects() walk with the page cache, ms per tick
+"""
+import argparse
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import offsets
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend, PymemBackend, ProcessVmBackend, Win32Backend
+from object_manager import ObjectManager
+import synthetic_world
+
+UINT = struct.Struct('<I')
+
+
+def start_host(image_path: str) -> subprocess.Popen:
+    """Starts the helper process hosting the image and waits until it is mapped."""
+    host = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'synthetic_world.py'),
+                             'host', image_path], stdout=subprocess.PIPE, text=True)
+    if host.stdout.readline().strip() != 'ready':
+        host.kill()
+        raise RuntimeError("Helper process could not map the synthetic world")
+    return host
+
+
+def open_backends(image_path: str, pid: int):
+    """(name, backend or None, skip reason) for every backend this platform can try."""
+    yield "image", MemoryImageBackend(image_path), None
+    live = [("process_vm", lambda: ProcessVmBackend(pid), sys.platform.startswith('linux')),
+            ("pymem", lambda: PymemBackend('python.exe', pid), sys.platform == 'win32'),
+            ("win32", lambda: Win32Backend('python.exe', pid), sys.platform == 'win32')]
+    for name, factory, supported in live:
+        if not supported:
+            yield name, None, f"not available on {sys.platform}"
+            continue
+        try:
+            backend = factory()
+        except Exception as e:
+            yield name, None, str(e)
+            continue
+        backend.base_address = synthetic_world.IMAGE_BASE # Helper's own exe isn't the client module
+        yield name, backend, None
+
+
+def bench_raw_reads(backend, count: int, reads: int) -> float:
+    """us per backend.read + decode, cycling through every unit's health field."""
+    addresses = [synthetic_world.UNIT_FIELD_AREA + (i % count) * 0x1000 + offsets.UNIT_FIELD_HEALTH for i in range(reads)]
+    read = backend.read
+    unpack_from = UINT.unpack_from
+    start = time.perf_counter()
+    for address in addresses:
+        unpack_from(read(address, 4))
+    return (time.perf_counter() - start) / reads * 1e6
+
+
+def bench_ticks(backend, ticks: int) -> tuple:
+    """ms per refresh + walk, and objects seen per walk."""
+    om = ObjectManager(MemoryHandler(backend=backend))
+    om.refresh()
+    seen = len(list(om.get_objects())) # Warm-up: fills the object cache and name lookups
+    start = time.perf_counter()
+    for _ in range(ticks):
+        om.refresh()
+        seen = len(list(om.get_objects()))
+    return (time.perf_counter() - start) / ticks * 1000, seen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--objects', type=int, default=300)
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--reads', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = os.path.join(directory, 'world')
+        synthetic_world.build_world(image_path, args.objects)
+        host = start_host(image_path)
+        try:
+            print(f"Synthetic world: {args.objects} objects, host PID {host.pid}")
+            print(f"{'backend':<12} {'raw read':>10} {'tick':>10} {'objects':>8}")
+            for name, backend, reason in open_backends(image_path, host.pid):
+                if backend is None:
+                    print(f"{name:<12} skipped ({reason})")
+                    continue
+                raw_us = bench_raw_reads(backend, args.objects, args.reads)
+                tick_ms, seen = bench_ticks(backend, args.ticks)
+                print(f"{name:<12} {raw_us:8.2f}us {tick_ms:8.2f}ms {seen:8d}")
+                backend.close()
+        finally:
+            host.kill()
+            host.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Serial vs sharded per-object reads (update_dynamic_batch with ObjectManager's read pool) on
+synthetic worlds of 50 to 2000 units (see synthetic_world.py).
+
+    python benchmarks/bench_parallel_reads.py [--counts 50,100,250,500,1000,2000] [--workers 0,2,4,8] [--ticks 20]
+
+The world is hosted in a helper process and read through the platform's live backend
+(process_vm_readv on Linux, ReadProcessMemory on Windows), so reads are real syscalls that
+release the GIL. Per object count and pool size it reports ms per batch update of every unit:
+  cold       - empty page cache: every page is fetched by the reading threads (the Windows
+               path, where the backend doesn't batch and prefetch is a no-op)
+  prefetched - pages fetched first in read_batch shards on the pool, as refresh() does on
+               batching backends; the reads left are page cache hits (pure Python, GIL-bound)
+Threads can only overlap the syscalls, so the speedup depends on the core count (printed).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory import MemoryHandler
+from object_manager import ObjectManager
+from wow_object import update_dynamic_batch
+import synthetic_world
+from bench_backends import open_backends, start_host
+
+
+def live_backend(image_path: str, pid: int):
+    """The first live backend this platform can open (falls back to the in-process image)."""
+    fallback = None
+    for name, backend, _ in open_backends(image_path, pid):
+        if backend is None: continue
+        if name == "image":
+            fallback = (name, backend)
+            continue
+        if fallback is not None: fallback[1].close()
+        return name, backend
+    return fallback
+
+
+def bench_batch(om: ObjectManager, objects, ticks: int, prefetch: bool) -> float:
+    """ms per update_dynamic_batch of `objects` with the OM's current read pool."""
+    mem = om.mem
+    elapsed = 0.0
+    for _ in range(ticks):
+        mem.begin_tick() # Cold page cache
+        start = time.perf_counter()
+        if prefetch:
+            ranges = []
+            for obj in objects: ranges.extend(obj.dynamic_read_ranges())
+            mem.prefetch(ranges, om.read_executor, om.read_workers)
+        update_dynamic_batch(objects, om.read_executor, om.read_workers, om.parallel_threshold)
+        elapsed += time.perf_counter() - start
+    return elapsed / ticks * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', default="50,100,250,500,1000,2000")
+    parser.add_argument('--workers', default="0,2,4,8")
+    parser.add_argument('--ticks', type=int, default=20)
+    args = parser.parse_args()
+    counts = [int(count) for count in args.counts.split(',')]
+    pool_sizes = [int(workers) for workers in args.workers.split(',')]
+
+    print(f"{'objects':>8} {'workers':>8} {'cold':>10} {'prefetched':>11} {'speedup':>8}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            image_path = os.path.join(directory, 'world')
+            synthetic_world.build_world(image_path, count)
+            host = start_host(image_path)
+            try:
+                name, backend = live_backend(image_path, host.pid)
+                om = ObjectManager(MemoryHandler(backend=backend))
+                om.refresh()
+                om.scan_objects()
+                objects = list(om.object_cache.values())
+                serial = None
+                for workers in pool_sizes:
+                    om.set_parallel_reads(workers, threshold=1) # Always shard: the threshold is what's being measured
+                    bench_batch(om, objects, 2, False) # Warm-up (pool threads started)
+                    cold = bench_batch(om, objects, args.ticks, False)
+                    prefetched = bench_batch(om, objects, args.ticks, True)
+                    serial = cold if serial is None else serial
+                    print(f"{len(objects):8d} {om.read_workers:8d} {cold:8.2f}ms {prefetched:9.2f}ms {serial / cold:7.2f}x")
+                om.close()
+                backend.close()
+            finally:
+                host.kill()
+                host.wait()
+    print(f"(backend: {name}, {os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Synthetic client memory for benchmarks: builds a memory image (memory_backends.save_memory_image
+format) with a client connection, object manager (list and GUID hash table), `count` units with
+unit fields, positions and names, followed by `extra` GameObjects / DynamicObjects / Corpses
+(a city's worth of non-unit nodes), laid out at the addresses offsets.py expects.
+
+    python benchmarks/synthetic_world.py build <image path> [count] [extra]
+    python benchmarks/synthetic_world.py host <image path>
+
+`host` maps the image at its original addresses inside a helper process and waits, so the live
+backends (pymem, ReadProcessMemory, process_vm_readv) can be pointed at its PID.
+"""
+import json
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import offsets
+from memory_backends import save_memory_image
+
+# --- Synthetic Layout ---
+IMAGE_BASE = 0x400000
+CLIENT_CONNECTION = 0x01000000
+OBJECT_MANAGER = 0x02000000
+OBJECT_AREA = 0x03000000 # One 0x1000 block per object
+UNIT_FIELD_AREA = 0x04000000 # One 0x1000 block per object
+NAME_AREA = 0x05000000 # One 0x100 creature cache entry per object
+HASH_AREA = 0x06000000 # GUID -> object hash table buckets (12 bytes each)
+HASH_LINK_OFFSET = 0x50 # Hash chain link inside the object: next node at base + 0x54
+LOCAL_PLAYER_GUID = 0x100
+HOST_GRANULARITY = 0x10000 # VirtualAlloc reservation granularity (also fine for mmap)
+
+
+class _Image:
+    """Writable regions keyed by start address."""
+
+    def __init__(self):
+        self.regions = {}
+
+    def add(self, address: int, size: int):
+        self.regions[address] = bytearray(size)
+
+    def put(self, address: int, data: bytes):
+        for start, block in self.regions.items():
+            if start <= address and address + len(data) <= start + len(block):
+                block[address - start:address - start + len(data)] = data
+                return
+        raise KeyError(f"{hex(address)} is outside the synthetic image")
+
+
+def build_world(path: str, count: int = 300, extra: int = 0, frame: int = 0):
+    """
+    Writes a synthetic world with `count` units (the first one is the local player) and `extra`
+    non-unit objects (types 5/6/7 in turn, after the units in the list) to `path`. A non-zero
+    `frame` maps offsets.FRAME_TIMESTAMP with that value: every refresh after the first is then
+    a same-frame skip, so benchmarks leave it unmapped.
+    """
+    total = count + extra
+    image = _Image()
+    image.add(offsets.STATIC_CLIENT_CONNECTION & ~0xFFF, 0x2000)
+    image.add(offsets.LOCAL_TARGET_GUID_STATIC & ~0xFFF, 0x1000)
+    image.add(CLIENT_CONNECTION, 0x3000)
+    image.add(OBJECT_MANAGER, 0x1000)
+    image.add(OBJECT_AREA, total * 0x1000)
+    image.add(UNIT_FIELD_AREA, total * 0x1000)
+    image.add(NAME_AREA, count * 0x100)
+    bucket_count = 1 << max(4, (total - 1).bit_length()) # Power of two >= total
+    image.add(HASH_AREA, bucket_count * 12)
+    if frame: image.add(offsets.FRAME_TIMESTAMP & ~0xFFF, 0x1000)
+
+    image.put(offsets.STATIC_CLIENT_CONNECTION, struct.pack('<I', CLIENT_CONNECTION))
+    image.put(CLIENT_CONNECTION + offsets.OBJECT_MANAGER_OFFSET, struct.pack('<I', OBJECT_MANAGER))
+    image.put(OBJECT_MANAGER + offsets.FIRST_OBJECT_OFFSET, struct.pack('<I', OBJECT_AREA))
+    image.put(OBJECT_MANAGER + offsets.LOCAL_GUID_OFFSET, struct.pack('<Q', LOCAL_PLAYER_GUID))
+    image.put(offsets.LOCAL_TARGET_GUID_STATIC, struct.pack('<Q', LOCAL_PLAYER_GUID + 1))
+    if frame: image.put(offsets.FRAME_TIMESTAMP, struct.pack('<I', frame))
+    image.put(OBJECT_MANAGER + offsets.OBJECT_HASH_BUCKETS_OFFSET, struct.pack('<I', HASH_AREA))
+    image.put(OBJECT_MANAGER + offsets.OBJECT_HASH_MASK_OFFSET, struct.pack('<I', bucket_count - 1))
+    chains = {} # bucket -> object bases, in chain order
+
+    for i in range(count):
+        base = OBJECT_AREA + i * 0x1000
+        fields = UNIT_FIELD_AREA + i * 0x1000
+        name_entry = NAME_AREA + i * 0x100
+        image.put(base + offsets.OBJECT_UNIT_FIELDS, struct.pack('<I', fields))
+        image.put(base + offsets.OBJECT_TYPE, struct.pack('<I', 4 if i == 0 else 3)) # Player / unit
+        image.put(base + offsets.OBJECT_GUID, struct.pack('<Q', LOCAL_PLAYER_GUID + i))
+        image.put(base + offsets.NEXT_OBJECT_OFFSET, struct.pack('<I', base + 0x1000 if i < total - 1 else 0))
+        image.put(base + offsets.OBJECT_POS_X, struct.pack('<f', (i % 20) * 5.0))
+        image.put(base + offsets.OBJECT_POS_Y, struct.pack('<f', (i // 20) * 5.0))
+        image.put(base + offsets.UNIT_NAME_CACHE_OFFSET, struct.pack('<I', name_entry))
+        image.put(name_entry + offsets.UNIT_NAME_STRING_OFFSET, struct.pack('<I', name_entry + 0x80))
+        image.put(name_entry + 0x80, b'Mob%d\0' % i)
+        image.put(fields + offsets.UNIT_FIELD_HEALTH, struct.pack('<I', 100 + i))
+        image.put(fields + offsets.UNIT_FIELD_MAXHEALTH, struct.pack('<I', 200 + i))
+        image.put(fields + offsets.UNIT_FIELD_LEVEL, struct.pack('<I', 80))
+        chains.setdefault((LOCAL_PLAYER_GUID + i) & (bucket_count - 1), []).append(base)
+    for i in range(count, total):
+        base = OBJECT_AREA + i * 0x1000
+        fields = UNIT_FIELD_AREA + i * 0x1000
+        object_type = 5 + (i - count) % 3 # GameObject / DynamicObject / Corpse
+        image.put(base + offsets.OBJECT_UNIT_FIELDS, struct.pack('<I', fields))
+        image.put(base + offsets.OBJECT_TYPE, struct.pack('<I', object_type))
+        image.put(base + offsets.OBJECT_GUID, struct.pack('<Q', LOCAL_PLAYER_GUID + i))
+        image.put(base + offsets.NEXT_OBJECT_OFFSET, struct.pack('<I', base + 0x1000 if i < total - 1 else 0))
+        image.put(base + offsets.GAMEOBJECT_POS_X, struct.pack('<fff', (i % 20) * 5.0, (i // 20) * 5.0, 0.0))
+        if object_type == 6: image.put(fields + offsets.DYNAMICOBJECT_FIELD_SPELL_ID, struct.pack('<I', 1000 + i))
+        chains.setdefault((LOCAL_PLAYER_GUID + i) & (bucket_count - 1), []).append(base)
+    for bucket, bases in chains.items():
+        image.put(HASH_AREA + bucket * 12, struct.pack('<III', HASH_LINK_OFFSET, 0, bases[0]))
+        for base, next_base in zip(bases, bases[1:] + [1]): # Low bit set = end of chain
+            image.put(base + HASH_LINK_OFFSET + 4, struct.pack('<I', next_base))
+    save_memory_image(path, [(start, bytes(block)) for start, block in image.regions.items()], IMAGE_BASE)
+
+
+def _host_ranges(regions):
+    """Image regions rounded out to HOST_GRANULARITY and merged -> (start, size) allocations."""
+    ranges = []
+    for start, size, _ in sorted(regions):
+        low = start & ~(HOST_GRANULARITY - 1)
+        high = (start + size + HOST_GRANULARITY - 1) & ~(HOST_GRANULARITY - 1)
+        if ranges and low <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], high)
+        else:
+            ranges.append([low, high])
+    return [(low, high - low) for low, high in ranges]
+
+
+def host_image(path: str):
+    """Maps the image at its recorded addresses in this process (fixed-address allocations)."""
+    import ctypes
+    with open(path + '.json', 'r') as f:
+        index = json.load(f)
+    with open(path + '.bin', 'rb') as f:
+        blob = f.read()
+
+    if sys.platform == 'win32':
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.VirtualAlloc.restype = ctypes.c_void_p
+        kernel32.VirtualAlloc.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32, ctypes.c_uint32]
+        allocate = lambda start, size: kernel32.VirtualAlloc(start, size, 0x3000, 0x04) # MEM_COMMIT|MEM_RESERVE, PAGE_READWRITE
+    else:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+        # PROT_READ|PROT_WRITE, MAP_PRIVATE|MAP_ANONYMOUS|MAP_FIXED_NOREPLACE
+        allocate = lambda start, size: libc.mmap(start, size, 0x3, 0x22 | 0x100000, -1, 0)
+
+    for start, size in _host_ranges(index['regions']):
+        if allocate(start, size) != start:
+            raise OSError(f"Could not map {hex(start)}-{hex(start + size)} (address in use?)")
+    for start, size, file_offset in index['regions']:
+        ctypes.memmove(start, blob[file_offset:file_offset + size], size)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ('build', 'host'):
+        print(__doc__)
+        sys.exit(1)
+    if sys.argv[1] == 'build':
+        build_world(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 300, int(sys.argv[4]) if len(sys.argv) > 4 else 0)
+    else:
+        host_image(sys.argv[2])
+        print("ready", flush=True) # Parent waits for this line
+        while True: time.sleep(60)
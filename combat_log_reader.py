@@ -5,8 +5,7 @@ import traceback # Import traceback
 from typing import Optional, Generator, Tuple, Any, TYPE_CHECKING
 
 import offsets
-from memory import MemoryHandler
-import pymem # For exceptions
+from memory import MemoryHandler, MemoryReadError
 
 # Use TYPE_CHECKING to avoid circular imports during runtime
 if TYPE_CHECKING:
@@ -129,7 +128,7 @@ class CombatLogReader:
 
             self.initialized = True
 
-        except pymem.exception.MemoryReadError as e:
+        except MemoryReadError as e:
             # self.app.log_message(f"{log_prefix} MemoryReadError: {e}", "ERROR")
             self.initialized = False
         except Exception as e:
@@ -160,8 +159,11 @@ class CombatLogReader:
             # --- Get the current head and tail pointers using the correct offsets --- #
             head_ptr_addr = manager_addr + offsets.COMBAT_LOG_LIST_HEAD_OFFSET
             tail_ptr_addr = manager_addr + offsets.COMBAT_LOG_LIST_TAIL_OFFSET
-            current_head_node_addr = self.mem.read_uint(head_ptr_addr)
-            target_tail_node_addr = self.mem.read_uint(tail_ptr_addr)
+            with self.mem.tagged("combatlog"):
+                current_head_node_addr, target_tail_node_addr = self.mem.read_many([
+                    (head_ptr_addr, 'uint'),
+                    (tail_ptr_addr, 'uint'),
+                ])
             # logger.debug(f"Read Head: {current_head_node_addr:#x}, Tail: {target_tail_node_addr:#x}, LastRead: {self.last_read_node_addr:#x}") # Commented out
 
             # --- Determine starting point --- #
@@ -184,7 +186,7 @@ class CombatLogReader:
                         return
                     current_node_addr = next_node_addr_check
                     # logger.debug(f"Resuming read from node after last read: {current_node_addr:#x}") # Commented out
-                except pymem.exception.MemoryReadError:
+                except MemoryReadError:
                     logger.warning(f"Failed to read next from last node {self.last_read_node_addr:#x}. Resyncing from head.")
                     current_node_addr = current_head_node_addr
                     self.last_read_node_addr = 0
@@ -195,13 +197,14 @@ class CombatLogReader:
 
             # logger.debug(f"Starting iteration loop with current_node_addr: {current_node_addr:#x}") # Commented out
             # --- Iterate until we reach the current tail --- #
-            while current_node_addr != 0 and current_node_addr % 2 == 0 and processed_count < max_process_per_tick:
+            while self.mem.is_valid_pointer(current_node_addr) and processed_count < max_process_per_tick:
                 # logger.debug(f"Looping: Processing node {current_node_addr:#x}") # Commented out
                 node_to_process = current_node_addr
 
                 # --- Read Data (Read the entire node structure) ---
                 node_size = ctypes.sizeof(CombatLogEventNode)
-                raw_data = self.mem.read_bytes(node_to_process, node_size)
+                with self.mem.tagged("combatlog"): # Not held across the yield below
+                    raw_data = self.mem.read_bytes(node_to_process, node_size)
 
                 if raw_data and len(raw_data) == node_size:
                     try:
@@ -232,12 +235,15 @@ class CombatLogReader:
                     break
 
                 # --- Move to next node using the correct offset (0x4) from the struct --- #
-                # Need to read the raw pointer first before accessing the potentially invalid struct
+                # The node read above already contains the next pointer; only re-read it if that read failed
                 try:
-                    next_node_addr = self.mem.read_uint(node_to_process + offsets.COMBAT_LOG_EVENT_NEXT_OFFSET)
+                    if raw_data and len(raw_data) == node_size:
+                        next_node_addr = int.from_bytes(raw_data[offsets.COMBAT_LOG_EVENT_NEXT_OFFSET:offsets.COMBAT_LOG_EVENT_NEXT_OFFSET + 4], 'little')
+                    else:
+                        next_node_addr = self.mem.read_uint(node_to_process + offsets.COMBAT_LOG_EVENT_NEXT_OFFSET)
                     # logger.debug(f"Moving to next node: {next_node_addr:#x}") # Commented out
                     current_node_addr = next_node_addr
-                except pymem.exception.MemoryReadError as read_next_err:
+                except MemoryReadError as read_next_err:
                     logger.error(f"Failed to read next node pointer from {node_to_process:#x}: {read_next_err}. Breaking loop.")
                     self.last_read_node_addr = 0 # Reset on error
                     break # Cannot continue if next pointer is unreadable
@@ -254,7 +260,7 @@ class CombatLogReader:
                  logger.warning(f"Hit combat log processing limit ({max_process_per_tick}). Some events might be delayed.") # Change to Warning
                  pass
 
-        except pymem.exception.MemoryReadError as e:
+        except MemoryReadError as e:
             logger.error(f"MemoryReadError during update: {e} near node {current_node_addr:#x} (target tail: {target_tail_node_addr:#x})")
             self.last_read_node_addr = 0 # Reset on error to force resync
         except Exception as e:
@@ -2,24 +2,35 @@ import os # Needed for checking file existence
 import time # May be needed for delays or GCD tracking
 import json # For handling potential rule files
 import sys # Added sys import
+import math
 from memory import MemoryHandler
 from object_manager import ObjectManager
 # from luainterface import LuaInterface # Old
 from gameinterface import GameInterface # New
 # from rules import Rule, ConditionChecker # Import rule processing - ConditionChecker removed
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, FrozenSet, Set
 
 # Project Modules
 from wow_object import WowObject # Import for type constants like POWER_RAGE
+from world_snapshot import WorldStateProducer, WorldSnapshot, SNAPSHOT_MAX_AGE
+
+# --- AoE Condition Settings ---
+AOE_RADIUS = 8.0                    # Yards: "Enemies Within 8yd" (Whirlwind, Fan of Knives, Blizzard-sized)
+FRONTAL_CONE_RADIUS = 8.0           # Yards: "Enemies In Front" (Cleave, Swipe, Cone of Cold)
+FRONTAL_CONE_ANGLE = math.pi / 2    # Total cone width (90 degrees, centred on the player's facing)
 
 class CombatRotation:
     """
     Manages and executes combat rotations, either via loaded Lua scripts
     or a defined set of prioritized rules.
     """
-    def __init__(self, mem: MemoryHandler, om: ObjectManager, game: GameInterface, logger_func: Callable[[str, str], None]):
+    def __init__(self, mem: MemoryHandler, om: ObjectManager, game: GameInterface, logger_func: Callable[[str, str], None],
+                 snapshots: Optional[WorldStateProducer] = None):
         self.mem = mem
         self.om = om
+        # World state comes from the producer's latest snapshot (never read from memory on this thread)
+        self.snapshots = snapshots
+        self.snapshot: Optional[WorldSnapshot] = None # Snapshot the current run() works on
         self.game = game
         self.log = logger_func # Store the passed-in logger function
         # Removed self.condition_checker - logic moved into _check_rule_conditions
@@ -38,6 +49,10 @@ class CombatRotation:
         self.gcd_duration = 1.5                # Default GCD in seconds (Needs dynamic update later)
         # Use spell ID as key for internal cooldown tracking
         self.last_spell_executed_time: dict[int, float] = {}
+        # Spellbook-dependent state, rebuilt only when snapshot.spellbook_version changes
+        self._spellbook_version: Optional[int] = None # Last version seen (a change invalidates game spell info)
+        self._rules_checked_version: Optional[int] = None # Version the loaded rules were validated against
+        self._unknown_spell_rules: Set[int] = set() # Indices of Spell rules whose spell is not in the spellbook
 
 
     def load_rotation_script(self, script_path: str) -> bool:
@@ -65,6 +80,7 @@ class CombatRotation:
         self.rotation_rules = rules
         self._clear_engine_script() # Clear script in engine when loading rules
         self.last_spell_executed_time.clear() # Reset internal cooldown tracking
+        self._rules_checked_version = None # Validate against the spellbook on the next run
         print(f"Loaded {len(rules)} rotation rules into engine.", file=sys.stderr)
 
     def _clear_engine_script(self):
@@ -76,6 +92,8 @@ class CombatRotation:
          """Clears loaded rule data FROM THE ENGINE."""
          self.rotation_rules = []
          self.last_spell_executed_time.clear()
+         self._unknown_spell_rules.clear()
+         self._rules_checked_version = None
 
     def _clear_engine_rotation(self):
         """Clears both script and rule data FROM THE ENGINE."""
@@ -86,7 +104,15 @@ class CombatRotation:
         """Executes the loaded rotation logic (prioritizes rules over script)."""
         # print("[Run] Entering run method", file=sys.stderr) # Debug Entry
 
-        player = self.om.local_player
+        # One snapshot per run: every rule and condition this tick sees the same world state
+        snapshot = self.snapshots.latest if self.snapshots else None
+        if snapshot is None or snapshot.age > SNAPSHOT_MAX_AGE:
+            # print("[Run] Exiting: No recent world snapshot.", file=sys.stderr) # DEBUG
+            return
+        self.snapshot = snapshot
+        self._sync_spellbook(snapshot)
+
+        player = snapshot.player
         # print(f"[Run] Player object: {'Exists' if player else 'None'}", file=sys.stderr) # Debug Player Check 1
         if not player:
             # print("[Run] Exiting: No local player found.", file=sys.stderr) # DEBUG
@@ -120,6 +146,29 @@ class CombatRotation:
             pass # No rotation active
 
 
+    def _sync_spellbook(self, snapshot: WorldSnapshot):
+        """Rebuilds spellbook-dependent caches, but only after the spellbook changed (talent swap, level-up)."""
+        version = snapshot.spellbook_version
+        if version != self._spellbook_version:
+            if self._spellbook_version is not None and self.game:
+                self.game.invalidate_spell_info() # Cast times, ranges and costs may differ now
+            self._spellbook_version = version
+        if self._rules_checked_version != version:
+            self._validate_rules(snapshot.known_spells)
+            self._rules_checked_version = version
+
+    def _validate_rules(self, known_spells: FrozenSet[int]):
+        """Marks Spell rules whose spell is not known (skipped by the engine). No-op while the spellbook is unread."""
+        self._unknown_spell_rules.clear()
+        if not known_spells: return
+        for index, rule in enumerate(self.rotation_rules):
+            if rule.get("action") != "Spell": continue
+            try: spell_id = int(rule.get("detail"))
+            except (ValueError, TypeError): continue # Reported by _execute_rule_action
+            if spell_id not in known_spells:
+                self._unknown_spell_rules.add(index)
+                print(f"[Rotation] Rule {index + 1}: spell {spell_id} is not in the spellbook, skipping it.", file=sys.stderr)
+
     def _execute_rule_engine(self):
         """Runs the rule-based rotation logic."""
         # print("[Engine] Entering _execute_rule_engine", file=sys.stderr) # Debug Entry
@@ -135,7 +184,7 @@ class CombatRotation:
             # print(f"[Engine] Exiting: On GCD ({gcd_remaining:.2f}s remaining)", file=sys.stderr) # DEBUG
              return # Still on GCD
 
-        player = self.om.local_player # Get player reference
+        player = self.snapshot.player # Get player reference
         if not player:
             # print("[Engine] Exiting: Player object not found within engine loop.", file=sys.stderr) # DEBUG
             return # Should not happen if run() checked, but safety first
@@ -157,7 +206,8 @@ class CombatRotation:
         # print("[Engine] Passed global checks, iterating rules...", file=sys.stderr) # Should see this if checks pass
         # --- Iterate Rules by Priority --- 
         # Assumes self.rotation_rules is ordered by priority (index 0 highest)
-        for rule in self.rotation_rules:
+        for index, rule in enumerate(self.rotation_rules):
+            if index in self._unknown_spell_rules: continue # Spell not learned (see _validate_rules)
             # Added detailed logging for this specific condition
             # print("[Condition] Checking rule:", rule, file=sys.stderr) # Debug Spam
             spell_id = rule.get("detail") if rule.get("action") == "Spell" else None
@@ -179,7 +229,7 @@ class CombatRotation:
             # Does any condition require the target?
             # conditions_require_target = any(c.get("condition", "").startswith("Target") for c in rule.get("conditions", []))
             # if (needs_om_target or conditions_require_target) and self.om.target is None:
-            if needs_om_target and self.om.target is None: # Simplified: Only check if rule targets 'target' explicitly
+            if needs_om_target and self.snapshot.target is None: # Simplified: Only check if rule targets 'target' explicitly
                  # print(f"[Engine] Skipping rule for {action_type}:{spell_id} - Rule targets 'target', but no target selected.", file=sys.stderr)
                  continue # Skip this rule if it needs a target and none exists
             # ------------------------------------------------------------------------ #
@@ -221,12 +271,12 @@ class CombatRotation:
             return True
 
         # Resolve target object ONCE for all conditions in this rule
-        player = self.om.local_player # Get local player ref
+        player = self.snapshot.player # Get local player ref
         if not player: return False # Need player for player-based checks
 
         target_obj = None
         if target_unit_str == "target":
-            target_obj = self.om.target # Fetch current target from OM
+            target_obj = self.snapshot.target # Current target from the snapshot
         elif target_unit_str == "player":
             target_obj = player
         # TODO: Add focus, pet, mouseover later
@@ -325,6 +375,16 @@ class CombatRotation:
                 mana_pct = (player.energy / max_mana) * 100
                 return mana_pct < float(value_x)
             except: return False
+        if condition_str == "Enemies Within 8yd >= X":
+             if value_x is None: return False
+             try: return len(self.snapshot.within_radius(AOE_RADIUS, enemies_only=True)) >= int(value_x)
+             except: return False
+        if condition_str == "Enemies In Front >= X":
+             if value_x is None: return False
+             try:
+                 count = self.snapshot.count_in_cone(player.rotation, FRONTAL_CONE_ANGLE, FRONTAL_CONE_RADIUS, enemies_only=True)
+                 return count >= int(value_x)
+             except: return False
         if condition_str == "Player Mana % > X":
             if value_x is None: return False
             if player.power_type != WowObject.POWER_MANA: return False
@@ -394,13 +454,13 @@ class CombatRotation:
         if condition_str == "Target Distance < X":
              if value_x is None: return False
              try:
-                  dist = self.om.calculate_distance(target_obj)
+                  dist = self.snapshot.distance(target_obj)
                   return dist >= 0 and dist < float(value_x)
              except: return False
         if condition_str == "Target Distance > X":
              if value_x is None: return False
              try:
-                  dist = self.om.calculate_distance(target_obj)
+                  dist = self.snapshot.distance(target_obj)
                   return dist >= 0 and dist > float(value_x)
              except: return False
         if condition_str == "Target Has Aura":
@@ -519,9 +579,9 @@ class CombatRotation:
         if action_type == "Spell":
             # Resolve target object just before the action
             target_obj = None
-            player = self.om.local_player
+            player = self.snapshot.player
             if target_unit_str == "target":
-                target_obj = self.om.target # Fetch current target from OM
+                target_obj = self.snapshot.target # Current target from the snapshot
             elif target_unit_str == "player":
                 target_obj = player
             # TODO: Add focus, pet, mouseover later
@@ -64,6 +64,7 @@ class GameInterface:
     def __init__(self, mem_handler: MemoryHandler):
         self.mem = mem_handler # Keep mem_handler reference if needed elsewhere
         self.pipe_handle: Optional[wintypes.HANDLE] = None # Initialize pipe handle
+        self._spell_info_cache: Dict[int, dict] = {} # spell_id -> GET_SPELL_INFO result (see invalidate_spell_info)
         # Removed Lua state, VirtualFree, and other shellcode-related initializations
 
         # Attempt initial connection? Optional, or connect explicitly later.
@@ -601,7 +602,24 @@ class GameInterface:
         Command: "GET_SPELL_INFO:<spell_id>"
         Response: "SPELLINFO:<name>,<rank>,<castTime_ms>,<minRange>,<maxRange>,<icon>,<cost>,<powerType>"
                   or "SPELLINFO_ERR:<message>"
+        Successful results are cached until invalidate_spell_info() (cast time, range and cost
+        only change with talents or level, i.e. when the spellbook changes).
         """
+        cached = self._spell_info_cache.get(spell_id)
+        if cached is not None:
+            return dict(cached)
+        info = self._query_spell_info(spell_id)
+        if info is not None:
+            self._spell_info_cache[spell_id] = info
+            return dict(info)
+        return None
+
+    def invalidate_spell_info(self):
+        """Drops cached spell info (call when ObjectManager.spellbook_changed())."""
+        self._spell_info_cache.clear()
+
+    def _query_spell_info(self, spell_id: int) -> Optional[dict]:
+        """GET_SPELL_INFO round trip for get_spell_info."""
         command = f"GET_SPELL_INFO:{spell_id}"
         response = self.send_receive(command, timeout_ms=1000) # Use a reasonable timeout
 
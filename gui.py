@@ -14,13 +14,15 @@ import sv_ttk # Import the theme library
 
 # Project Modules
 from memory import MemoryHandler, PROCESS_NAME
+from signature_scanner import SignatureScanner, SIGNATURES
 from object_manager import ObjectManager
 from gameinterface import GameInterface
-from wow_object import WowObject
+from wow_object import WowObject, PARALLEL_READ_WORKERS, PARALLEL_READ_THRESHOLD
 from combat_rotation import CombatRotation
 from rules import Rule # Keep Rule for potential type hints if needed
 from targetselector import TargetSelector
 from combat_log_reader import CombatLogReader # <-- Import CombatLogReader
+from world_snapshot import WorldStateProducer, SNAPSHOT_RATE_HZ
 
 # Import Tab Handlers
 from gui.monitor_tab import MonitorTab
@@ -157,7 +159,7 @@ class WowMonitorApp:
             "Player Mana % > X", "Player Combo Points >= X",
             "Target Distance < X", "Target Distance > X", "Target Has Aura",
             "Target Missing Aura", "Player Has Aura", "Player Missing Aura",
-            "Player Is Behind Target",
+            "Player Is Behind Target", "Enemies Within 8yd >= X", "Enemies In Front >= X",
         ]
         self.rule_actions = ["Spell", "Macro", "Lua"]
         self.rule_targets = ["target", "player", "focus", "pet", "mouseover"]
@@ -184,6 +186,7 @@ class WowMonitorApp:
         self.combat_rotation: Optional[CombatRotation] = None
         self.target_selector: Optional[TargetSelector] = None
         self.combat_log_reader: Optional[CombatLogReader] = None
+        self.producer: Optional[WorldStateProducer] = None # Acquisition thread: refresh + snapshots + combat log
         self.rotation_running = False
         self.loaded_script_path = self.config.get('Rotation', 'last_script', fallback=None)
         self.update_job = None
@@ -311,6 +314,15 @@ class WowMonitorApp:
                  self.config.set('GUI', 'geometry', self.root.geometry())
             if not self.config.has_section('Rotation'): self.config.add_section('Rotation')
             self.config.set('Rotation', 'last_script', self.loaded_script_path if self.loaded_script_path else "")
+            if not self.config.has_section('Diagnostics'): self.config.add_section('Diagnostics')
+            self.config.set('Diagnostics', 'read_stats', str(self.log_tab_handler.read_stats_var.get()))
+            self.config.set('Diagnostics', 'read_stats_interval', str(self.log_tab_handler.read_stats_interval))
+            if not self.config.has_section('Snapshot'): self.config.add_section('Snapshot')
+            if self.producer: self.config.set('Snapshot', 'rate_hz', f"{1.0 / self.producer.interval:g}")
+            if not self.config.has_section('Performance'): self.config.add_section('Performance')
+            if self.om:
+                self.config.set('Performance', 'read_workers', str(self.om.read_workers))
+                self.config.set('Performance', 'parallel_threshold', str(self.om.parallel_threshold))
             with open(self.config_file, 'w') as configfile:
                 self.config.write(configfile)
             self.log_message("Configuration saved.", "INFO") # Log success
@@ -335,6 +347,14 @@ class WowMonitorApp:
                     return False
                 self.log_message(f"{log_prefix} Attached to WoW process.", "INFO")
 
+                # 1.2 Resolve signature-based offsets (cold scan once per client build, then from offset_cache.json)
+                try:
+                    resolved = SignatureScanner(self.mem).resolve_offsets()
+                    if resolved: self.log_message(f"{log_prefix} Resolved {len(resolved)} offsets from signatures.", "INFO")
+                    elif not SIGNATURES: self.log_message(f"{log_prefix} No offset signatures registered, using offsets.py values.", "INFO")
+                except Exception as e:
+                    self.log_message(f"{log_prefix} Signature scan failed, using offsets.py values: {e}", "WARN")
+
                 # 1.5 Initialize Combat Log Reader (Needs MemoryHandler)
                 if not self.combat_log_reader:
                     self.log_message(f"{log_prefix} Initializing CombatLogReader...", "DEBUG")
@@ -355,6 +375,11 @@ class WowMonitorApp:
                     self.log_message(f"{log_prefix} Failed init ObjectManager. Offsets ok?", "ERROR")
                     return False
                 self.log_message(f"{log_prefix} ObjectManager initialized.", "INFO")
+                # Optional parallel per-object reads (before the producer thread starts refreshing)
+                read_workers = self.config.getint('Performance', 'read_workers', fallback=PARALLEL_READ_WORKERS)
+                self.om.set_parallel_reads(read_workers, self.config.getint('Performance', 'parallel_threshold', fallback=PARALLEL_READ_THRESHOLD))
+                if self.om.read_workers:
+                    self.log_message(f"{log_prefix} Parallel object reads: {self.om.read_workers} threads from {self.om.parallel_threshold} objects.", "INFO")
             # 3. Game Interface
             if not self.game:
                 self.log_message(f"{log_prefix} Initializing GameInterface...", "DEBUG")
@@ -369,21 +394,32 @@ class WowMonitorApp:
                 else:
                      self.log_message(f"{log_prefix} IPC Pipe connect FAILED. DLL injected?", "ERROR")
             else: self.log_message(f"{log_prefix} IPC Pipe already connected.", "DEBUG")
-            # 5. Target Selector
+            # 5. World State Producer (the only thread refreshing the OM from here on)
+            if self.om and self.om.is_ready() and (not self.producer or self.producer.om is not self.om):
+                if self.producer: self.producer.stop()
+                rate_hz = self.config.getfloat('Snapshot', 'rate_hz', fallback=SNAPSHOT_RATE_HZ)
+                self.producer = WorldStateProducer(self.om, self.combat_log_reader, rate_hz)
+                self.producer.start()
+                self.log_message(f"{log_prefix} World state producer started ({rate_hz:g} snapshots/s).", "INFO")
+            # 5.5 Target Selector (queries the producer's snapshots)
             if not self.target_selector:
                 self.log_message(f"{log_prefix} Initializing TargetSelector...", "DEBUG")
-                if self.om and self.om.is_ready():
-                    self.target_selector = TargetSelector(self.om)
+                if self.producer:
+                    self.target_selector = TargetSelector(self.producer)
                     self.log_message(f"{log_prefix} TargetSelector initialized.", "INFO")
-                else: self.log_message(f"{log_prefix} Skip TargetSelector init (OM not ready).", "WARN")
+                else: self.log_message(f"{log_prefix} Skip TargetSelector init (no world state producer).", "WARN")
+            elif self.target_selector.snapshots is not self.producer:
+                self.target_selector.snapshots = self.producer
             # 6. Combat Rotation
             if not self.combat_rotation:
                  self.log_message(f"{log_prefix} Initializing CombatRotation...", "DEBUG")
                  if self.mem and self.om and self.game:
                      # Pass self.log_message from the app
-                     self.combat_rotation = CombatRotation(self.mem, self.om, self.game, self.log_message)
+                     self.combat_rotation = CombatRotation(self.mem, self.om, self.game, self.log_message, self.producer)
                      self.log_message(f"{log_prefix} CombatRotation engine initialized.", "INFO")
                  else: self.log_message(f"{log_prefix} Skip CombatRotation init (core missing).", "WARN")
+            elif self.combat_rotation.snapshots is not self.producer:
+                 self.combat_rotation.snapshots = self.producer
 
             success = bool(self.mem and self.mem.is_attached() and self.om and self.om.is_ready())
             self.log_message(f"{log_prefix} Components check {'passed' if success else 'failed'}.", "INFO" if success else "ERROR")
@@ -405,6 +441,7 @@ class WowMonitorApp:
         self.core_initialized = success
         if success:
             self.log_message("Core initialization successful (finalized).", "INFO")
+            if self.log_tab_handler.read_stats_var.get(): self.log_tab_handler.apply_read_stats_setting()
         else:
             self.log_message("Core initialization failed (finalized).", "WARN")
         self._update_button_states()
@@ -459,7 +496,7 @@ class WowMonitorApp:
             start_time = time.monotonic()
             try:
                 if self.core_initialized and self.combat_rotation and self.game and self.game.is_ready():
-                    self.combat_rotation.run()
+                    self.combat_rotation.run() # Works on the producer's latest snapshot
                 else:
                     if loop_count == 0: # Log skip reason only once
                         reason = "Core not initialized" if not self.core_initialized else \
@@ -593,17 +630,16 @@ class WowMonitorApp:
              else:
                  pipe_ready = self.game.is_ready()
                  core_ready = True; status_text = f"Connected {'(IPC Ready)' if pipe_ready else '(IPC Failed)'}"
-                 try:
-                     if self.om: self.om.refresh()
-                 except Exception as e:
-                     self.log_message(f"Error OM refresh: {e}", "ERROR")
-                     traceback.print_exc(); core_ready = False; self.core_initialized = False
-                     status_text = "Error Refreshing OM"
+                 if self.producer and not self.producer.is_running():
+                     self.log_message("World state producer not running. Restarting.", "WARN")
+                     self.producer.start()
+
+        # Everything below shows the producer's latest snapshot (no memory reads on the Tk thread)
+        snapshot = self.producer.latest if core_ready and self.producer else None
 
         # --- Update Monitor Tab Data (using StringVars) --- #
-        # (Logic remains the same)
-        if core_ready and self.om and self.om.local_player:
-            player = self.om.local_player; p_name = player.get_name() or "?"
+        if snapshot and snapshot.player:
+            player = snapshot.player; p_name = player.get_name() or "?"
             status_text += f" | Player: {p_name} Lvl:{player.level}"
             self.player_name_var.set(p_name); self.player_level_var.set(str(player.level))
             self.player_hp_var.set(self.format_hp_energy(player.health, player.max_health))
@@ -618,9 +654,9 @@ class WowMonitorApp:
             self.player_name_var.set("N/A"); self.player_level_var.set("N/A"); self.player_hp_var.set("N/A")
             self.player_energy_var.set("N/A"); self.player_pos_var.set("N/A"); self.player_status_var.set("N/A")
 
-        if core_ready and self.om and self.om.target:
-            target = self.om.target; t_name = target.get_name() or "?"
-            dist = self.calculate_distance(target); dist_str = f"{dist:.1f}y" if dist >= 0 else "N/A"
+        if snapshot and snapshot.target:
+            target = snapshot.target; t_name = target.get_name() or "?"
+            dist = snapshot.distance(target); dist_str = f"{dist:.1f}y" if dist >= 0 else "N/A"
             status_text += f" | Target: {t_name} ({dist_str})"
             self.target_name_var.set(t_name); self.target_level_var.set(str(target.level))
             self.target_hp_var.set(self.format_hp_energy(target.health, target.max_health))
@@ -640,27 +676,31 @@ class WowMonitorApp:
             self.target_dist_var.set("N/A")
 
         # --- Update Object Tree via MonitorTab handler --- #
-        if core_ready and hasattr(self, 'monitor_tab_handler') and self.monitor_tab_handler:
-            self.monitor_tab_handler.update_monitor_treeview()
+        if snapshot and hasattr(self, 'monitor_tab_handler') and self.monitor_tab_handler:
+            self.monitor_tab_handler.update_monitor_treeview(snapshot)
 
-        # --- Read and Display Combat Log Entries --- #
-        local_player_found = bool(self.om and self.om.local_player)
-        if core_ready and local_player_found and self.combat_log_reader and self.combat_log_reader.initialized and hasattr(self, 'combat_log_tab_handler'):
+        # --- Display Combat Log Entries (read by the producer, queued for us) --- #
+        local_player_found = bool(snapshot and snapshot.player)
+        if core_ready and local_player_found and self.producer and hasattr(self, 'combat_log_tab_handler'):
             entries_found = 0
             try:
-                for timestamp, event_struct in self.combat_log_reader.read_new_entries():
+                for timestamp, event_struct in self.producer.drain_combat_events():
                     entries_found += 1
                     self.combat_log_tab_handler.log_event(timestamp, event_struct)
 
                 if entries_found > 0:
                     self.log_message(f"Processed {entries_found} combat log entries this cycle.", "DEBUG")
             except Exception as e:
-                self.log_message(f"Error reading/processing combat log: {e}", "ERROR")
+                self.log_message(f"Error processing combat log: {e}", "ERROR")
         elif core_ready and self.om and not local_player_found:
             self.log_message("Combat log processing skipped: Local player object not yet identified by Object Manager.", "DEBUG")
         elif not (hasattr(self, 'combat_log_reader') and self.combat_log_reader and self.combat_log_reader.initialized):
             pass
 
+        # --- Memory Read Statistics Summary (Log tab) --- #
+        if core_ready and hasattr(self, 'log_tab_handler'):
+            self.log_tab_handler.report_read_stats()
+
         # --- Final Updates --- #
         self.status_var.set(status_text)
         self._update_button_states()
@@ -687,10 +727,16 @@ class WowMonitorApp:
              self.log_message("Signaling rotation thread stop...", "INFO")
              self.stop_rotation_flag.set()
              # Optional: self.rotation_thread.join(timeout=0.5)
+        if self.producer: # Stop the acquisition thread before anything else touches the OM
+            self.producer.stop()
         if self.game: # Disconnect IPC
             try: self.game.disconnect_pipe(); self.log_message("IPC Pipe disconnected.", "DEBUG")
             except Exception as e: self.log_message(f"Error disconnecting IPC: {e}", "WARN")
         self._save_config() # Save config
+        if self.om: # Persist resolved player names for the next session
+            try: self.om.names.save()
+            except Exception as e: self.log_message(f"Error saving name cache: {e}", "WARN")
+            self.om.close() # Read pool threads
         if hasattr(self, 'log_tab_handler') and self.log_tab_handler: # Stop logging
             self.log_message("Stopping log redirection.", "DEBUG")
             self.log_tab_handler.stop_logging()
@@ -715,9 +761,10 @@ class WowMonitorApp:
             return f"{str(current) if current is not None else '?'}/{str(max_val) if max_val is not None else '?'} (?%)"
 
     def calculate_distance(self, obj: Optional[WowObject]) -> float:
-        # (Implementation remains unchanged)
-        if not self.om or not self.om.local_player or not obj: return -1.0
-        player = self.om.local_player; attrs = ['x_pos', 'y_pos', 'z_pos']
+        """Distance from the local player (as of the latest snapshot) to `obj`, -1.0 if unknown."""
+        snapshot = self.producer.latest if self.producer else None
+        if not snapshot or not snapshot.player or not obj: return -1.0
+        player = snapshot.player; attrs = ['x_pos', 'y_pos', 'z_pos']
         if not all(hasattr(player, a) and getattr(player, a) is not None for a in attrs) or \
            not all(hasattr(obj, a) and getattr(obj, a) is not None for a in attrs):
             return -1.0
@@ -733,16 +780,16 @@ class WowMonitorApp:
 
     def test_player_stealthed(self):
         """Tests the player stealth condition using has_aura_by_id."""
-        if not self.is_core_initialized() or not self.om or not self.om.local_player:
+        snapshot = self.producer.latest if self.producer else None
+        if not self.is_core_initialized() or snapshot is None or snapshot.player is None:
             messagebox.showwarning("Not Ready", "Core components not initialized or Player object not found.")
             return
 
-        player = self.om.local_player
+        player = snapshot.player # Auras as of the latest snapshot
         stealth_aura_id = 1784 # Standard Stealth aura ID
         self.log_message(f"Testing Player Stealthed (Checking Aura ID: {stealth_aura_id})...", "INFO")
 
         try:
-            player.update_dynamic_data(force_update=True) # Ensure latest data for check
             is_stealthed = player.has_aura_by_id(stealth_aura_id)
             result_message = f"Is Player Stealthed? {'Yes' if is_stealthed else 'No'}"
             self.log_message(result_message, "RESULT")
@@ -755,11 +802,12 @@ class WowMonitorApp:
 
     def test_player_has_aura(self):
         """Tests the player has aura condition using has_aura_by_id."""
-        if not self.is_core_initialized() or not self.om or not self.om.local_player:
+        snapshot = self.producer.latest if self.producer else None
+        if not self.is_core_initialized() or snapshot is None or snapshot.player is None:
             messagebox.showwarning("Not Ready", "Core components not initialized or Player object not found.")
             return
 
-        player = self.om.local_player
+        player = snapshot.player # Auras as of the latest snapshot
         aura_id_str = simpledialog.askstring("Test Player Has Aura",
                                              "Enter Aura Spell ID:")
         if not aura_id_str:
@@ -772,7 +820,6 @@ class WowMonitorApp:
                  return
 
             self.log_message(f"Testing Player Has Aura ID: {aura_id_to_check}...", "INFO")
-            player.update_dynamic_data(force_update=True) # Ensure latest data
             has_the_aura = player.has_aura_by_id(aura_id_to_check)
             result_message = f"Player Has Aura {aura_id_to_check}? {'Yes' if has_the_aura else 'No'}"
             self.log_message(result_message, "RESULT")
@@ -190,11 +190,17 @@ class CombatLogTab(ttk.Frame): # Inherit from ttk.Frame
         self._add_log_entry("Combat Log Listener Initializing...\n", ("INFO",))
 
         # Store player GUID for filtering
-        self.player_guid = getattr(self.app.om, 'player_guid', None)
+        self.player_guid = None # Set from the latest snapshot
 
     def update_player_guid(self):
         """Update the stored player GUID if it changes."""
-        self.player_guid = getattr(self.app.om, 'player_guid', None)
+        snapshot = self._snapshot()
+        self.player_guid = snapshot.player.guid if snapshot and snapshot.player else None
+
+    def _snapshot(self):
+        """Latest world snapshot from the producer thread (None before the first one)."""
+        producer = getattr(self.app, 'producer', None)
+        return producer.latest if producer else None
 
     def _add_log_entry(self, message: str, tags: tuple = ("INFO",)):
         """Internal helper to add formatted text to the log widget."""
@@ -212,23 +218,19 @@ class CombatLogTab(ttk.Frame): # Inherit from ttk.Frame
         if guid_low == 0 and guid_high == 0:
             return "None" # Or handle appropriately
         full_guid = combine_guid(guid_low, guid_high)
-        # Check against player GUID *before* looking up object
-        # Assuming self.app.om.player_guid holds the 64-bit player GUID
-        # *** Check if om and player_guid exist before accessing ***
-        player_guid = getattr(self.app.om, 'player_guid', None) # Safely get player_guid
-        # player_guid = self.app.om.player_guid if hasattr(self.app.om, 'player_guid') else None
-        if player_guid and full_guid == player_guid:
-            # Prefer player name from object manager if available, fallback to "You"
-            # *** Check if om exists before accessing ***
-            player_obj = self.app.om.get_object_by_guid(full_guid) if self.app.om else None
-            return player_obj.name if player_obj and player_obj.name else "You"
-
-        obj = self.app.om.get_object_by_guid(full_guid)
-        if obj and obj.name:
-            return obj.name
-        else:
-            # Only show GUID if it wasn't the player and wasn't found
-            return f"GUID:{full_guid:X}"
+        # Names come from the latest snapshot and the name cache only - the GUI thread never reads game memory
+        snapshot = self._snapshot()
+        if snapshot and snapshot.player and full_guid == snapshot.player.guid:
+            return snapshot.player.name or "You"
+
+        unit = snapshot.get(full_guid) if snapshot else None
+        if unit and unit.name:
+            return unit.name
+        name = self.app.om.names.get(full_guid) if self.app.om else None
+        if name:
+            return name
+        # Only show GUID if it wasn't the player and wasn't found
+        return f"GUID:{full_guid:X}"
 
     def log_event(self, timestamp: int, event_struct: Optional['CombatLogEventNode'], message: Optional[str] = None, level: str = "INFO"):
         """Logs a combat log event or a simple message with timestamp."""
@@ -11,6 +11,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from gui import WowMonitorApp # Import from the main gui module
 
+# --- Read Statistics Summary ---
+READ_STATS_INTERVAL_S = 10.0 # Default seconds between read statistics summaries ([Diagnostics] read_stats_interval)
+
 # --- Log Redirector Class (Moved here) ---
 class LogRedirector:
     """Redirects stdout/stderr to the GUI Log tab using a queue."""
@@ -155,6 +158,11 @@ class LogTab(ttk.Frame):
         # Variable for pausing log output
         self.paused_var = tk.BooleanVar(value=False)
 
+        # Memory read statistics (MemoryHandler instrumentation), summarized into the log periodically
+        self.read_stats_var = tk.BooleanVar(value=self.app.config.getboolean('Diagnostics', 'read_stats', fallback=False))
+        self.read_stats_interval = self.app.config.getfloat('Diagnostics', 'read_stats_interval', fallback=READ_STATS_INTERVAL_S)
+        self.last_read_stats_report = time.time()
+
         # --- Define Log specific widgets ---
         self.log_text: Optional[scrolledtext.ScrolledText] = None
         self.log_redirector: Optional[LogRedirector] = None # Will be created here
@@ -200,6 +208,9 @@ class LogTab(ttk.Frame):
         pause_button = ttk.Checkbutton(button_frame, text="Pause Log", variable=self.paused_var)
         pause_button.pack(side=tk.LEFT, padx=5)
 
+        read_stats_button = ttk.Checkbutton(button_frame, text="Read Stats", variable=self.read_stats_var, command=self.apply_read_stats_setting)
+        read_stats_button.pack(side=tk.LEFT, padx=5)
+
     def clear_log_text(self):
         """Clears all text from the log ScrolledText widget."""
         if hasattr(self, 'log_text') and self.log_text:
@@ -219,4 +230,26 @@ class LogTab(ttk.Frame):
     def stop_logging(self):
         """Stops the log redirector if it exists."""
         if self.log_redirector:
-            self.log_redirector.stop_redirect() 
\ No newline at end of file
+            self.log_redirector.stop_redirect() 
+
+    def apply_read_stats_setting(self):
+        """Turns MemoryHandler read instrumentation on/off to match the checkbox."""
+        mem = self.app.mem
+        if not mem: return
+        enabled = self.read_stats_var.get()
+        mem.enable_read_stats(enabled)
+        self.last_read_stats_report = time.time()
+        self.app.log_message(f"Memory read statistics {'enabled' if enabled else 'disabled'}.", "INFO")
+
+    def report_read_stats(self):
+        """Called every update cycle: logs a read statistics summary once per interval, then starts a new window."""
+        mem = self.app.mem
+        if not mem or mem.stats is None: return
+        now = time.time()
+        if now - self.last_read_stats_report < self.read_stats_interval: return
+        self.last_read_stats_report = now
+        stats = mem.stats
+        snapshot = stats.snapshot()
+        stats.reset()
+        for line in stats.format_summary(snapshot):
+            self.app.log_message(line, "DEBUG")
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
 import math
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 # Project Modules (Needed for type hints and enum access)
 from wow_object import WowObject
@@ -10,6 +10,7 @@ from wow_object import WowObject
 # Use TYPE_CHECKING to avoid circular imports during runtime
 if TYPE_CHECKING:
     from gui import WowMonitorApp # Import from the main gui module
+    from world_snapshot import WorldSnapshot
 
 # Restore ttk.Frame inheritance
 class MonitorTab(ttk.Frame):
@@ -40,6 +41,10 @@ class MonitorTab(ttk.Frame):
         self.filter_show_units_var = tk.BooleanVar(value=True)
         self.filter_show_players_var = tk.BooleanVar(value=True)
 
+        # --- Snapshot deltas (rows are added/removed/updated from the difference to the last shown snapshot) ---
+        self._rows: Dict[str, Tuple] = {} # Treeview iid -> values currently shown
+        self._shown_snapshot = None # (snapshot, filters) the tree shows; republished snapshots are skipped
+
         # --- Build the UI for this tab ---
         self._setup_ui()
 
@@ -152,12 +157,13 @@ class MonitorTab(ttk.Frame):
 
         filter_window.wait_window() # Wait for the window to be closed
 
-    def update_monitor_treeview(self):
-        """Updates the object list Treeview based on current ObjectManager data and filters."""
+    def update_monitor_treeview(self, snapshot: Optional['WorldSnapshot'] = None):
+        """Updates the object list Treeview from a world snapshot (default: the producer's latest) and filters."""
         try:
-            # Use self.app.om for ObjectManager access
+            if snapshot is None:
+                snapshot = self.app.producer.latest if self.app.producer else None
             # Use self.tree for the Treeview widget
-            if not self.app.om or not self.app.om.is_ready() or not hasattr(self, 'tree') or not self.tree or not self.tree.winfo_exists():
+            if snapshot is None or not hasattr(self, 'tree') or not self.tree or not self.tree.winfo_exists():
                 return
 
             # Use filter variables defined in self
@@ -168,62 +174,71 @@ class MonitorTab(ttk.Frame):
 
             MAX_DISPLAY_DISTANCE = 100.0
 
-            objects_in_om = self.app.om.get_objects()
-            current_guids_in_tree = set(self.tree.get_children())
-            processed_guids = set()
-
-            for obj in objects_in_om:
-                obj_type = getattr(obj, 'type', WowObject.TYPE_NONE)
-                if not obj or not hasattr(obj, 'guid') or not type_filter_map.get(obj_type, False):
-                    continue
+            # Same snapshot and filters as last time (the producer republishes on unchanged frames): nothing to do
+            shown_key = (snapshot, tuple(type_filter_map.values()))
+            if self._shown_snapshot == shown_key: return
 
-                # Call helper methods from self.app
-                dist_val = self.app.calculate_distance(obj)
-                if dist_val < 0 or dist_val > MAX_DISPLAY_DISTANCE:
+            processed_guids = set()
+            complete = True # False if Tk failed mid-update (shown again from the same snapshot next time)
+            player = snapshot.player
+            # Units in range from the snapshot's spatial index (nothing without a reference position)
+            nearby = snapshot.within_radius(MAX_DISPLAY_DISTANCE) if player is not None else []
+
+            for obj in nearby:
+                obj_type = obj.type
+                if not type_filter_map.get(obj_type, False):
                      continue
 
                 guid_str = str(obj.guid)
                 processed_guids.add(guid_str)
 
                 guid_hex = f"0x{obj.guid:X}"
-                obj_type_str = obj.get_type_str() if hasattr(obj, 'get_type_str') else f"Type{obj_type}"
+                obj_type_str = obj.get_type_str()
                 name = obj.get_name()
                 # Call helper methods from self.app
-                hp_str = self.app.format_hp_energy(getattr(obj, 'health', 0), getattr(obj, 'max_health', 0))
-                power_str = self.app.format_hp_energy(getattr(obj, 'energy', 0), getattr(obj, 'max_energy', 0), getattr(obj, 'power_type', -1))
-                dist_str = f"{dist_val:.1f}"
-                status_str = "Dead" if getattr(obj, 'is_dead', False) else (
-                    "Casting" if getattr(obj, 'is_casting', False) else (
-                        "Channeling" if getattr(obj, 'is_channeling', False) else "Idle"
+                hp_str = self.app.format_hp_energy(obj.health, obj.max_health)
+                power_str = self.app.format_hp_energy(obj.energy, obj.max_energy, obj.power_type)
+                dist_str = f"{snapshot.distance(obj):.1f}"
+                status_str = "Dead" if obj.is_dead else (
+                    "Alive" if obj.casting_spell_id is None else ( # Casting not read (only player/target/focus)
+                        "Casting" if obj.is_casting else (
+                            "Channeling" if obj.is_channeling else "Idle"
+                        )
                     )
                 )
 
                 values = ( guid_hex, obj_type_str, name, hp_str, power_str, dist_str, status_str )
 
                 try:
-                    if guid_str in current_guids_in_tree:
-                        self.tree.item(guid_str, values=values)
-                        self.tree.item(guid_str, tags=(obj_type_str.lower(),))
-                    else:
+                    shown = self._rows.get(guid_str)
+                    if shown is None:
                         self.tree.insert('', tk.END, iid=guid_str, values=values, tags=(obj_type_str.lower(),))
+                        self._rows[guid_str] = values
+                    elif shown != values: # Only rows whose displayed values changed touch Tk
+                        self.tree.item(guid_str, values=values, tags=(obj_type_str.lower(),))
+                        self._rows[guid_str] = values
                 except tk.TclError as e:
                     logging.warning(f"TclError updating/inserting item {guid_str} in tree: {e}")
+                    complete = False
                     break
 
-            # Remove old items
-            guids_to_remove = current_guids_in_tree - processed_guids
-            for guid_to_remove in guids_to_remove:
-                try:
-                    if self.tree.exists(guid_to_remove):
-                         self.tree.delete(guid_to_remove)
-                except tk.TclError as e:
-                    logging.warning(f"TclError deleting item {guid_to_remove} from tree: {e}")
-                    break
+            # Remove rows of objects that despawned, went out of range or were filtered out
+            for guid_to_remove in self._rows.keys() - processed_guids:
+                self._delete_row(guid_to_remove)
+            if complete: self._shown_snapshot = shown_key
 
         except Exception as e:
             # Use logging, which should be redirected by LogTab's redirector
             logging.exception(f"Error updating monitor treeview: {e}")
 
+    def _delete_row(self, guid_str: str):
+        self._rows.pop(guid_str, None)
+        try:
+            if self.tree.exists(guid_str):
+                 self.tree.delete(guid_str)
+        except tk.TclError as e:
+            logging.warning(f"TclError deleting item {guid_str} from tree: {e}")
+
     def _sort_treeview_column(self, col, reverse):
         """Sorts the Treeview column."""
         # This method was empty in the original code, keep it empty for now
@@ -908,7 +908,8 @@ class RotationEditorTab(ttk.Frame):
             messagebox.showerror("Error", "Game Interface not ready. Cannot get spell info.")
             return
 
-        spell_ids = self.app.om.read_known_spell_ids()
+        snapshot = self.app.producer.latest if self.app.producer else None
+        spell_ids = list(snapshot.known_spells) if snapshot else [] # Read by the producer thread
         if not spell_ids:
             messagebox.showinfo("Spellbook Scan", "No spell IDs found or unable to read spellbook.")
             return
@@ -1,105 +1,600 @@
-import pymem
-import pymem.process
+import struct
+import threading
 import time
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Executor
+from collections import namedtuple, OrderedDict
+from functools import lru_cache
+from typing import List, Sequence, Tuple, Any, Optional
 import offsets # Import offsets to use STATIC_CLIENT_CONNECTION etc. in example
+from memory_backends import MemoryBackend, MemoryReadError, MemoryWriteError, attach_default_backend
+from read_stats import ReadStats, UNTAGGED
+from region_map import RegionMap
+from signature_scanner import on_offsets_changed
 
 PROCESS_NAME = "Wow.exe" # Adjust if your executable name is different
 
-class MemoryHandler:
+# --- Batched Read Settings ---
+# Requests closer together than this many bytes are merged into a single read.
+READ_MERGE_GAP = 0x100
+# Upper bound on the size of a single merged read.
+READ_MERGE_MAX_SPAN = 0x1000
+
+# Type name -> (struct format, default value on failed read) used by read_many()
+READ_TYPES = {
+    'uint': ('<I', 0),
+    'int': ('<i', 0),
+    'ulonglong': ('<Q', 0),
+    'float': ('<f', 0.0),
+    'double': ('<d', 0.0),
+    'short': ('<h', 0),
+    'ushort': ('<H', 0),
+    'uchar': ('<B', 0),
+}
+_READ_TYPE_STRUCTS = {name: (struct.Struct(fmt), default) for name, (fmt, default) in READ_TYPES.items()}
+_READ_TYPE_METHODS = {name: f"read_{name}" for name in READ_TYPES} # Method names reported to ReadStats
+# Public MemoryHandler reader per MemoryField type
+_FIELD_READERS = {name: f"read_{name}" for name in ('uint', 'ulonglong', 'float', 'double', 'short', 'ushort', 'uchar')}
+
+@lru_cache(maxsize=None)
+def get_struct(fmt: str) -> struct.Struct:
+    """Returns a compiled (and cached) struct.Struct for `fmt`."""
+    return struct.Struct(fmt)
+
+def struct_format_from_layout(layout: Sequence[Tuple[int, str]], size: int) -> str:
+    """
+    Builds a little-endian struct format from (offset, code) pairs, padding the gaps.
+    E.g. [(0x8, 'I'), (0x30, 'Q')] with size 0x40 -> '<8xI36xQ8x'.
+    """
+    fmt = '<'
+    position = 0
+    for offset, code in sorted(layout):
+        if offset < position:
+            raise ValueError(f"Overlapping field at offset {hex(offset)} in struct layout")
+        if offset > position: fmt += f"{offset - position}x"
+        fmt += code
+        position = offset + struct.calcsize('<' + code)
+    if size > position: fmt += f"{size - position}x"
+    return fmt
+
+# --- Game Records ---
+ObjectHeader = namedtuple('ObjectHeader', ['unit_fields', 'type', 'guid', 'next'])
+AuraEntry = namedtuple('AuraEntry', ['caster_guid', 'spell_id', 'flags', 'level', 'stack_count', 'unknown', 'duration', 'end_time'])
+
+# Record formats derived from offsets.py: built by _derive_offsets() (again after a signature scan)
+OBJECT_HEADER_FORMAT = ""
+_OBJECT_HEADER_ORDER: Optional[Tuple[int, ...]] = None # Record index per ObjectHeader field (None = same order)
+
+class MemoryField:
+    """
+    Descriptor reading one value from game memory each time it is accessed, at the offset named
+    `offset` in offsets.py from the address in the owner's `base` attribute (e.g. its descriptor
+    pointer), e.g. `spell_id = MemoryField('DYNAMICOBJECT_FIELD_SPELL_ID', 'uint')`. Owners need
+    `mem`. A zero base address or failed read gives the type's default. The offset is looked up
+    by name so a signature scan that changes it reaches the field (see _derive_offsets).
+    """
+
+    def __init__(self, offset: str, type_name: str = 'uint', base: str = 'descriptor_address'):
+        if type_name not in _FIELD_READERS:
+            raise ValueError(f"No MemoryHandler reader for field type '{type_name}'")
+        self.offset_name = offset
+        self.offset: int = getattr(offsets, offset)
+        self.type_name = type_name
+        self.reader = _FIELD_READERS[type_name]
+        self.base = base
+        self.default = READ_TYPES[type_name][1]
+        _MEMORY_FIELDS.append(self)
+
+    def __get__(self, obj, owner=None):
+        if obj is None: return self
+        address = getattr(obj, self.base)
+        if not address: return self.default
+        return getattr(obj.mem, self.reader)(address + self.offset)
+
+class TickField(MemoryField):
+    """
+    MemoryField read at most once per tick: the first access after MemoryHandler.begin_tick reads
+    memory, later accesses in the same tick return the cached value. Owners need a `_tick_fields`
+    slot (None until first use) - the per-object cache dict only exists once a field was read.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None: return self
+        mem = obj.mem
+        if mem is None: return self.default
+        cache = obj._tick_fields
+        if cache is None or cache[0] != mem.tick_id:
+            cache = obj._tick_fields = (mem.tick_id, {})
+        values = cache[1]
+        value = values.get(self.name)
+        if value is None: value = values[self.name] = MemoryField.__get__(self, obj, owner)
+        return value
+
+_MEMORY_FIELDS: List[MemoryField] = [] # Every MemoryField/TickField, re-resolved by _derive_offsets
+
+def _derive_offsets():
+    """(Re)builds the record formats and MemoryField offsets from offsets.py - again after a signature scan."""
+    global OBJECT_HEADER_FORMAT, _OBJECT_HEADER_ORDER
+    # OBJECT_DESCRIPTOR_OFFSET shares the slot at 0x8 with OBJECT_UNIT_FIELDS, so it is not decoded separately.
+    # The record comes back in offset order; ObjectHeader is (unit_fields, type, guid, next).
+    layout = [
+        (offsets.OBJECT_UNIT_FIELDS, 'I'),
+        (offsets.OBJECT_TYPE, 'h'),
+        (offsets.OBJECT_GUID, 'Q'),
+        (offsets.NEXT_OBJECT_OFFSET, 'I'),
+    ]
+    OBJECT_HEADER_FORMAT = struct_format_from_layout(layout, offsets.OBJECT_HEADER_SIZE)
+    ranks = sorted(range(len(layout)), key=lambda field: layout[field][0])
+    order = tuple(ranks.index(field) for field in range(len(layout)))
+    _OBJECT_HEADER_ORDER = None if order == tuple(range(len(layout))) else order
+    for field in _MEMORY_FIELDS: field.offset = getattr(offsets, field.offset_name)
+
+_derive_offsets()
+on_offsets_changed(_derive_offsets)
+
+# --- Tick-Scoped Page Cache Settings ---
+# The first read touching a page fetches the whole page; later reads in the same tick
+# are served from the cached bytes. Call begin_tick() to drop the cache.
+PAGE_CACHE_PAGE_SIZE = 0x1000
+# Reads larger than this bypass the page cache (e.g. bulk image/struct reads).
+PAGE_CACHE_MAX_READ = 0x4000
+# Sharded prefetch (see prefetch): pages per read_batch call at least
+PREFETCH_MIN_SHARD_PAGES = 64
+
+_FAILED_PAGE = b'' # Negative cache marker: whole-page fetch failed this tick
+
+
+class WorkerReads:
+    """Pages fetched and counters of one sharded-read worker (see MemoryHandler.worker_reads)."""
+    __slots__ = ('pages', 'hits', 'misses', 'rejects')
+
     def __init__(self):
-        self.pm = None
+        self.pages = {} # page index -> page bytes (or _FAILED_PAGE)
+        self.hits = 0
+        self.misses = 0
+        self.rejects = 0
+
+# --- String Cache Settings ---
+# read_string(..., generation=...) results are cached per (address, generation) with LRU eviction.
+STRING_CACHE_SIZE = 4096
+STRING_CHUNK_SIZE = 32 # Chunk size for strings without a call site / after the first chunk
+STRING_SITE_MIN_CHUNK = 8 # Smallest adaptive first chunk
+
+# --- Readable Region Map Settings ---
+# Reads outside the known readable regions fail without touching the backend. A miss re-queries
+# the regions (the client may have mapped new heap) at most this often.
+REGION_MAP_MISS_REFRESH_S = 1.0
+
+class MemoryHandler:
+    def __init__(self, backend: Optional[MemoryBackend] = None):
+        """
+        Args:
+            backend: Where bytes come from. Defaults to attaching to PROCESS_NAME (pymem on Windows,
+                     process_vm_readv on Linux/Wine); pass a memory_backends.MemoryImageBackend
+                     to run against a saved image.
+        """
+        self.backend: Optional[MemoryBackend] = None
         self.base_address = None
-        try:
-            self.pm = pymem.Pymem(PROCESS_NAME)
-            # Note: process.module_from_name finds the module based on the process name.
-            # For WoW.exe, this usually gives the correct base address.
-            self.base_address = pymem.process.module_from_name(self.pm.process_handle, PROCESS_NAME).lpBaseOfDll
-            print(f"Successfully attached to {PROCESS_NAME} (PID: {self.pm.process_id})")
-            print(f"Base address: {hex(self.base_address)}")
-        except pymem.exception.ProcessNotFound:
-            print(f"Error: Process '{PROCESS_NAME}' not found. Is WoW running?")
-            self.pm = None
-        except Exception as e:
-            print(f"An unexpected error occurred during attachment: {e}")
-            self.pm = None
+
+        # --- Page cache state (see begin_tick) ---
+        self.page_cache_enabled: bool = True
+        self.page_size: int = PAGE_CACHE_PAGE_SIZE
+        self.tick_id: int = 0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self._page_cache = {} # page index -> page bytes (or _FAILED_PAGE)
+        self._worker = threading.local() # .reads: WorkerReads while this thread is a sharded-read worker
+        self.recorder = None # memory_capture.CaptureRecorder while recording
+
+        # --- String cache (see read_string) ---
+        self._string_cache = OrderedDict() # (address, generation, max_length, encoding) -> str
+        self._string_cache_lock = threading.Lock()
+        self._string_site_lengths = {} # call site -> running average string length (bytes)
+        self.string_cache_hits: int = 0
+        self.string_cache_misses: int = 0
+
+        # --- Readable region map (see refresh_regions) ---
+        self.region_map: Optional[RegionMap] = None # None = backend can't list regions, no checks
+        self.region_rejects: int = 0 # Reads refused by the region map
+
+        # --- Read instrumentation (see enable_read_stats) ---
+        self.stats: Optional[ReadStats] = None # None = disabled, reads are not timed
+        self._tag_state = threading.local() # Current caller tag, per thread
+
+        if backend is None:
+            backend = attach_default_backend(PROCESS_NAME) # Prints success/failure itself
+        if backend is not None:
+            self.backend = backend
+            self.base_address = backend.base_address
+            self.refresh_regions()
 
     def is_attached(self):
         """Check if successfully attached to the process."""
-        # Pymem methods will raise exceptions if the handle is invalid or process closed.
-        # A simple check if self.pm exists is sufficient here.
-        return bool(self.pm)
+        # Backend methods will raise exceptions if the handle is invalid or process closed.
+        # A simple check if self.backend exists is sufficient here.
+        return self.backend is not None
 
-    def read_uint(self, address):
-        if not self.is_attached(): return 0
+    # --- Page Cache ---
+    def begin_tick(self):
+        """Starts a new read tick: drops every cached page so the next reads see fresh memory."""
+        self._page_cache = {}
+        self.tick_id += 1
+        if self.backend is not None: self.backend.begin_tick()
+
+    # --- Readable Regions ---
+    def refresh_regions(self) -> bool:
+        """Re-queries the backend's readable regions. Returns False (and disables checks) if it can't list them."""
+        regions = self.backend.query_regions() if self.backend is not None else None
+        if regions is None:
+            self.region_map = None
+            return False
+        if self.region_map is None:
+            self.region_map = RegionMap(regions)
+        else:
+            self.region_map.update(regions)
+        return True
+
+    def _region_miss(self, address: int, length: int) -> bool:
+        """
+        Called when [address, address + length) is outside the region map. Refreshes the map if it
+        is old enough and re-checks; returns True if the range turned out to be readable.
+        """
+        region_map = self.region_map
+        if region_map is None: return True # Checks were disabled meanwhile
+        worker = getattr(self._worker, 'reads', None)
+        if worker is not None: # Workers never re-query the map (the owning thread does)
+            worker.rejects += 1
+            return False
+        if time.time() - region_map.refreshed_at >= REGION_MAP_MISS_REFRESH_S:
+            self.refresh_regions()
+            if self.region_map is None or self.region_map.contains(address, length): return True
+        self.region_rejects += 1
+        return False
+
+    def is_valid_pointer(self, address: int, length: int = 1) -> bool:
+        """
+        Cheap sanity check for pointers read from game memory (object list links, name nodes...):
+        non-zero, even and inside a readable region (when the region map is available).
+        """
+        if not address or address & 1: return False
+        region_map = self.region_map
+        if region_map is None: return True
+        return region_map.contains(address, length) or self._region_miss(address, length)
+
+    # --- Read Instrumentation ---
+    def enable_read_stats(self, enabled: bool = True):
+        """Turns per-method / per-tag read counters and latency histograms on or off."""
+        if enabled and self.stats is None:
+            self.stats = ReadStats()
+        elif not enabled:
+            self.stats = None
+
+    def read_stats_snapshot(self) -> Optional[dict]:
+        """Returns the current read statistics (see ReadStats.snapshot), or None if disabled."""
+        return self.stats.snapshot() if self.stats is not None else None
+
+    def tagged(self, tag: str):
+        """
+        Context manager attributing the reads made inside it to `tag` (e.g. "om.walk", "aura").
+        Tags nest; the innermost one wins. Costs nothing but the call while stats are disabled.
+        """
+        if self.stats is None: return nullcontext()
+        return _ReadTag(self._tag_state, tag)
+
+    # --- Record / Replay ---
+    def start_recording(self, path: str) -> bool:
+        """
+        Logs every backend read into a capture file, one block per tick (see memory_capture.py).
+        Replay it later with MemoryHandler(memory_capture.ReplayBackend(path)).
+        """
+        if self.backend is None or self.recorder is not None: return False
+        from memory_capture import CaptureRecorder, RecordingBackend
+        self.recorder = CaptureRecorder(path, self.base_address)
+        self.backend = RecordingBackend(self.backend, self.recorder)
+        self._page_cache = {} # Make sure the first recorded tick sees every read
+        print(f"Recording memory reads to {path}")
+        return True
+
+    def stop_recording(self):
+        """Finishes the capture file and goes back to reading the wrapped backend directly."""
+        if self.recorder is None: return
+        self.recorder.close()
+        print(f"Recorded {self.recorder.tick_count} ticks to {self.recorder.path}")
+        self.backend = self.backend.inner
+        self.recorder = None
+
+    def invalidate_range(self, address: int, length: int):
+        """Drops cached pages overlapping [address, address + length). Used after writes."""
+        if not self._page_cache or length <= 0: return
+        for page in range(address // self.page_size, (address + length - 1) // self.page_size + 1):
+            self._page_cache.pop(page, None)
+
+    def set_page_size(self, page_size: int):
+        """Changes the cache page size (power of two). Clears the cache and its counters."""
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError(f"Page size must be a positive power of two, got {page_size}")
+        self.page_size = page_size
+        self._page_cache = {}
+        self.reset_cache_stats()
+
+    def reset_cache_stats(self):
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_stats(self) -> dict:
+        """Returns page cache counters for tuning the page size."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'enabled': self.page_cache_enabled,
+            'page_size': self.page_size,
+            'tick': self.tick_id,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': (self.cache_hits / total) if total else 0.0,
+            'cached_pages': len(self._page_cache),
+        }
+
+    @contextmanager
+    def worker_reads(self):
+        """
+        Marks the calling (pool) thread as a sharded-read worker while the owning thread waits for
+        it (see wow_object.update_dynamic_batch). The shared page cache is only read: pages the
+        worker fetches and its hit/miss counters go into the yielded WorkerReads, which the owning
+        thread passes to merge_worker_reads() after the join.
+        """
+        reads = WorkerReads()
+        self._worker.reads = reads
         try:
-            return self.pm.read_uint(address)
-        except pymem.exception.MemoryReadError: return 0 # Common error, return default
-        except Exception as e:
-            # print(f"Error reading uint at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0
+            yield reads
+        finally:
+            self._worker.reads = None
 
-    def read_ulonglong(self, address):
-        if not self.is_attached(): return 0
+    def merge_worker_reads(self, reads: WorkerReads):
+        """Adds a finished worker's pages and counters to the page cache (owning thread only)."""
+        cache = self._page_cache
+        for page, data in reads.pages.items(): cache.setdefault(page, data)
+        self.cache_hits += reads.hits
+        self.cache_misses += reads.misses
+        self.region_rejects += reads.rejects
+
+    def _read_raw(self, address: int, length: int) -> bytes:
+        """
+        Reads `length` bytes, going through the tick-scoped page cache when possible.
+        Raises MemoryReadError like backend.read on failure. Uncached reads may come back as a
+        view over the backend's read buffer (backend.read_view): decode or copy before the next read.
+        Cached pages must own their bytes, so page fetches still go through backend.read.
+        """
+        if not self.page_cache_enabled or length > PAGE_CACHE_MAX_READ or length <= 0:
+            return self.backend.read_view(address, length)
+
+        page_size = self.page_size
+        first_page = address // page_size
+        last_page = (address + length - 1) // page_size
+        cache = self._page_cache
+        worker = getattr(self._worker, 'reads', None) # Sharded-read worker: don't touch the shared cache
+        pages = []
+        for page in range(first_page, last_page + 1):
+            data = cache.get(page)
+            if data is None and worker is not None: data = worker.pages.get(page)
+            if data is None:
+                if worker is not None: worker.misses += 1
+                else: self.cache_misses += 1
+                try:
+                    data = self.backend.read(page * page_size, page_size)
+                except MemoryReadError:
+                    data = _FAILED_PAGE
+                if worker is not None: worker.pages[page] = data
+                else: cache[page] = data
+            elif worker is not None:
+                worker.hits += 1
+            else:
+                self.cache_hits += 1
+            if data is _FAILED_PAGE or len(data) != page_size:
+                # Page not fully readable (e.g. end of a region) - read just the requested bytes
+                return self.backend.read_view(address, length)
+            pages.append(data)
+
+        offset = address - first_page * page_size
+        if len(pages) == 1:
+            # Zero-copy view into the cached page; decoders use unpack_from on it directly
+            return memoryview(pages[0])[offset:offset + length]
+        return b''.join(pages)[offset:offset + length]
+
+    def prefetch(self, ranges: Sequence[Tuple[int, int]], executor: Optional[Executor] = None, shards: int = 1) -> int:
+        """
+        Loads every uncached page touched by `ranges` ((address, length) pairs) into the page cache
+        with one backend.read_batch call - a single syscall on batching backends. Later reads of
+        those ranges this tick are cache hits. Returns the number of pages fetched.
+        No-op unless the backend batches and the page cache is on (reading pages one by one
+        up front would only add reads).
+        With an `executor`, the pages are split into up to `shards` read_batch calls run on it
+        (the syscalls release the GIL); the cache is filled on this thread after the join.
+        """
+        backend = self.backend
+        if backend is None or not backend.batch_reads or not self.page_cache_enabled: return 0
+        page_size = self.page_size
+        cache = self._page_cache
+        region_map = self.region_map
+        wanted = set()
+        for address, length in ranges:
+            if not address or length <= 0 or length > PAGE_CACHE_MAX_READ: continue
+            if region_map is not None and not region_map.contains(address, length): continue
+            for page in range(address // page_size, (address + length - 1) // page_size + 1):
+                if page not in cache: wanted.add(page)
+        if not wanted: return 0
+
+        pages = sorted(wanted)
+        requests = [(page * page_size, page_size) for page in pages]
+        shards = min(shards, len(pages) // PREFETCH_MIN_SHARD_PAGES) if executor is not None and self.recorder is None else 1 # Recorder: one reading thread
+        if shards > 1:
+            bounds = [len(requests) * shard // shards for shard in range(shards + 1)]
+            futures = [executor.submit(backend.read_batch, requests[start:end]) for start, end in zip(bounds, bounds[1:])]
+            results = [data for future in futures for data in future.result()]
+        else:
+            results = backend.read_batch(requests)
+        for page, data in zip(pages, results):
+            cache[page] = data if data is not None else _FAILED_PAGE
+        self.cache_misses += len(pages)
+        return len(pages)
+
+    def _read_view(self, address: int, length: int, method: str = 'read_bytes'):
+        """
+        Single guarded entry point for every read: returns a bytes-like buffer of exactly
+        `length` bytes, or None if detached or the read failed.
+        `method` names the public read method for the read statistics.
+        """
+        if self.backend is None: return None
+        if self.stats is not None: return self._read_view_timed(address, length, method)
+        region_map = self.region_map
+        if region_map is not None and not region_map.contains(address, length) and not self._region_miss(address, length):
+            return None # Unmapped - fail without a backend read / exception
         try:
-            return self.pm.read_ulonglong(address)
-        except pymem.exception.MemoryReadError: return 0
+            data = self._read_raw(address, length)
+        except MemoryReadError: return None # Common error
         except Exception as e:
-            # print(f"Error reading ulonglong at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0
+            # print(f"Error reading {length} bytes at {hex(address)}: {e}") # Optional: uncomment for debugging
+            return None
+        return data if len(data) == length else None
 
-    def read_float(self, address):
-        if not self.is_attached(): return 0.0
+    def _read_view_timed(self, address: int, length: int, method: str):
+        """_read_view with the read timed and recorded in self.stats (kept separate so the untimed path stays lean)."""
+        stats = self.stats
+        start = time.perf_counter()
+        region_map = self.region_map
+        if region_map is not None and not region_map.contains(address, length) and not self._region_miss(address, length):
+            data = None
+        else:
+            try:
+                data = self._read_raw(address, length)
+                if len(data) != length: data = None
+            except Exception: # MemoryReadError or anything else - same outcome as _read_view
+                data = None
+        elapsed = time.perf_counter() - start
+        if stats is not None: # May have been disabled by another thread meanwhile
+            stats.record(method, getattr(self._tag_state, 'tag', UNTAGGED), length, data is not None, elapsed)
+        return data
+
+    def read_uint_uncached(self, address) -> int:
+        """
+        read_uint past the page cache (and without filling it): for values that decide whether
+        the cache is still current (ObjectManager's frame epoch, read before begin_tick).
+        """
+        backend = self.backend
+        if backend is None: return 0
+        region_map = self.region_map
+        if region_map is not None and not region_map.contains(address, 4): return 0
         try:
-            return self.pm.read_float(address)
-        except pymem.exception.MemoryReadError: return 0.0
-        except Exception as e:
-            # print(f"Error reading float at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0.0
+            data = backend.read(address, 4)
+        except MemoryReadError: return 0
+        return _READ_TYPE_STRUCTS['uint'][0].unpack_from(data)[0] if len(data) == 4 else 0
+
+    def _read_value(self, address, type_name):
+        """Reads and decodes a single READ_TYPES value, returning the type's default on failure."""
+        fmt, default = _READ_TYPE_STRUCTS[type_name]
+        data = self._read_view(address, fmt.size, _READ_TYPE_METHODS[type_name])
+        return fmt.unpack_from(data)[0] if data is not None else default
+
+    # --- Struct Readers ---
+    # Whole records decoded with cached struct.Structs. The unit field block (UNIT_FIELD_BLOCK_START,
+    # UNIT_FIELD_BLOCK_SIZE) has no record reader here: wow_object.update_dynamic_batch reads the
+    # raw blocks of a whole refresh batch and decodes them as one NumPy word matrix instead.
+    def read_struct(self, address: int, fmt: str) -> Optional[tuple]:
+        """Reads and unpacks one record described by a struct format. Returns None on failure."""
+        compiled = get_struct(fmt)
+        data = self._read_view(address, compiled.size, 'read_struct')
+        return compiled.unpack_from(data) if data is not None else None
+
+    def read_struct_array(self, address: int, fmt: str, count: int) -> List[tuple]:
+        """Reads `count` consecutive records in a single read. Returns [] on failure."""
+        compiled = get_struct(fmt)
+        if count <= 0: return []
+        data = self._read_view(address, compiled.size * count, 'read_struct_array')
+        return list(compiled.iter_unpack(data)) if data is not None else []
+
+    def read_object_header(self, address: int) -> Optional[ObjectHeader]:
+        """Reads the 0x40-byte object header (unit fields ptr, type, GUID, next ptr) in one read."""
+        record = self.read_struct(address, OBJECT_HEADER_FORMAT)
+        if record is None: return None
+        order = _OBJECT_HEADER_ORDER
+        return ObjectHeader._make(record if order is None else [record[index] for index in order])
+
+    def read_aura_entries(self, address: int, count: int) -> List[AuraEntry]:
+        """Reads `count` aura entries (AURA_STRUCT_SIZE bytes each) from an aura table in one read."""
+        return [AuraEntry._make(record) for record in self.read_struct_array(address, offsets.AURA_ENTRY_FORMAT, count)]
+
+    def read_uint(self, address):
+        return self._read_value(address, 'uint')
+
+    def read_ulonglong(self, address):
+        return self._read_value(address, 'ulonglong')
+
+    def read_float(self, address):
+        return self._read_value(address, 'float')
 
     def read_double(self, address):
         """Reads an 8-byte double-precision floating point number."""
-        if not self.is_attached(): return 0.0
-        try:
-            return self.pm.read_double(address)
-        except pymem.exception.MemoryReadError: return 0.0
-        except Exception as e:
-            # print(f"Error reading double at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0.0
+        return self._read_value(address, 'double')
 
     def read_short(self, address):
         """Reads a signed short (2 bytes)."""
-        if not self.is_attached(): return 0
-        try:
-            byte_data = self.pm.read_bytes(address, 2)
-            return int.from_bytes(byte_data, byteorder='little', signed=True)
-        except pymem.exception.MemoryReadError: return 0
-        except Exception as e:
-            # print(f"Error reading short at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0
+        return self._read_value(address, 'short')
 
     def read_ushort(self, address):
         """Reads an unsigned short (2 bytes)."""
-        if not self.is_attached(): return 0
-        try:
-            byte_data = self.pm.read_bytes(address, 2)
-            return int.from_bytes(byte_data, byteorder='little', signed=False)
-        except pymem.exception.MemoryReadError: return 0
-        except Exception as e:
-            # print(f"Error reading ushort at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0
+        return self._read_value(address, 'ushort')
+
+    def read_string(self, address, max_length=100, encoding='utf-8', generation=None, site=None):
+        """
+        Reads a null-terminated string from memory.
 
-    def read_string(self, address, max_length=100, encoding='utf-8'):
-        """Reads a null-terminated string from memory."""
+        Args:
+            generation: Identity of whatever owns the string (e.g. WowObject.generation). When given,
+                        the result is cached under (address, generation) so repeat lookups skip the read.
+            site: Call site label (e.g. "unit_name"). The first chunk read is sized from the typical
+                  string length seen at that site, so most strings need a single read.
+        """
         if not self.is_attached() or address == 0: return ""
+        if generation is not None:
+            key = (address, generation, max_length, encoding)
+            with self._string_cache_lock:
+                cached = self._string_cache.get(key)
+                if cached is not None:
+                    self._string_cache.move_to_end(key)
+                    self.string_cache_hits += 1
+                    return cached
+                self.string_cache_misses += 1
+
+        text = self._read_string_uncached(address, max_length, encoding, site)
+
+        if generation is not None and text: # Empty results may be transient (object still loading) - not cached
+            with self._string_cache_lock:
+                self._string_cache[key] = text
+                if len(self._string_cache) > STRING_CACHE_SIZE:
+                    self._string_cache.popitem(last=False)
+        return text
+
+    def _first_string_chunk(self, site, max_length: int) -> int:
+        """First chunk size for a call site: typical length + 25% headroom + NUL, rounded up to 8 bytes."""
+        average = self._string_site_lengths.get(site) if site is not None else None
+        if average is None: return min(STRING_CHUNK_SIZE, max_length)
+        size = (int(average * 1.25) + 1 + 7) & ~7
+        return max(STRING_SITE_MIN_CHUNK, min(size, max_length))
+
+    def _read_string_uncached(self, address, max_length, encoding, site):
         try:
             # Read bytes incrementally until null terminator or max_length
             buffer = bytearray()
-            chunk_size = 32 # Read in chunks
+            chunk_size = self._first_string_chunk(site, max_length) # Read in chunks
             read_length = 0
             while read_length < max_length:
                  bytes_to_read = min(chunk_size, max_length - read_length)
-                 chunk = self.pm.read_bytes(address + read_length, bytes_to_read)
-                 if not chunk: break # Read failed
+                 chunk = self._read_view(address + read_length, bytes_to_read, 'read_string')
+                 if chunk is None: return "" # Read failed
+                 chunk = bytes(chunk)
+                 chunk_size = STRING_CHUNK_SIZE
 
                  null_term_index = chunk.find(b'\x00')
                  if null_term_index != -1:
@@ -111,43 +606,100 @@ class MemoryHandler:
                       if len(chunk) < bytes_to_read: # Read less than requested, likely end of readable memory
                            break
 
+            if site is not None: # Running average of the lengths seen at this call site
+                 average = self._string_site_lengths.get(site)
+                 self._string_site_lengths[site] = len(buffer) if average is None else average * 0.9 + len(buffer) * 0.1
+
             # Decode explicitly, ignoring errors
             return buffer.decode(encoding, errors='ignore')
-        except pymem.exception.MemoryReadError:
+        except MemoryReadError:
              # print(f"MemoryReadError reading string at {hex(address)}") # Debug
              return ""
         except Exception as e:
             # print(f"Error reading string at {hex(address)}: {e}") # Optional: uncomment for debugging
             return ""
 
+    def string_cache_stats(self) -> dict:
+        """Returns string cache counters and the learned first-chunk size per call site."""
+        total = self.string_cache_hits + self.string_cache_misses
+        return {
+            'entries': len(self._string_cache),
+            'hits': self.string_cache_hits,
+            'misses': self.string_cache_misses,
+            'hit_rate': (self.string_cache_hits / total) if total else 0.0,
+            'first_chunk': {site: self._first_string_chunk(site, 1 << 16) for site in list(self._string_site_lengths)},
+        }
+
+    def clear_string_cache(self):
+        with self._string_cache_lock:
+            self._string_cache.clear()
+
     def read_uchar(self, address):
         """Reads a single unsigned byte (uchar)."""
-        if not self.is_attached(): return 0
-        try:
-            byte_data = self.pm.read_bytes(address, 1)
-            return int.from_bytes(byte_data, byteorder='little', signed=False)
-        except pymem.exception.MemoryReadError: return 0
-        except Exception as e:
-            # print(f"Error reading uchar at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return 0
+        return self._read_value(address, 'uchar')
 
     def read_bytes(self, address, length):
         """Reads a raw sequence of bytes."""
-        if not self.is_attached(): return b''
-        try:
-            return self.pm.read_bytes(address, length)
-        except pymem.exception.MemoryReadError: return b''
-        except Exception as e:
-            # print(f"Error reading bytes at {hex(address)}: {e}") # Optional: uncomment for debugging
-            return b''
+        data = self._read_view(address, length, 'read_bytes')
+        return bytes(data) if data is not None else b''
+
+    def read_many(self, requests: Sequence[Tuple[int, str]], max_gap: int = READ_MERGE_GAP) -> List[Any]:
+        """
+        Reads several typed values in as few process reads as possible.
+
+        Args:
+            requests: Sequence of (address, type_name) tuples. type_name is a key of READ_TYPES
+                      ('uint', 'ulonglong', 'float', ...).
+            max_gap: Requests whose addresses are at most this many bytes apart share one read.
+
+        Returns:
+            A list of decoded values in the same order as `requests`. Values whose span could
+            not be read (or whose address is 0) get the type's default (0 / 0.0), matching the
+            single-value read_* methods.
+        """
+        results: List[Any] = [None] * len(requests)
+        if not requests: return results
+
+        # Sort request indices by address, then group into spans
+        order = sorted(range(len(requests)), key=lambda i: requests[i][0])
+        spans = [] # [start, end, [indices]]
+        for i in order:
+            address, type_name = requests[i]
+            fmt, default = _READ_TYPE_STRUCTS[type_name]
+            if not address:
+                results[i] = default
+                continue
+            end = address + fmt.size
+            if spans and address - spans[-1][1] <= max_gap and end - spans[-1][0] <= READ_MERGE_MAX_SPAN:
+                span = spans[-1]
+                if end > span[1]: span[1] = end
+                span[2].append(i)
+            else:
+                spans.append([address, end, [i]])
+
+        if len(spans) > 1:
+            self.prefetch([(start, end - start) for start, end, _ in spans]) # One syscall for all spans
+
+        for start, end, indices in spans:
+            data = self._read_view(start, end - start, 'read_many')
+            for i in indices:
+                address, type_name = requests[i]
+                fmt, default = _READ_TYPE_STRUCTS[type_name]
+                offset = address - start
+                if data is not None:
+                    results[i] = fmt.unpack_from(data, offset)[0]
+                else:
+                    results[i] = default
+        return results
 
     # --- Write Methods ---
     def write_bytes(self, address, data: bytes):
         if not self.is_attached(): return False
         try:
-            self.pm.write_bytes(address, data, len(data))
+            self.backend.write(address, data)
+            self.invalidate_range(address, len(data))
             return True
-        except pymem.exception.MemoryWriteError as e:
+        except MemoryWriteError as e:
             print(f"Error writing bytes at {hex(address)}: {e}")
             return False
         except Exception as e:
@@ -157,9 +709,10 @@ class MemoryHandler:
     def write_uint(self, address, value: int):
         if not self.is_attached(): return False
         try:
-            self.pm.write_uint(address, value)
+            self.backend.write(address, struct.pack('<I', value))
+            self.invalidate_range(address, 4)
             return True
-        except pymem.exception.MemoryWriteError as e:
+        except MemoryWriteError as e:
             print(f"Error writing uint at {hex(address)}: {e}")
             return False
         except Exception as e:
@@ -169,9 +722,10 @@ class MemoryHandler:
     def write_float(self, address, value: float):
         if not self.is_attached(): return False
         try:
-            self.pm.write_float(address, value)
+            self.backend.write(address, struct.pack('<f', value))
+            self.invalidate_range(address, 4)
             return True
-        except pymem.exception.MemoryWriteError as e:
+        except MemoryWriteError as e:
             print(f"Error writing float at {hex(address)}: {e}")
             return False
         except Exception as e:
@@ -183,9 +737,13 @@ class MemoryHandler:
         if not self.is_attached(): return False
         try:
             byte_data = text.encode(encoding) + b'\0' # Add null terminator
-            self.pm.write_bytes(address, byte_data, len(byte_data))
+            self.backend.write(address, byte_data)
+            self.invalidate_range(address, len(byte_data))
+            with self._string_cache_lock: # Drop cached reads of the overwritten string
+                for key in [key for key in self._string_cache if key[0] == address]:
+                    del self._string_cache[key]
             return True
-        except pymem.exception.MemoryWriteError as e:
+        except MemoryWriteError as e:
             print(f"Error writing string at {hex(address)}: {e}")
             return False
         except Exception as e:
@@ -193,6 +751,25 @@ class MemoryHandler:
             return False
 
 
+class _ReadTag:
+    """Context manager behind MemoryHandler.tagged(): sets the thread's caller tag, restores the previous one."""
+    __slots__ = ('state', 'tag', 'previous')
+
+    def __init__(self, state: threading.local, tag: str):
+        self.state = state
+        self.tag = tag
+        self.previous = UNTAGGED
+
+    def __enter__(self):
+        self.previous = getattr(self.state, 'tag', UNTAGGED)
+        self.state.tag = self.tag
+        return self
+
+    def __exit__(self, *exc):
+        self.state.tag = self.previous
+        return False
+
+
 # Example Usage (Optional - can be run if this file is executed directly)
 if __name__ == "__main__":
     mem = MemoryHandler()
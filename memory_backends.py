@@ -0,0 +1,581 @@
+import bisect
+import ctypes
+import ctypes.util
+import errno
+import json
+import mmap
+import os
+import sys
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pymem
+    import pymem.memory
+    import pymem.process
+except ImportError: # pymem missing (e.g. offline analysis on Linux) - only the image backend is usable
+    pymem = None
+
+
+class MemoryReadError(Exception):
+    """Raised by a backend when `length` bytes at `address` cannot be read."""
+    def __init__(self, address: int, length: int, message: str = ""):
+        self.address = address
+        self.length = length
+        super().__init__(message or f"Could not read {length} bytes at {hex(address)}")
+
+
+class MemoryWriteError(Exception):
+    """Raised by a backend when a write fails (or the backend is read-only)."""
+    def __init__(self, address: int, length: int, message: str = ""):
+        self.address = address
+        self.length = length
+        super().__init__(message or f"Could not write {length} bytes at {hex(address)}")
+
+
+class MemoryBackend:
+    """
+    Raw access to a target address space. MemoryHandler does all typing, batching and
+    caching on top of read()/write(), so a backend only has to move bytes.
+    """
+    name = "backend"
+    batch_reads = False # True if read_batch() does several reads in one call (MemoryHandler then batches page fetches)
+
+    def __init__(self):
+        self.base_address: Optional[int] = None # Module base of the client executable
+        self.process_id: Optional[int] = None
+        self.executable_path: Optional[str] = None # Client executable on disk, if known (keys the offset cache)
+
+    def read(self, address: int, length: int) -> bytes:
+        """Returns exactly `length` bytes at `address` or raises MemoryReadError."""
+        raise NotImplementedError
+
+    def read_view(self, address: int, length: int):
+        """
+        Like read(), but may return a buffer that is only valid until this thread's next read
+        (MemoryHandler uses it for reads it decodes straight away and doesn't cache).
+        """
+        return self.read(address, length)
+
+    def read_batch(self, ranges: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """Reads several (address, length) ranges. Failed ranges come back as None instead of raising."""
+        results = []
+        for address, length in ranges:
+            try:
+                results.append(self.read(address, length))
+            except MemoryReadError:
+                results.append(None)
+        return results
+
+    def write(self, address: int, data: bytes):
+        """Writes `data` at `address` or raises MemoryWriteError."""
+        raise MemoryWriteError(address, len(data), f"{self.name} backend is read-only")
+
+    def begin_tick(self):
+        """Called by MemoryHandler.begin_tick() at the start of every read tick."""
+        pass
+
+    def query_regions(self) -> Optional[List[Tuple[int, int]]]:
+        """Returns the readable (start, size) regions if the backend knows them, else None."""
+        return None
+
+    def close(self):
+        pass
+
+    def describe(self) -> str:
+        return self.name
+
+
+READ_SCRATCH_SIZE = 0x10000 # Initial per-thread read buffer of the live backends (grown on demand, never shrunk)
+
+# VirtualQueryEx values used to decide which regions are readable
+MEM_COMMIT = 0x1000
+PAGE_NOACCESS = 0x01
+PAGE_GUARD = 0x100
+USER_SPACE_END = 0xFFFF0000 # 32-bit client (large address aware)
+
+
+class PymemBackend(MemoryBackend):
+    """Live WoW process via pymem (Windows)."""
+    name = "pymem"
+
+    def __init__(self, process_name: str, pid: Optional[int] = None):
+        """`pid` picks one process explicitly (otherwise the first one named `process_name`)."""
+        super().__init__()
+        if pymem is None:
+            raise RuntimeError("pymem is not installed")
+        self.process_name = process_name
+        self.pm = pymem.Pymem(pid if pid is not None else process_name)
+        # Note: process.module_from_name finds the module based on the process name.
+        # For WoW.exe, this usually gives the correct base address.
+        module = pymem.process.module_from_name(self.pm.process_handle, process_name)
+        self.base_address = module.lpBaseOfDll if module else None
+        self.process_id = self.pm.process_id
+        try:
+            self.executable_path = module.filename if module else None
+        except Exception: # GetModuleFileNameEx refused - the scanner falls back to hashing the mapped code
+            self.executable_path = None
+
+    @classmethod
+    def attach(cls, process_name: str, pid: Optional[int] = None) -> Optional['PymemBackend']:
+        """Attaches to `process_name` (or `pid`), printing the outcome. Returns None if attaching failed."""
+        if pymem is None:
+            print("Error: pymem is not installed - cannot attach to a live process.")
+            return None
+        try:
+            backend = cls(process_name, pid)
+            print(f"Successfully attached to {process_name} (PID: {backend.process_id})")
+            print(f"Base address: {hex(backend.base_address)}")
+            return backend
+        except pymem.exception.ProcessNotFound:
+            print(f"Error: Process '{process_name}' not found. Is WoW running?")
+        except Exception as e:
+            print(f"An unexpected error occurred during attachment: {e}")
+        return None
+
+    def read(self, address: int, length: int) -> bytes:
+        try:
+            return self.pm.read_bytes(address, length)
+        except pymem.exception.MemoryReadError as e:
+            raise MemoryReadError(address, length, str(e)) from e
+
+    def write(self, address: int, data: bytes):
+        try:
+            self.pm.write_bytes(address, data, len(data))
+        except pymem.exception.MemoryWriteError as e:
+            raise MemoryWriteError(address, len(data), str(e)) from e
+
+    def query_regions(self) -> Optional[List[Tuple[int, int]]]:
+        """Walks the address space with VirtualQueryEx, returning committed, readable regions."""
+        regions = []
+        address = 0
+        try:
+            while address < USER_SPACE_END:
+                mbi = pymem.memory.virtual_query(self.pm.process_handle, address)
+                size = mbi.RegionSize
+                if not size: break
+                if mbi.State == MEM_COMMIT and not mbi.Protect & (PAGE_NOACCESS | PAGE_GUARD) and mbi.Protect:
+                    regions.append((mbi.BaseAddress or 0, size))
+                address = (mbi.BaseAddress or 0) + size
+        except Exception as e:
+            if not regions:
+                print(f"Error querying memory regions: {e}")
+                return None # Unknown - MemoryHandler then skips region checks
+        return regions
+
+    def close(self):
+        try:
+            self.pm.close_process()
+        except Exception:
+            pass
+
+    def describe(self) -> str:
+        return f"{self.process_name} (PID: {self.process_id})"
+
+
+# --- Windows: direct ReadProcessMemory ---
+
+
+class Win32Backend(PymemBackend):
+    """
+    Live WoW process on Windows with reads done by calling ReadProcessMemory through ctypes
+    into a long-lived per-thread buffer. pymem's read_bytes allocates and zero-fills a new
+    ctypes array per call and goes through several wrapper layers; here a read is one
+    foreign call plus one copy out of the buffer (read_view skips that copy for reads that are
+    decoded right away). Attaching, writes and region queries still go through pymem (they are rare).
+    """
+    name = "win32"
+
+    def __init__(self, process_name: str, pid: Optional[int] = None):
+        super().__init__(process_name, pid)
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._read_process_memory = kernel32.ReadProcessMemory
+        self._read_process_memory.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+                                              ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+        self._read_process_memory.restype = ctypes.c_int
+        self._handle = ctypes.c_void_p(self.pm.process_handle)
+        self._local = threading.local() # GUI update loop and rotation thread each get their own buffer
+
+    def _scratch(self, length: int):
+        """This thread's read buffer (at least `length` bytes) and its bytes-read counter."""
+        local = self._local
+        buffer = getattr(local, 'buffer', None)
+        if buffer is None or len(buffer) < length:
+            size = READ_SCRATCH_SIZE
+            while size < length: size *= 2
+            buffer = local.buffer = ctypes.create_string_buffer(size)
+            local.address = ctypes.addressof(buffer)
+            local.transferred = ctypes.c_size_t()
+            local.transferred_ref = ctypes.byref(local.transferred)
+        return local
+
+    def read(self, address: int, length: int) -> bytes:
+        scratch = self._scratch(length)
+        if not self._read_process_memory(self._handle, address, scratch.address, length, scratch.transferred_ref) \
+                or scratch.transferred.value != length:
+            raise MemoryReadError(address, length, f"ReadProcessMemory failed (error {ctypes.get_last_error()})")
+        return ctypes.string_at(scratch.address, length)
+
+    def read_view(self, address: int, length: int):
+        """read() without the copy: a view over this thread's buffer, overwritten by its next read."""
+        scratch = self._scratch(length)
+        if not self._read_process_memory(self._handle, address, scratch.address, length, scratch.transferred_ref) \
+                or scratch.transferred.value != length:
+            raise MemoryReadError(address, length, f"ReadProcessMemory failed (error {ctypes.get_last_error()})")
+        return memoryview(scratch.buffer)[:length]
+
+    def read_batch(self, ranges: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        if not ranges: return []
+        scratch = self._scratch(max(length for _, length in ranges))
+        read = self._read_process_memory
+        handle, target, transferred, transferred_ref = self._handle, scratch.address, scratch.transferred, scratch.transferred_ref
+        results = []
+        for address, length in ranges:
+            if read(handle, address, target, length, transferred_ref) and transferred.value == length:
+                results.append(ctypes.string_at(target, length))
+            else:
+                results.append(None)
+        return results
+
+    def describe(self) -> str:
+        return f"{self.process_name} (PID: {self.process_id}, ReadProcessMemory)"
+
+
+# --- Linux / Wine: process_vm_readv ---
+IOV_MAX = 1024 # Max iovecs per process_vm_readv call (Linux UIO_MAXIOV)
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+_libc = None
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        for name in ('process_vm_readv', 'process_vm_writev'):
+            function = getattr(_libc, name)
+            function.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong]
+            function.restype = ctypes.c_ssize_t
+    return _libc
+
+def find_pids(process_name: str) -> List[int]:
+    """PIDs whose comm or argv[0] basename is `process_name` (case-insensitive; Wine keeps the .exe name)."""
+    wanted = process_name.lower()
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit(): continue
+        try:
+            with open(f'/proc/{entry}/comm', 'r') as f:
+                comm = f.read().strip().lower()
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                argv0 = f.read().split(b'\0', 1)[0].decode(errors='ignore')
+        except OSError:
+            continue # Process exited or not ours
+        exe = argv0.replace('\\', '/').rsplit('/', 1)[-1].lower()
+        if comm == wanted or comm == wanted[:15] or exe == wanted:
+            pids.append(int(entry))
+    return pids
+
+
+class ProcessVmBackend(MemoryBackend):
+    """
+    Live process on Linux (e.g. the client under Wine) read with process_vm_readv.
+    read_batch() turns a whole batch into one syscall with one iovec per range;
+    /proc/<pid>/mem pread is the fallback if the syscall is unavailable or refused.
+    """
+    name = "process_vm"
+    batch_reads = True
+
+    def __init__(self, pid: int, module_name: Optional[str] = None):
+        super().__init__()
+        self.process_id = pid
+        self.module_name = module_name
+        self.use_syscall = True
+        self._mem_fd: Optional[int] = None
+        self._local = threading.local() # Per-thread single-read buffer and iovec pair (see read)
+        try:
+            _load_libc()
+        except (OSError, AttributeError):
+            self.use_syscall = False # No process_vm_readv in this libc
+        if not os.path.exists(f'/proc/{pid}'):
+            raise ProcessLookupError(f"No process with PID {pid}")
+        self.base_address = self._find_module_base(module_name) if module_name else None
+
+    @classmethod
+    def attach(cls, process_name: str, pid: Optional[int] = None) -> Optional['ProcessVmBackend']:
+        """Attaches to `pid` or the first process named `process_name`, printing the outcome."""
+        try:
+            if pid is None:
+                pids = find_pids(process_name)
+                if not pids:
+                    print(f"Error: Process '{process_name}' not found. Is WoW running?")
+                    return None
+                pid = pids[0]
+            backend = cls(pid, process_name)
+            backend.read(backend.base_address or 0x400000, 2) # Fails early without ptrace permission
+            print(f"Successfully attached to {process_name} (PID: {pid}) via {'process_vm_readv' if backend.use_syscall else '/proc/pid/mem'}")
+            print(f"Base address: {hex(backend.base_address) if backend.base_address else 'unknown'}")
+            return backend
+        except MemoryReadError as e:
+            print(f"Error: Cannot read process {pid} memory ({e}). Check ptrace permissions (ptrace_scope / same user).")
+        except Exception as e:
+            print(f"An unexpected error occurred during attachment: {e}")
+        return None
+
+    def _maps(self) -> List[Tuple[int, int, str, str]]:
+        """Parses /proc/<pid>/maps into (start, end, perms, path)."""
+        maps = []
+        with open(f'/proc/{self.process_id}/maps', 'r') as f:
+            for line in f:
+                parts = line.split(None, 5)
+                start, end = parts[0].split('-')
+                maps.append((int(start, 16), int(end, 16), parts[1], parts[5].strip() if len(parts) > 5 else ''))
+        return maps
+
+    def _find_module_base(self, module_name: str) -> Optional[int]:
+        """Lowest mapping of `module_name`; also notes its file (the Wine-side path is a host path)."""
+        wanted = module_name.lower()
+        for start, _, _, path in self._maps():
+            if path.replace('\\', '/').rsplit('/', 1)[-1].lower() == wanted:
+                self.executable_path = path if os.path.isfile(path) else None
+                return start
+        return None
+
+    def query_regions(self) -> Optional[List[Tuple[int, int]]]:
+        try:
+            return [(start, end - start) for start, end, perms, _ in self._maps() if perms.startswith('r')]
+        except OSError:
+            return None
+
+    def read(self, address: int, length: int) -> bytes:
+        if self.use_syscall:
+            # Single reads (page cache misses) reuse one buffer and iovec pair instead of building a batch
+            local = self._local
+            if getattr(local, 'capacity', 0) < length:
+                size = READ_SCRATCH_SIZE
+                while size < length: size *= 2
+                local.buffer = ctypes.create_string_buffer(size)
+                local.capacity = size
+                local.iovecs = (_IOVec * 2)((ctypes.addressof(local.buffer), size), (0, 0)) # [local, remote]
+                local.pointers = (ctypes.addressof(local.iovecs), ctypes.addressof(local.iovecs) + ctypes.sizeof(_IOVec))
+            local_iovec, remote_iovec = local.iovecs
+            local_iovec.iov_len = remote_iovec.iov_len = length
+            remote_iovec.iov_base = address
+            done = _libc.process_vm_readv(self.process_id, local.pointers[0], 1, local.pointers[1], 1, 0)
+            if done == length:
+                return ctypes.string_at(local_iovec.iov_base, length)
+            if done >= 0 or ctypes.get_errno() not in (errno.ENOSYS, errno.EPERM):
+                raise MemoryReadError(address, length)
+            # Syscall refused: read_batch switches to /proc/<pid>/mem
+        data = self.read_batch(((address, length),))[0]
+        if data is None: raise MemoryReadError(address, length)
+        return data
+
+    def read_batch(self, ranges: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        if not ranges: return []
+        if self.use_syscall:
+            try:
+                return self._readv(ranges)
+            except OSError as e:
+                if e.errno not in (errno.ENOSYS, errno.EPERM): raise
+                self.use_syscall = False # Fall through to /proc/<pid>/mem from now on
+        return [self._pread(address, length) for address, length in ranges]
+
+    def _readv(self, ranges: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """
+        One process_vm_readv per IOV_MAX ranges. The kernel stops at the first unreadable range
+        (never splitting one), so after a failure the call is repeated from the next range.
+        """
+        libc = _libc
+        total = sum(length for _, length in ranges)
+        buffer = ctypes.create_string_buffer(total)
+        base = ctypes.addressof(buffer)
+        count = len(ranges)
+        local = (_IOVec * count)()
+        remote = (_IOVec * count)()
+        position = 0
+        for i, (address, length) in enumerate(ranges):
+            local[i].iov_base = base + position
+            local[i].iov_len = length
+            remote[i].iov_base = address
+            remote[i].iov_len = length
+            position += length
+
+        readable = [False] * count
+        iovec_size = ctypes.sizeof(_IOVec)
+        local_base, remote_base = ctypes.addressof(local), ctypes.addressof(remote)
+        first = 0
+        while first < count:
+            batch = min(IOV_MAX, count - first)
+            done = libc.process_vm_readv(self.process_id, local_base + first * iovec_size, batch,
+                                         remote_base + first * iovec_size, batch, 0)
+            if done < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOSYS, errno.EPERM, errno.ESRCH): raise OSError(err, os.strerror(err))
+                done = 0 # EFAULT etc.: the first range of this batch is unreadable
+            index = first
+            end = first + batch
+            while index < end and done >= remote[index].iov_len:
+                done -= remote[index].iov_len
+                readable[index] = True
+                index += 1
+            # Stopped early: ranges[index] is (at least partly) unreadable - skip it and continue after it
+            first = index + 1 if index < end else index
+
+        raw = buffer.raw
+        results: List[Optional[bytes]] = []
+        position = 0
+        for i, (_, length) in enumerate(ranges):
+            results.append(raw[position:position + length] if readable[i] else None)
+            position += length
+        return results
+
+    def _pread(self, address: int, length: int) -> Optional[bytes]:
+        try:
+            if self._mem_fd is None:
+                self._mem_fd = os.open(f'/proc/{self.process_id}/mem', os.O_RDWR if os.access(f'/proc/{self.process_id}/mem', os.W_OK) else os.O_RDONLY)
+            data = os.pread(self._mem_fd, length, address)
+        except OSError:
+            return None
+        return data if len(data) == length else None
+
+    def write(self, address: int, data: bytes):
+        length = len(data)
+        if self.use_syscall:
+            source = ctypes.create_string_buffer(bytes(data), length)
+            local = _IOVec(ctypes.addressof(source), length)
+            remote = _IOVec(address, length)
+            if _libc.process_vm_writev(self.process_id, ctypes.addressof(local), 1, ctypes.addressof(remote), 1, 0) == length:
+                return
+        try: # Fallback (also covers read-only pages, which /proc/pid/mem may still write)
+            if self._mem_fd is None:
+                self._mem_fd = os.open(f'/proc/{self.process_id}/mem', os.O_RDWR)
+            if os.pwrite(self._mem_fd, bytes(data), address) == length:
+                return
+        except OSError as e:
+            raise MemoryWriteError(address, length, str(e)) from e
+        raise MemoryWriteError(address, length)
+
+    def close(self):
+        if self._mem_fd is not None:
+            os.close(self._mem_fd)
+            self._mem_fd = None
+
+    def describe(self) -> str:
+        return f"PID {self.process_id} ({'process_vm_readv' if self.use_syscall else '/proc/pid/mem'})"
+
+
+def attach_default_backend(process_name: str) -> Optional[MemoryBackend]:
+    """Attaches to the live client with the backend suited to this platform (ReadProcessMemory on Windows, process_vm_readv on Linux)."""
+    if sys.platform.startswith('linux'):
+        return ProcessVmBackend.attach(process_name)
+    if sys.platform == 'win32':
+        return Win32Backend.attach(process_name)
+    return PymemBackend.attach(process_name)
+
+
+# --- Memory Images ---
+# An image is a sparse dump of an address space stored as two files:
+#   <path>.json  index: {"version", "base_address", "regions": [[address, size, file_offset], ...]}
+#   <path>.bin   the region bytes, back to back
+MEMORY_IMAGE_VERSION = 1
+
+def _image_paths(path: str) -> Tuple[str, str]:
+    root, ext = os.path.splitext(path)
+    if ext not in ('.json', '.bin'): root = path
+    return root + '.json', root + '.bin'
+
+def save_memory_image(path: str, regions: Iterable[Tuple[int, bytes]], base_address: Optional[int] = None):
+    """
+    Writes a memory image from (address, data) pairs. Overlapping regions are not merged,
+    later ones simply win on lookup ties, so callers should pass disjoint regions.
+    """
+    index_path, data_path = _image_paths(path)
+    index = []
+    offset = 0
+    with open(data_path, 'wb') as f:
+        for address, data in sorted(regions, key=lambda r: r[0]):
+            if not data: continue
+            f.write(data)
+            index.append([address, len(data), offset])
+            offset += len(data)
+    with open(index_path, 'w') as f:
+        json.dump({'version': MEMORY_IMAGE_VERSION, 'base_address': base_address, 'regions': index}, f)
+
+def dump_memory_image(backend: MemoryBackend, path: str, ranges: Iterable[Tuple[int, int]]) -> int:
+    """
+    Reads (address, size) ranges from a live backend and saves them as an image.
+    Unreadable ranges are skipped. Returns the number of ranges written.
+    """
+    regions = []
+    for address, size in ranges:
+        try:
+            regions.append((address, bytes(backend.read(address, size))))
+        except MemoryReadError:
+            print(f"Skipping unreadable range {hex(address)} (+{hex(size)})")
+    save_memory_image(path, regions, backend.base_address)
+    return len(regions)
+
+
+class MemoryImageBackend(MemoryBackend):
+    """
+    Serves reads from a memory image so the whole read stack runs offline (no client needed).
+    The data file is mmap'd copy-on-write: writes land in memory only, never on disk.
+    """
+    name = "image"
+
+    def __init__(self, path: str):
+        super().__init__()
+        index_path, data_path = _image_paths(path)
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index.get('version') != MEMORY_IMAGE_VERSION:
+            raise ValueError(f"Unsupported memory image version {index.get('version')} in {index_path}")
+        self.path = data_path
+        self.base_address = index.get('base_address')
+
+        # Merge regions that are adjacent both in memory and in the data file
+        regions = []
+        for address, size, offset in sorted(index['regions']):
+            if regions and regions[-1][0] + regions[-1][1] == address and regions[-1][2] + regions[-1][1] == offset:
+                regions[-1][1] += size
+            else:
+                regions.append([address, size, offset])
+        self._starts = [r[0] for r in regions]
+        self._regions = [tuple(r) for r in regions]
+
+        self._file = open(data_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY) if size else None
+
+    def _locate(self, address: int, length: int) -> int:
+        """Returns the file offset for [address, address + length) or raises MemoryReadError."""
+        i = bisect.bisect_right(self._starts, address) - 1
+        if i >= 0:
+            start, size, offset = self._regions[i]
+            if address + length <= start + size:
+                return offset + (address - start)
+        raise MemoryReadError(address, length)
+
+    def read(self, address: int, length: int) -> bytes:
+        offset = self._locate(address, length)
+        return self._map[offset:offset + length]
+
+    def write(self, address: int, data: bytes):
+        try:
+            offset = self._locate(address, len(data))
+        except MemoryReadError:
+            raise MemoryWriteError(address, len(data)) from None
+        self._map[offset:offset + len(data)] = data
+
+    def query_regions(self) -> List[Tuple[int, int]]:
+        return [(start, size) for start, size, _ in self._regions]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def describe(self) -> str:
+        return f"image {self.path}"
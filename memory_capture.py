@@ -0,0 +1,217 @@
+import struct
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from memory_backends import MemoryBackend, MemoryReadError
+
+# --- Capture File Format ---
+# [MAGIC]
+# [tick block]*       zlib-compressed records: (address, length, ok) + `length` bytes if ok
+# [tick index]        one TICK_INDEX_ENTRY per tick: (tick, timestamp, file offset, compressed size, record count)
+# [footer]            (index offset, tick count, base address, FOOTER_MAGIC)
+# The index sits at the end so a capture can be written in one pass and still be opened
+# and seeked tick by tick without decompressing the whole session.
+CAPTURE_MAGIC = b'WOWCAP01'
+FOOTER_MAGIC = b'WOWCAPIX'
+RECORD_HEADER = struct.Struct('<QIB')
+TICK_INDEX_ENTRY = struct.Struct('<IdQII')
+FOOTER = struct.Struct('<QIQ8s')
+CAPTURE_COMPRESSION_LEVEL = 1 # Fast; page-sized reads of game memory compress well anyway
+
+TickIndexEntry = Tuple[int, float, int, int, int]
+
+
+class CaptureRecorder:
+    """Collects the reads of each tick and appends them to a capture file as one compressed block."""
+
+    def __init__(self, path: str, base_address: Optional[int] = None):
+        self.path = path
+        self.base_address = base_address or 0
+        self._file = open(path, 'wb')
+        self._file.write(CAPTURE_MAGIC)
+        self._index: List[TickIndexEntry] = []
+        self._tick = 0
+        self._reads: Dict[Tuple[int, int], Optional[bytes]] = {} # (address, length) -> data, None = failed
+        self.bytes_recorded = 0
+
+    def record(self, address: int, length: int, data: Optional[bytes]):
+        """Logs one read of the current tick (`data` None for a failed read). Repeats are stored once."""
+        key = (address, length)
+        if key not in self._reads:
+            self._reads[key] = data
+
+    def end_tick(self):
+        """Writes the current tick block (even if empty, to keep tick numbering aligned)."""
+        payload = bytearray()
+        for (address, length), data in self._reads.items():
+            payload += RECORD_HEADER.pack(address, length, data is not None)
+            if data is not None: payload += data
+        block = zlib.compress(bytes(payload), CAPTURE_COMPRESSION_LEVEL)
+        self._index.append((self._tick, time.time(), self._file.tell(), len(block), len(self._reads)))
+        self._file.write(block)
+        self.bytes_recorded += len(payload)
+        self._reads = {}
+        self._tick += 1
+
+    def close(self):
+        """Flushes the last tick and writes the index and footer."""
+        if self._file.closed: return
+        self.end_tick()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(TICK_INDEX_ENTRY.pack(*entry))
+        self._file.write(FOOTER.pack(index_offset, len(self._index), self.base_address, FOOTER_MAGIC))
+        self._file.close()
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick
+
+
+class RecordingBackend(MemoryBackend):
+    """Pass-through backend that logs every read of the wrapped backend into a CaptureRecorder."""
+    name = "recording"
+
+    def __init__(self, inner: MemoryBackend, recorder: CaptureRecorder):
+        super().__init__()
+        self.inner = inner
+        self.recorder = recorder
+        self.base_address = inner.base_address
+        self.process_id = inner.process_id
+        self.executable_path = inner.executable_path
+        self.batch_reads = inner.batch_reads
+
+    def read(self, address: int, length: int) -> bytes:
+        try:
+            data = self.inner.read(address, length)
+        except MemoryReadError:
+            self.recorder.record(address, length, None)
+            raise
+        self.recorder.record(address, length, bytes(data))
+        return data
+
+    def read_batch(self, ranges):
+        results = self.inner.read_batch(ranges)
+        for (address, length), data in zip(ranges, results):
+            self.recorder.record(address, length, bytes(data) if data is not None else None)
+        return results
+
+    def write(self, address: int, data: bytes):
+        self.inner.write(address, data)
+
+    def begin_tick(self):
+        self.recorder.end_tick()
+        self.inner.begin_tick()
+
+    def query_regions(self):
+        return self.inner.query_regions()
+
+    def describe(self) -> str:
+        return f"{self.inner.describe()} (recording to {self.recorder.path})"
+
+
+def read_capture_index(f) -> Tuple[List[TickIndexEntry], int]:
+    """Reads the tick index and base address from an open capture file."""
+    f.seek(0)
+    if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+        raise ValueError("Not a memory capture file")
+    f.seek(-FOOTER.size, 2)
+    index_offset, tick_count, base_address, magic = FOOTER.unpack(f.read(FOOTER.size))
+    if magic != FOOTER_MAGIC:
+        raise ValueError("Capture file has no index (recording not closed?)")
+    f.seek(index_offset)
+    raw = f.read(tick_count * TICK_INDEX_ENTRY.size)
+    return [entry for entry in TICK_INDEX_ENTRY.iter_unpack(raw)], base_address
+
+
+class ReplayBackend(MemoryBackend):
+    """
+    Serves reads from a capture file, one recorded tick at a time. MemoryHandler.begin_tick()
+    advances to the next tick; only that tick's block is decompressed.
+    Reads that were not recorded in the current tick raise MemoryReadError.
+    """
+    name = "replay"
+
+    def __init__(self, path: str, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.loop = loop # Wrap around to tick 0 after the last tick instead of staying on it
+        self._file = open(path, 'rb')
+        self.index, self.base_address = read_capture_index(self._file)
+        self.tick = -1
+        self.finished = False
+        self._reads: Dict[Tuple[int, int], Optional[bytes]] = {}
+        self._spans: List[Tuple[int, int, bytes]] = [] # Successful reads, for sub-range lookups
+        if self.index: self.seek_tick(0)
+
+    @property
+    def tick_count(self) -> int:
+        return len(self.index)
+
+    def seek_tick(self, tick: int):
+        """Loads the reads recorded for `tick`."""
+        _, _, offset, size, _ = self.index[tick]
+        self._file.seek(offset)
+        payload = zlib.decompress(self._file.read(size))
+        reads = {}
+        spans = []
+        position = 0
+        while position < len(payload):
+            address, length, ok = RECORD_HEADER.unpack_from(payload, position)
+            position += RECORD_HEADER.size
+            if ok:
+                data = payload[position:position + length]
+                position += length
+                reads[(address, length)] = data
+                spans.append((address, address + length, data))
+            else:
+                reads[(address, length)] = None
+        spans.sort(key=lambda span: span[0])
+        self._reads = reads
+        self._spans = spans
+        self.tick = tick
+
+    def begin_tick(self):
+        if self.tick + 1 < len(self.index):
+            self.seek_tick(self.tick + 1)
+        elif self.loop and self.index:
+            self.seek_tick(0)
+        else:
+            self.finished = True # Keep serving the last tick
+
+    def read(self, address: int, length: int) -> bytes:
+        key = (address, length)
+        if key in self._reads:
+            data = self._reads[key]
+            if data is None: raise MemoryReadError(address, length)
+            return data
+        # Not read with this exact shape (e.g. page cache disabled on replay) - try a covering read
+        for start, end, data in self._spans:
+            if start > address: break
+            if address + length <= end:
+                return data[address - start:address - start + length]
+        raise MemoryReadError(address, length)
+
+    def close(self):
+        self._file.close()
+
+    def describe(self) -> str:
+        return f"replay {self.path} (tick {self.tick + 1}/{len(self.index)})"
+
+
+# Prints a per-tick summary of a capture: python memory_capture.py <capture file>
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python memory_capture.py <capture file>")
+        sys.exit(1)
+    with open(sys.argv[1], 'rb') as capture:
+        ticks, base = read_capture_index(capture)
+    print(f"{sys.argv[1]}: {len(ticks)} ticks, base address {hex(base)}")
+    if ticks:
+        duration = ticks[-1][1] - ticks[0][1]
+        total = sum(entry[3] for entry in ticks)
+        print(f"Duration: {duration:.1f}s, compressed size: {total / 1024:.1f} KiB")
+        for tick, timestamp, _, size, records in ticks:
+            print(f"  Tick {tick:6d}  +{timestamp - ticks[0][1]:8.3f}s  {records:5d} reads  {size:8d} bytes")
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# --- Name Cache Settings ---
+NAME_CACHE_FILE = "name_cache.json" # Resolved player names, one section per realm
+NAME_CACHE_MAX_ENTRIES = 5000       # LRU bound per realm (a full battleground weekend is a few hundred)
+NAME_NEGATIVE_TTL = 5.0             # Seconds a GUID the name store couldn't resolve is not looked up again
+NAME_CACHE_VERSION = 1
+
+
+class NameCache:
+    """
+    GUID -> player name cache in front of the client's name store hash walk.
+
+    Resolved names are kept in LRU order (bounded by `max_entries`) and persisted to disk per
+    realm, so known players never touch the name store again, even after a restart. GUIDs the
+    name store can't resolve yet (the client requests names from the server lazily) are cached
+    as negative entries for `negative_ttl` seconds and never persisted.
+    """
+
+    def __init__(self, cache_file: str = NAME_CACHE_FILE, max_entries: int = NAME_CACHE_MAX_ENTRIES,
+                 negative_ttl: float = NAME_NEGATIVE_TTL):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.realm: Optional[str] = None
+        self._names: "OrderedDict[int, str]" = OrderedDict() # Least recently used first
+        self._negative: Dict[int, float] = {} # guid -> monotonic expiry time
+        self._dirty = False # Names added since the last save
+        self._lock = threading.Lock() # Looked up from the GUI and the rotation thread
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def get(self, guid: int) -> Optional[str]:
+        """
+        The cached name for `guid`, "" if it is negatively cached (recently unresolvable),
+        or None if the caller has to look it up.
+        """
+        with self._lock:
+            name = self._names.get(guid)
+            if name is not None:
+                self._names.move_to_end(guid)
+                self.hits += 1
+                return name
+            expiry = self._negative.get(guid)
+            if expiry is not None:
+                if time.monotonic() < expiry:
+                    self.negative_hits += 1
+                    return ""
+                del self._negative[guid]
+            self.misses += 1
+            return None
+
+    def put(self, guid: int, name: str):
+        """Stores a lookup result: a name, or "" for a negative entry that expires after negative_ttl."""
+        if guid == 0: return
+        with self._lock:
+            if not name:
+                self._negative[guid] = time.monotonic() + self.negative_ttl
+                return
+            self._negative.pop(guid, None)
+            if self._names.get(guid) != name: self._dirty = True
+            self._names[guid] = name
+            self._names.move_to_end(guid)
+            while len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+
+    def invalidate(self, guid: int):
+        with self._lock:
+            self._names.pop(guid, None)
+            self._negative.pop(guid, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._names), 'negative': len(self._negative), 'hits': self.hits,
+                'misses': self.misses, 'negative_hits': self.negative_hits}
+
+    # --- Persistence ---
+    def _read_file(self) -> dict:
+        if not os.path.exists(self.cache_file): return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading name cache {self.cache_file}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get('version') != NAME_CACHE_VERSION: return {}
+        return data
+
+    def load(self, realm: str):
+        """Switches to `realm` (saving the current one first) and loads its persisted names."""
+        if realm == self.realm: return
+        self.save()
+        names = self._read_file().get('realms', {}).get(realm, [])
+        with self._lock:
+            self.realm = realm
+            self._names = OrderedDict()
+            self._negative.clear()
+            for guid_hex, name in names[-self.max_entries:]: # Saved least recently used first
+                try: self._names[int(guid_hex, 16)] = name
+                except (TypeError, ValueError): continue
+            self._dirty = False
+        print(f"Name cache: loaded {len(self._names)} names for realm '{realm}'.")
+
+    def save(self):
+        """Writes the current realm's names back (other realms in the file are kept). No-op if unchanged."""
+        if self.realm is None or not self._dirty: return
+        data = self._read_file() or {'version': NAME_CACHE_VERSION, 'realms': {}}
+        with self._lock:
+            data.setdefault('realms', {})[self.realm] = [[f"{guid:X}", name] for guid, name in self._names.items()]
+            self._dirty = False
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Error writing name cache {self.cache_file}: {e}")
@@ -1,9 +1,53 @@
+import math
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+import numpy as np
 import offsets
-from memory import MemoryHandler
-from wow_object import WowObject
-from typing import Optional, Generator, Dict, Set # Added Generator, Dict, Set
-import pymem
+from memory import MemoryHandler, MemoryReadError, ObjectHeader, PROCESS_NAME
+from wow_object import WowObject, update_dynamic_batch, PARALLEL_READ_WORKERS, PARALLEL_READ_THRESHOLD
+from world_objects import WorldObject, WORLD_OBJECT_CLASSES, make_world_object
+from object_table import ObjectTable
+from spatial_index import SpatialIndex, SlotFilter
+from name_cache import NameCache
+from refresh_scheduler import RefreshScheduler
+from world_model import WorldModel, WorldDelta
+from pointer_chain import PointerChain, PointerResolver, LIFETIME_TICK, LIFETIME_OBJECT, LIFETIME_SESSION
+from signature_scanner import on_offsets_changed
+from typing import Optional, Generator, Dict, List, Sequence, Set, Tuple, Union # Added Generator, Dict, Set
+
+# --- Frame Epoch Settings ---
+# refresh() skips calls within the frame of the last refresh only once the epoch has been seen to
+# advance (a wrong FRAME_TIMESTAMP offset reading a constant never skips), and never for longer
+# than this: an epoch stuck past it forces full refreshes and logs a warning
+FRAME_EPOCH_MAX_SKIP_SECONDS = 0.25
+
+# --- Pointer Chains (resolved and cached through ObjectManager.pointers) ---
+# Header types modelled as WowObjects (table row, per-tick refresh); GameObjects, DynamicObjects
+# and Corpses get lazy world_objects classes, everything else (items, containers) is not built
+UNIT_TYPES = (WowObject.TYPE_UNIT, WowObject.TYPE_PLAYER)
+
+def _build_pointer_chains():
+    """(Re)builds the chains from offsets.py - again whenever the signature scanner updates offsets."""
+    global CLIENT_CONNECTION_CHAIN, OBJECT_MANAGER_CHAIN, FIRST_OBJECT_CHAIN, UNIT_NAME_CHAIN, NAME_STORE_MASK_CHAIN, NAME_STORE_BASE_CHAIN
+    global OBJECT_HASH_MASK_CHAIN, OBJECT_HASH_BUCKETS_CHAIN
+    # ClientConnection and the ObjectManager pointer only change on re-login -> per session (reset in _initialize_addresses)
+    CLIENT_CONNECTION_CHAIN = PointerChain("client_connection", [offsets.STATIC_CLIENT_CONNECTION], LIFETIME_SESSION)
+    OBJECT_MANAGER_CHAIN = PointerChain("object_manager", [offsets.OBJECT_MANAGER_OFFSET], LIFETIME_SESSION, parent=CLIENT_CONNECTION_CHAIN)
+    FIRST_OBJECT_CHAIN = PointerChain("first_object", [offsets.FIRST_OBJECT_OFFSET], LIFETIME_TICK, parent=OBJECT_MANAGER_CHAIN)
+    # GUID -> object hash table: mask and bucket array move when the table grows -> per tick
+    OBJECT_HASH_MASK_CHAIN = PointerChain("object_hash_mask", [offsets.OBJECT_HASH_MASK_OFFSET], LIFETIME_TICK, parent=OBJECT_MANAGER_CHAIN, final_is_pointer=False)
+    OBJECT_HASH_BUCKETS_CHAIN = PointerChain("object_hash_buckets", [offsets.OBJECT_HASH_BUCKETS_OFFSET], LIFETIME_TICK, parent=OBJECT_MANAGER_CHAIN)
+    # Unit name string address: fixed for the lifetime of the unit (keyed by WowObject.generation)
+    UNIT_NAME_CHAIN = PointerChain("unit_name", [offsets.UNIT_NAME_CACHE_OFFSET, offsets.UNIT_NAME_STRING_OFFSET], LIFETIME_OBJECT, final_is_pointer=False)
+    # Name store hash mask / bucket array: only change when the table grows -> re-read once per tick
+    NAME_STORE_MASK_CHAIN = PointerChain("name_store_mask", [offsets.NAME_STORE_BASE + offsets.NAME_MASK_OFFSET], LIFETIME_TICK, final_is_pointer=False)
+    NAME_STORE_BASE_CHAIN = PointerChain("name_store_base", [offsets.NAME_STORE_BASE + offsets.NAME_BASE_OFFSET], LIFETIME_TICK)
+
+_build_pointer_chains()
+on_offsets_changed(_build_pointer_chains)
+
 
 class ObjectManager:
     """
@@ -21,19 +65,72 @@ class ObjectManager:
         self.local_player: Optional[WowObject] = None
         self.target_guid: int = 0
         self.target: Optional[WowObject] = None
-        self.object_cache: Dict[int, WowObject] = {} # Cache objects by GUID
+        self.focus_guid: int = 0
+        self.world = WorldModel() # Live objects + spawn/despawn/relocate events (see scan_objects)
+        self.object_cache: Dict[int, WowObject] = self.world.objects # Cache objects by GUID (same dict as the world model)
+        self.table = ObjectTable() # Columnar storage behind every cached WowObject (positions, health, ...)
+        self.scheduler = RefreshScheduler(self.table) # Which cached objects refresh() updates each tick
+        self.spatial = SpatialIndex() # Grid over the table's positions, rebuilt lazily (see spatial_index())
+        self._spatial_dirty = True # Set whenever positions or the object set change
+        self._spatial_objects: Dict[int, WowObject] = {} # slot -> object indexed by self.spatial
+        self.address_index: Dict[int, int] = {} # guid -> base address as of the last scan_objects() walk
+        self.object_headers: Dict[int, ObjectHeader] = {} # guid -> header read by that walk (type filters)
+        self.world_objects: Dict[int, WorldObject] = {} # guid -> lazy GameObject/DynamicObject/Corpse, built on demand
+        self._index_tick = None # mem.tick_id of that walk
+        self.lookup_stats = {'hash': 0, 'index': 0, 'scan': 0, 'miss': 0} # How get_object_by_guid cache misses were resolved
         self.last_refresh_time: float = 0.0
+        # Frame epochs (offsets.FRAME_TIMESTAMP): a refresh within the frame of the last completed one is skipped
+        self.refreshed_epoch: int = 0 # Epoch of the last completed refresh (0 = none / epoch unreadable)
+        self._epoch_requests = 0 # refresh() calls seen in the current epoch
+        self._epoch_advanced = False # Two completed refreshes saw different epochs (the offset looks live)
+        self._epoch_stuck_warned = False # Warned about the current stuck epoch
+        self.epoch_stats = {'requests': 0, 'refreshes': 0, 'skipped': 0, 'epochs': 0,
+                            'max_requests_per_epoch': 0, 'refresh_seconds': 0.0}
+        self.pointers = PointerResolver(mem_handler) # Memoized pointer chains (see *_CHAIN above)
+        self.names = NameCache() # Player names by GUID, persisted per realm (see get_player_name_from_guid)
+        self._realm_fallback_logged = False # Logged that the name cache is keyed on the executable (see _realm_key)
+        self.spellbook_hash: Optional[int] = None # Hash of the raw spell slot map block as last read
+        self.spellbook_version = 0 # Bumped whenever that hash changes (talent swap, level-up, new spell)
+        self.known_spell_ids: Tuple[int, ...] = () # Decoded from the block with that hash
+        # Optional thread pool for the per-object reads of refresh() (see set_parallel_reads)
+        self.read_executor: Optional[ThreadPoolExecutor] = None
+        self.read_workers = 0
+        self.parallel_threshold = PARALLEL_READ_THRESHOLD
+        self.set_parallel_reads(PARALLEL_READ_WORKERS)
 
         self._initialize_addresses()
 
+    def set_parallel_reads(self, workers: int, threshold: Optional[int] = None):
+        """
+        Sets the size of the read pool refresh() shards per-object reads across (0 = no pool, all
+        reads on the refreshing thread) and the due-object count from which it is used.
+        """
+        if threshold is not None: self.parallel_threshold = max(1, threshold)
+        workers = max(0, int(workers))
+        if workers == self.read_workers: return
+        old = self.read_executor
+        self.read_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="om-read") if workers > 1 else None
+        self.read_workers = workers if workers > 1 else 0
+        if old is not None: old.shutdown(wait=True) # An in-flight refresh() already holds its futures
+
+    def close(self):
+        """Shuts the read pool down (the ObjectManager keeps working with serial reads)."""
+        self.set_parallel_reads(0)
+
     def _initialize_addresses(self):
         """Reads the core pointers needed to access the object manager."""
         if not self.mem or not self.mem.is_attached():
             print("ObjectManager Error: Memory Handler not attached.")
             return False # Indicate failure
 
+        # Fresh session: forget every cached chain (ClientConnection/ObjectManager may have moved)
+        self.pointers.invalidate()
+
+        # Player names persist per realm: (re)load the realm's section if we logged into another one
+        self.names.load(self._realm_key())
+
         # Read ClientConnection - Static Pointer Address
-        cc_ptr_val = self.mem.read_uint(offsets.STATIC_CLIENT_CONNECTION)
+        cc_ptr_val = self.pointers.resolve(CLIENT_CONNECTION_CHAIN)
         if not cc_ptr_val:
             print(f"ObjectManager Error: Could not read ClientConnection at {hex(offsets.STATIC_CLIENT_CONNECTION)}.")
             return False
@@ -42,7 +139,7 @@ class ObjectManager:
 
         # Read ObjectManager base pointer (Relative to ClientConnection value)
         om_base_addr = self.client_connection + offsets.OBJECT_MANAGER_OFFSET
-        om_base_val = self.mem.read_uint(om_base_addr)
+        om_base_val = self.pointers.resolve(OBJECT_MANAGER_CHAIN)
         if not om_base_val:
             print(f"ObjectManager Error: Could not read ObjectManager base pointer at {hex(om_base_addr)}.")
             return False
@@ -50,8 +147,7 @@ class ObjectManager:
         # print(f"DEBUG: ObjectManager Base: {hex(self.object_manager_base)}")
 
         # Read First Object address (Relative to ObjectManager base)
-        first_obj_addr = self.object_manager_base + offsets.FIRST_OBJECT_OFFSET
-        first_obj_val = self.mem.read_uint(first_obj_addr)
+        first_obj_val = self.pointers.resolve(FIRST_OBJECT_CHAIN)
         # No need to fail if first object is 0 (might happen briefly)
         self.first_object_address = first_obj_val
         # print(f"DEBUG: First Object Address: {hex(self.first_object_address)}")
@@ -79,6 +175,21 @@ class ObjectManager:
         return True # Initialization successful (or at least pointers read)
 
 
+    def _realm_key(self) -> str:
+        """
+        Section of the persisted name cache: the realm name (offsets.REALM_NAME, unverified), or the
+        client executable's name if that can't be read, so the cache still persists across restarts.
+        """
+        realm = self.mem.read_string(offsets.REALM_NAME, max_length=64)
+        if realm: return realm
+        backend = self.mem.backend
+        path = getattr(backend, 'executable_path', None) or getattr(backend, 'process_name', None) or PROCESS_NAME
+        key = "exe:" + os.path.basename(path.replace('\\', '/')).lower()
+        if not self._realm_fallback_logged:
+            print(f"[ObjectManager] Realm name unreadable (offsets.REALM_NAME), keying the name cache on '{key}'.")
+            self._realm_fallback_logged = True
+        return key
+
     def is_ready(self) -> bool:
         """Check if the Object Manager has been successfully initialized."""
         # Check essential pointers are non-zero
@@ -90,10 +201,11 @@ class ObjectManager:
             # self.local_player_guid # Can be 0 temporarily
         )
 
-    def get_object_by_guid(self, guid_to_find: int) -> Optional[WowObject]:
+    def get_object_by_guid(self, guid_to_find: int) -> Optional[Union[WowObject, WorldObject]]:
         """
-        Returns a WowObject from the cache or iterates the OM list if not found.
-        Updates dynamic data for the returned object.
+        Returns a WowObject from the cache, or finds it through the client's object hash table /
+        the last scan's GUID -> address index. Only if neither has it is the object list walked
+        again, at most once per tick (see scan_objects).
         """
         if guid_to_find == 0:
             return None
@@ -103,63 +215,105 @@ class ObjectManager:
                  return None # Still not ready
 
         # --- Check Cache ---
-        cached_obj = self.object_cache.get(guid_to_find)
+        cached_obj = self.object_cache.get(guid_to_find) or self.world_objects.get(guid_to_find)
         if cached_obj:
             # Quick validity check: Re-read type from memory. If 0, likely invalid.
             obj_type = self.mem.read_short(cached_obj.base_address + offsets.OBJECT_TYPE)
             if obj_type == cached_obj.type and obj_type != 0:
                  # cached_obj.update_dynamic_data(force_update=True) # Update data before returning
                  return cached_obj
-            else:
+            elif self.world_objects.pop(guid_to_find, None) is None:
                  # Object seems invalid, remove from cache
                  # print(f"DEBUG: Removing invalidated object {hex(guid_to_find)} from cache.")
-                 del self.object_cache[guid_to_find]
+                 self.world.despawn(guid_to_find)
+                 self.pointers.release_object(guid_to_find)
 
-        # --- Iterate Object List if not in cache or cache invalidated ---
-        current_address = self.first_object_address
-        checked_objects = 0
-        max_checks = 5000 # Safety limit
-
-        while current_address != 0 and current_address % 2 == 0 and checked_objects < max_checks:
-            try:
-                current_guid = self.mem.read_ulonglong(current_address + offsets.OBJECT_GUID)
-
-                if current_guid == guid_to_find:
-                    # Found it, create object, cache it, return it
-                    new_obj = WowObject(current_address, self.mem, self.local_player_guid if current_guid == self.local_player_guid else 0)
-                    if new_obj.guid != 0: # Check if core data read okay
-                        # Get name immediately upon finding
-                        self._fetch_object_name(new_obj)
-                        # new_obj.update_dynamic_data(force_update=True) # Update dynamics
-                        self.object_cache[guid_to_find] = new_obj
-                        return new_obj
-                    else:
-                        return None # Failed to init object
+        # --- Not cached: client hash table, then the last scan's GUID -> address index ---
+        found = self._find_in_hash_table(guid_to_find)
+        if found is not None: self.lookup_stats['hash'] += 1
+        else:
+            found = self._find_in_address_index(guid_to_find)
+            if found is not None: self.lookup_stats['index'] += 1
+        if found is None:
+            # Not in the list as of the last walk: walk again at most once per tick (new objects
+            # land in the cache through the world model), otherwise it just isn't there
+            if self._index_tick != self.mem.tick_id:
+                self.scan_objects()
+                obj = self.object_cache.get(guid_to_find)
+                if obj is None and guid_to_find in self.address_index:
+                    obj = self._world_object(guid_to_find) # Lazy types are only built on demand
+                self.lookup_stats['scan' if obj is not None else 'miss'] += 1
+                return obj
+            self.lookup_stats['miss'] += 1
+            return None
 
-                # Move to the next object
-                next_addr = self.mem.read_uint(current_address + offsets.NEXT_OBJECT_OFFSET)
-                if next_addr == current_address or next_addr == 0 or next_addr % 2 != 0:
-                    break # End of list or invalid pointer or loop detected
-                current_address = next_addr
-                checked_objects += 1
-            except Exception as e:
-                # print(f"Error reading object list at 0x{current_address:X}: {e}") # Debug
-                return None # Exit on memory error
+        # Found it, create object (from the header already read), cache it, return it
+        address, header = found
+        if header.type not in UNIT_TYPES:
+            obj = make_world_object(address, self.mem, header) # None for items/containers
+            if obj is not None: self.world_objects[guid_to_find] = obj
+            return obj
+        new_obj = WowObject(address, self.mem, self.local_player_guid if guid_to_find == self.local_player_guid else 0, self.table, header)
+        if new_obj.guid == 0: return None # Failed to init object
+        # Get name immediately upon finding
+        self._fetch_object_name(new_obj)
+        self.world.spawn(new_obj)
+        return new_obj
+
+    def _find_in_hash_table(self, guid: int) -> Optional[Tuple[int, ObjectHeader]]:
+        """
+        Looks `guid` up in the client's GUID -> object hash table: one bucket chain, every
+        candidate validated by the GUID in its object header. (address, header) or None.
+        """
+        mask = self.pointers.resolve(OBJECT_HASH_MASK_CHAIN)
+        buckets = self.pointers.resolve(OBJECT_HASH_BUCKETS_CHAIN)
+        if not mask or not buckets: return None
+        try:
+            with self.mem.tagged("om.hash"):
+                bucket = buckets + 12 * (mask & guid & 0xFFFFFFFF)
+                link_offset, node = self.mem.read_many([(bucket, 'uint'), (bucket + 8, 'uint')])
+                for _ in range(50): # Safety limit (chains are a handful of nodes)
+                    if node == 0 or node & 1 or not self.mem.is_valid_pointer(node): return None # Tagged = end of chain
+                    header = self.mem.read_object_header(node)
+                    if header is None: return None
+                    if header.guid == guid and header.type != WowObject.TYPE_NONE: return node, header
+                    node = self.mem.read_uint(node + link_offset + 4)
+        except MemoryReadError:
+            pass
+        return None
+
+    def _find_in_address_index(self, guid: int) -> Optional[Tuple[int, ObjectHeader]]:
+        """`guid`'s address from the last object list walk, if its header there still carries that GUID."""
+        address = self.address_index.get(guid)
+        if not address: return None
+        try:
+            header = self.mem.read_object_header(address)
+        except MemoryReadError:
+            return None
+        if header is None or header.guid != guid: return None
+        return address, header
 
-        return None # Not found after iteration
+    def _world_object(self, guid: int) -> Optional[WorldObject]:
+        """The lazy object for a non-unit `guid` of the last walk, built from its header on first use."""
+        address = self.address_index.get(guid)
+        obj = self.world_objects.get(guid)
+        if obj is not None and obj.base_address == address: return obj
+        header = self.object_headers.get(guid)
+        obj = make_world_object(address, self.mem, header) if address and header is not None else None
+        if obj is not None: self.world_objects[guid] = obj
+        return obj
 
 
     def _fetch_object_name(self, obj: WowObject):
          """Internal helper to get object name based on type."""
          if not obj or obj.name: return # Skip if no object or name exists
 
-         if obj.is_player:
-             obj.name = self.get_player_name_from_guid(obj.guid)
-         elif obj.is_unit:
-             obj.name = self._get_unit_name(obj.base_address)
-         # elif obj.type == WowObject.TYPE_GAMEOBJECT: # Removed
-         #    obj.name = self._get_gameobject_name(obj.base_address) # Removed
-         # Add other types if needed (GameObjects etc.)
+         with self.mem.tagged("name"):
+             if obj.is_player:
+                 obj.name = self.get_player_name_from_guid(obj.guid)
+             elif obj.is_unit:
+                 obj.name = self._get_unit_name(obj.base_address, obj.generation)
+         # GameObjects/DynamicObjects/Corpses resolve their own names lazily (see world_objects.py)
          # else: obj.name = f"Obj_{obj.type}@{hex(obj.base_address)}" # Default fallback
 
 
@@ -172,7 +326,9 @@ class ObjectManager:
             if current_local_guid != self.local_player_guid:
                  print(f"Local player GUID changed: 0x{self.local_player_guid:X} -> 0x{current_local_guid:X}")
                  self.local_player_guid = current_local_guid
-                 self.object_cache.clear() # Clear cache if player changes
+                 self.world.clear() # Clear cache if player changes
+                 self.world_objects.clear()
+                 self.pointers.invalidate(LIFETIME_OBJECT)
                  self.local_player = None
 
         if not self.local_player_guid:
@@ -225,19 +381,27 @@ class ObjectManager:
 
 
     def get_player_name_from_guid(self, guid: int) -> str:
-        """Retrieves a player's name using the name cache structure."""
+        """
+        Retrieves a player's name: from the NameCache if known (or recently unresolvable),
+        otherwise from the client's name store, and caches the result.
+        """
         if guid == 0: return ""
+        cached = self.names.get(guid)
+        if cached is not None: return cached # "" = negative entry, not resolvable yet
         # Added check for readiness
         if not self.is_ready(): return ""
 
+        name = self._read_player_name(guid)
+        self.names.put(guid, name)
+        return name
+
+    def _read_player_name(self, guid: int) -> str:
+        """Walks the client's name store hash chain for `guid`. "" if not (yet) there."""
         try:
             # NAME_STORE_BASE points to the structure containing Mask and Base pointers
-            name_store_struct_addr = offsets.NAME_STORE_BASE
-            mask_addr = name_store_struct_addr + offsets.NAME_MASK_OFFSET
-            name_base_ptr_addr = name_store_struct_addr + offsets.NAME_BASE_OFFSET
-
-            mask = self.mem.read_uint(mask_addr)
-            name_base_ptr = self.mem.read_uint(name_base_ptr_addr) # Pointer to array of linked list heads
+            # Mask and bucket array pointer are cached for the tick (see NAME_STORE_*_CHAIN)
+            mask = self.pointers.resolve(NAME_STORE_MASK_CHAIN)
+            name_base_ptr = self.pointers.resolve(NAME_STORE_BASE_CHAIN) # Pointer to array of linked list heads
 
             if mask == 0 or name_base_ptr == 0:
                 # print("Warning: Name cache mask or name array base pointer is zero.") # Reduce spam
@@ -269,7 +433,7 @@ class ObjectManager:
                     name_addr = current_node_ptr + offsets.NAME_NODE_NAME_OFFSET
 
                     if name_addr != 0:
-                        player_name = self.mem.read_string(name_addr, max_length=40) # Names are usually short
+                        player_name = self.mem.read_string(name_addr, max_length=40, generation=guid, site="player_name") # Names are usually short
                         return player_name
                     else:
                         return "" # Name pointer was null
@@ -282,7 +446,7 @@ class ObjectManager:
 
             return "" # Not found in linked list
 
-        except pymem.exception.MemoryReadError:
+        except MemoryReadError:
             # print(f"Memory Error reading player name for GUID {hex(guid)}") # Debug spam
             return ""
         except Exception as e:
@@ -290,139 +454,303 @@ class ObjectManager:
             return ""
 
 
-    def _get_unit_name(self, unit_base_address: int) -> str:
-        """Reads NPC/Unit name (simpler structure usually)."""
+    def _get_unit_name(self, unit_base_address: int, generation: Optional[int] = None) -> str:
+        """Reads NPC/Unit name (simpler structure usually). `generation` (WowObject.generation) enables the string cache."""
         # Try reading via Base -> +0x964 -> +0x5C -> Name String (Based on C# example)
         try:
-            ptr1 = self.mem.read_uint(unit_base_address + 0x964)
-            if ptr1 == 0: return "" # First pointer invalid
+            # Cached per object while `generation` is known, see UNIT_NAME_CHAIN
+            name_addr = self.pointers.resolve(UNIT_NAME_CHAIN, unit_base_address, generation)
+            if name_addr == 0: return "" # A pointer in the chain was invalid
 
-            ptr2 = self.mem.read_uint(ptr1 + 0x5C)
-            if ptr2 == 0: return "" # Second pointer invalid (points to name string)
-
-            name_addr = ptr2 # ptr2 holds the address of the name string
-
-            unit_name = self.mem.read_string(name_addr, max_length=100)
+            unit_name = self.mem.read_string(name_addr, max_length=100, generation=generation, site="unit_name")
             return unit_name
-        except pymem.exception.MemoryReadError:
+        except MemoryReadError:
             return "" # Common if object is invalid
         except Exception as e:
             # print(f"Error reading unit name at {hex(unit_base_address)}: {e}") # Debug
             return ""
 
-    def get_objects(self, object_type_filter: Optional[int] = None) -> Generator[WowObject, None, None]:
+    def get_objects(self, object_type_filter: Optional[int] = None) -> Generator[Union[WowObject, WorldObject], None, None]:
         """
-        Generator that yields WowObjects from the object manager.
-        Iterates the linked list and uses the cache. Updates names.
+        Generator that yields objects from the object manager, in object list order: WowObjects
+        for units/players, lazy world_objects classes for GameObjects, DynamicObjects and Corpses.
+        Scans the list first (see scan_objects), so the cache and world events are current.
+        The filter is applied to the type in each node's header, so nothing is built for other types.
         """
         if not self.is_ready():
             return
+        self.scan_objects()
+        objects = self.world.objects
+        headers = self.object_headers
+        for guid in self.address_index:
+            # --- Skip on the header type before touching any object ---
+            obj_type = headers[guid].type
+            if object_type_filter is not None and obj_type != object_type_filter: continue
+            if obj_type in UNIT_TYPES: obj = objects.get(guid)
+            elif obj_type in WORLD_OBJECT_CLASSES: obj = self._world_object(guid)
+            else: continue # Items/containers are not modelled
+            if obj is not None:
+                yield obj
+
+    def scan_objects(self) -> Optional[WorldDelta]:
+        """
+        Walks the object list once and applies the difference to the world model: objects are
+        built only for new GUIDs, moved ones are updated in place, missing ones are dropped.
+        Spawn/relocate/despawn events fire for each. Returns the delta (None if not ready).
+        """
+        if not self.is_ready():
+            return None
 
-        processed_guids_this_scan: Set[int] = set() # Keep track of GUIDs found in this scan
+        seen: Dict[int, int] = {} # guid -> base address, in list order
+        headers = {} # guid -> header: type filter, and building new/moved objects without another read
         current_address = self.first_object_address
         max_objects = 5000 # Safety limit
+        complete = False # Reached the end of the list (not cut short by a bad node)
 
-        while current_address != 0 and current_address % 2 == 0 and len(processed_guids_this_scan) < max_objects:
+        # The walk has to follow next pointers one node at a time, but nodes seen last scan are
+        # mostly still there: batch-fetch their headers so the walk reads them from the page cache
+        self.mem.prefetch([(current_address, offsets.OBJECT_HEADER_SIZE)] +
+                          [(address, offsets.OBJECT_HEADER_SIZE) for address in self.address_index.values()])
+
+        while len(seen) < max_objects:
+            if not self.mem.is_valid_pointer(current_address):
+                complete = current_address == 0 or current_address & 1 # Null / tagged next pointer = regular end of list
+                break
             try:
-                obj_guid = self.mem.read_ulonglong(current_address + offsets.OBJECT_GUID)
-
-                if obj_guid == 0: # Skip invalid GUIDs immediately
-                     next_address = self.mem.read_uint(current_address + offsets.NEXT_OBJECT_OFFSET)
-                     if next_address == current_address or next_address == 0 or next_address % 2 != 0: break
-                     current_address = next_address
-                     continue
-
-                processed_guids_this_scan.add(obj_guid)
-
-                # --- Use or create object ---
-                obj = self.object_cache.get(obj_guid)
-                if obj and obj.base_address == current_address:
-                    # Object exists in cache and base address matches - likely valid
-                    pass # Use existing 'obj'
-                else:
-                    # Not in cache or base address mismatch - create/recreate
-                    obj = WowObject(current_address, self.mem, self.local_player_guid if obj_guid == self.local_player_guid else 0)
-                    if obj.guid == 0: # Failed core read
-                         next_address = self.mem.read_uint(current_address + offsets.NEXT_OBJECT_OFFSET)
-                         if next_address == current_address or next_address == 0 or next_address % 2 != 0: break
-                         current_address = next_address
-                         continue # Skip this invalid object
-
-                    # Fetch name for new object and cache it
-                    self._fetch_object_name(obj)
-                    self.object_cache[obj_guid] = obj
-
-                # --- Yield if matches filter ---
-                if object_type_filter is None or obj.type == object_type_filter:
-                    yield obj
-
-                # --- Move to next object ---
-                next_address = self.mem.read_uint(current_address + offsets.NEXT_OBJECT_OFFSET)
-                if next_address == current_address or next_address == 0 or next_address % 2 != 0:
-                    break # End of list or invalid pointer or loop detected
-                current_address = next_address
-
-            except pymem.exception.MemoryReadError:
+                # GUID, next pointer, type and unit field pointer all sit in the 0x40-byte header -> one read per node
+                with self.mem.tagged("om.walk"):
+                    header = self.mem.read_object_header(current_address)
+                if header is None: break # Unreadable node - list is broken here
+            except MemoryReadError:
                  # Likely hit end of valid memory or object list corruption
-                 # print(f"MemoryReadError during object iteration near {hex(current_address)}") # Debug
                  break
-            except Exception as e:
-                # print(f"Error during object iteration at {hex(current_address)}: {e}") # Debug
-                break # Stop iteration on other errors
-
-        # --- Cache Cleanup (Remove objects not seen in this scan) ---
-        current_cache_guids = set(self.object_cache.keys())
-        guids_to_remove = current_cache_guids - processed_guids_this_scan
-        for guid_to_remove in guids_to_remove:
-             # Keep local player/target in cache even if briefly not seen? Optional.
-             # if guid_to_remove != self.local_player_guid and guid_to_remove != self.target_guid:
-             try:
-                  del self.object_cache[guid_to_remove]
-                  # print(f"DEBUG: Removed GUID {hex(guid_to_remove)} from OM cache.")
-             except KeyError: pass # Already removed
+            obj_guid, next_address = header.guid, header.next
+
+            if obj_guid != 0: # Skip invalid GUIDs
+                seen[obj_guid] = current_address
+                headers[obj_guid] = header
+
+            # --- Move to next object ---
+            if next_address == current_address or (next_address and not next_address & 1 and not self.mem.is_valid_pointer(next_address)):
+                break # Loop detected or invalid pointer
+            current_address = next_address
+
+        # --- Apply the delta (units/players only: filtered on the header type, nothing built for the rest) ---
+        units = {guid: address for guid, address in seen.items() if headers[guid].type in UNIT_TYPES}
+        world = self.world
+        new, gone, moved = world.diff(units)
+        spawned, despawned, relocated = [], [], []
+        for guid in moved:
+            # Same GUID at a new address: refresh the core data in place instead of rebuilding
+            obj = self.object_cache[guid]
+            old_address = obj.base_address
+            self.pointers.release_object(guid) # Object-lifetime chains were resolved from the old base
+            obj.relocate(seen[guid], headers[guid])
+            relocated.append((obj, old_address))
+            world.relocated(obj, old_address)
+        for guid in new:
+            obj = WowObject(seen[guid], self.mem, self.local_player_guid if guid == self.local_player_guid else 0, self.table, headers[guid])
+            if obj.guid == 0: continue # Failed core read
+            # Fetch name for new object and cache it
+            self._fetch_object_name(obj)
+            spawned.append(obj)
+        # New rows are zeroed (position 0,0,0, health 0): read them before anyone sees the objects,
+        # refresh() ran before this scan and only knew the old ones
+        try:
+            update_dynamic_batch(spawned, self.read_executor, self.read_workers, self.parallel_threshold)
+        except Exception as e:
+            print(f"[ObjectManager] Error reading {len(spawned)} spawned objects: {e}")
+        for obj in spawned: world.spawn(obj)
+        if complete: # A cut-short walk says nothing about the objects after the bad node
+            for guid in gone:
+                self.pointers.release_object(guid)
+                obj = world.despawn(guid)
+                if obj is not None: despawned.append(obj)
+        world.order = list(units)
+        world.scans += 1
+        self.address_index = seen
+        self.object_headers = headers
+        # Lazy objects are rebuilt on demand: drop the ones that moved, and (full walk) the ones gone
+        for guid, obj in list(self.world_objects.items()):
+            address = seen.get(guid)
+            if address != obj.base_address and (address is not None or complete):
+                del self.world_objects[guid]
+        self._index_tick = self.mem.tick_id
+        if spawned or despawned or relocated: self._spatial_dirty = True
+        return WorldDelta(spawned, despawned, relocated)
 
 
     def refresh(self):
-        """Updates the local player and target objects."""
+        """
+        Updates the local player, target and due cached objects. Returns False without reading
+        anything else if the game hasn't rendered a frame since the last completed refresh (same
+        epoch): the cached state is still current. True after a refresh.
+        Skipping needs an epoch that has advanced before and ends FRAME_EPOCH_MAX_SKIP_SECONDS
+        after the last refresh, so a wrong or frozen FRAME_TIMESTAMP can't freeze the world state.
+        """
         now = time.time()
         # Add throttling if needed, e.g., refresh max 5 times/sec
         # if now < self.last_refresh_time + 0.2: return
 
+        # --- Frame epoch: game state only changes between rendered frames ---
+        # Read past the page cache, before begin_tick(): a skipped call keeps this tick's cached
+        # pages, TickField values and spatial index
+        epoch = self.mem.read_uint_uncached(offsets.FRAME_TIMESTAMP)
+        stats = self.epoch_stats
+        if epoch and epoch == self.refreshed_epoch and self.is_ready():
+            if not self._epoch_advanced:
+                pass # Never seen it change: may not be a frame counter at all -> always refresh
+            elif now - self.last_refresh_time < FRAME_EPOCH_MAX_SKIP_SECONDS:
+                stats['requests'] += 1
+                self._epoch_requests += 1
+                stats['skipped'] += 1
+                stats['max_requests_per_epoch'] = max(stats['max_requests_per_epoch'], self._epoch_requests)
+                return False
+            elif not self._epoch_stuck_warned:
+                print(f"[ObjectManager] Warning: frame epoch stuck at {epoch} for over {FRAME_EPOCH_MAX_SKIP_SECONDS}s "
+                      f"(offsets.FRAME_TIMESTAMP wrong?) - refreshing every call")
+                self._epoch_stuck_warned = True
+
+        # New read tick: drop the memory page cache so this refresh sees fresh data
+        self.mem.begin_tick()
+
         if not self.is_ready():
             if not self._initialize_addresses():
-                return # Still not ready
+                return False # Still not ready
+        stats['requests'] += 1
+        refresh_start = time.perf_counter()
+
+        # Head of the object list can change between ticks (cached for this tick only)
+        self.first_object_address = self.pointers.resolve(FIRST_OBJECT_CHAIN)
+
+        # Only due objects are updated this tick (tiers by role/distance, see RefreshScheduler).
+        # Tiering uses last tick's player position - a tick of movement doesn't change a tier.
+        self.focus_guid = self.mem.read_ulonglong(offsets.FOCUS_GUID)
+        player = self.local_player
+        origin = (player.x_pos, player.y_pos, player.z_pos) if player is not None else None
+        critical = (self.local_player_guid, self.target_guid, self.focus_guid)
+        due = self.scheduler.select(list(self.object_cache.values()), origin, critical, now)
+
+        # Fetch every page the updates below touch in one batch (one syscall on process_vm_readv)
+        ranges = []
+        for obj in due:
+            ranges.extend(obj.dynamic_read_ranges())
+        parallel = self.read_executor is not None and len(due) >= self.parallel_threshold
+        self.mem.prefetch(ranges, self.read_executor if parallel else None, self.read_workers)
 
         # Force update of player and target objects
         self.update_local_player()
         self.update_target()
 
-        # Update other cached objects (skip player/target as they were just updated)
-        # Make a copy of keys to avoid modification during iteration issues
-        cached_guids = list(self.object_cache.keys())
-        for guid in cached_guids:
-            if guid == self.local_player_guid or guid == self.target_guid:
-                continue # Skip already updated player/target
-            obj = self.object_cache.get(guid)
-            if obj:
-                try:
-                    # Optional: Add throttling here too if needed for performance
-                    obj.update_dynamic_data()
-                except Exception as e:
-                    # Log error and potentially remove object from cache if update fails badly
-                    print(f"[ObjectManager] Error updating cached object {guid:X}: {e}")
-                    # Optionally remove from cache: del self.object_cache[guid]
-            # else: Object disappeared from cache during iteration (rare)
+        # Update the other due objects (player/target were just updated) in one batch: the reads
+        # stay per object, decoding/storing is one array assignment per column
+        others = [obj for obj in due if obj.guid != self.local_player_guid and obj.guid != self.target_guid]
+        start = time.perf_counter()
+        try:
+            update_dynamic_batch(others, self.read_executor, self.read_workers, self.parallel_threshold)
+        except Exception as e:
+            print(f"[ObjectManager] Error updating {len(others)} cached objects: {e}")
+        self.scheduler.completed(others, time.perf_counter() - start, now)
+        self.scheduler.completed([obj for obj in (self.local_player, self.target) if obj is not None], now=now)
 
+        self._spatial_dirty = True # Positions were re-read
         self.last_refresh_time = now
+        # Completed: later calls in this epoch can skip (0 = epoch unreadable, never skip)
+        if epoch and self.refreshed_epoch and epoch != self.refreshed_epoch:
+            self._epoch_advanced = True
+            self._epoch_stuck_warned = False
+        self.refreshed_epoch = epoch
+        self._epoch_requests = 1
+        stats['refreshes'] += 1
+        stats['epochs'] += bool(epoch)
+        stats['refresh_seconds'] += time.perf_counter() - refresh_start
+        return True
+
+
+    def epoch_dedup_stats(self) -> Dict[str, float]:
+        """
+        refresh() deduplication by frame epoch: calls, full refreshes, skipped calls (same epoch
+        as the last refresh), the most calls seen in one epoch, and the estimated time saved
+        (skipped calls x mean refresh time).
+        """
+        stats = dict(self.epoch_stats)
+        refreshes = stats['refreshes']
+        mean = stats['refresh_seconds'] / refreshes if refreshes else 0.0
+        stats['skip_rate'] = stats['skipped'] / stats['requests'] if stats['requests'] else 0.0
+        stats['saved_seconds'] = stats['skipped'] * mean
+        return stats
+
+    def refresh_staleness(self) -> Dict[str, Dict[str, float]]:
+        """Per refresh tier: object count and mean/max seconds since the last update (see RefreshScheduler)."""
+        return self.scheduler.staleness(list(self.object_cache.values()))
+
+    # --- Spatial Queries ---
+    def spatial_index(self) -> SpatialIndex:
+        """The spatial index over every cached object, rebuilt if positions changed since the last build."""
+        if self._spatial_dirty or self.spatial.built_tick != self.mem.tick_id:
+            # Only cached objects: a despawned object someone still holds keeps its slot until collected
+            self._spatial_objects = {obj.slot: obj for obj in list(self.object_cache.values()) if obj.table is self.table}
+            # A new index each time: a built index is never modified, so snapshots can keep it (see world_snapshot.py)
+            spatial = SpatialIndex(self.spatial.cell_size)
+            spatial.rebuild(self.table, list(self._spatial_objects), tick=self.mem.tick_id)
+            self.spatial = spatial
+            self._spatial_dirty = False
+        return self.spatial
+
+    def enemy_filter(self, slots: np.ndarray) -> np.ndarray:
+        """SlotFilter: living, attackable units (see WowObject.is_attackable), never the local player."""
+        columns = self.table.columns
+        unattackable = WowObject.UNIT_FLAG_NON_ATTACKABLE | WowObject.UNIT_FLAG_OOC_NOT_ATTACKABLE
+        mask = (columns['type'][slots] == WowObject.TYPE_UNIT) & ~columns['dead'][slots] & \
+               ((columns['flags'][slots] & unattackable) == 0)
+        if self.local_player is not None: mask &= slots != self.local_player.slot
+        return mask
+
+    def _objects_at(self, slots: np.ndarray) -> List[WowObject]:
+        """Objects owning `slots` (as of the last spatial index build), in order."""
+        return [self._spatial_objects[slot] for slot in slots.tolist()]
+
+    def _player_position(self) -> Optional[Sequence[float]]:
+        player = self.local_player
+        return (player.x_pos, player.y_pos, player.z_pos) if player is not None else None
+
+    def within_radius(self, pos: Optional[Sequence[float]], radius: float, filter: Optional[SlotFilter] = None) -> List[WowObject]:
+        """Objects within `radius` of pos (default: the local player) passing `filter`, nearest first."""
+        pos = pos or self._player_position()
+        if pos is None: return []
+        return self._objects_at(self.spatial_index().within_radius(pos, radius, filter))
+
+    def k_nearest(self, pos: Optional[Sequence[float]], k: int, filter: Optional[SlotFilter] = None,
+                  max_distance: float = math.inf) -> List[WowObject]:
+        """Up to `k` objects nearest to pos (default: the local player) passing `filter`, nearest first."""
+        pos = pos or self._player_position()
+        if pos is None: return []
+        return self._objects_at(self.spatial_index().k_nearest(pos, k, filter, max_distance))
+
+    def count_in_cone(self, pos: Optional[Sequence[float]], facing: float, angle: float, radius: float,
+                      filter: Optional[SlotFilter] = None) -> int:
+        """Objects passing `filter` within `radius` of pos inside the `angle`-wide cone around `facing` (radians)."""
+        pos = pos or self._player_position()
+        if pos is None: return 0
+        return self.spatial_index().count_in_cone(pos, facing, angle, radius, filter)
+
+    def calculate_distance(self, obj: Optional[WowObject]) -> float:
+        """3D distance from the local player to `obj`, or -1.0 if either is missing."""
+        player = self.local_player
+        if player is None or obj is None: return -1.0
+        return math.sqrt((player.x_pos - obj.x_pos) ** 2 + (player.y_pos - obj.y_pos) ** 2 + (player.z_pos - obj.z_pos) ** 2)
 
 
     def read_known_spell_ids(self) -> list[int]:
-        """Reads the list of known spell IDs directly from memory using verified offsets."""
-        spell_ids = []
+        """
+        Reads the list of known spell IDs directly from memory using verified offsets: one bulk
+        read of the spell slot map. The block is only decoded when its hash differs from the last
+        read; a change bumps `spellbook_version` (see spellbook_changed()).
+        """
         # Added readiness check
         if not self.is_ready():
             print("ObjectManager Error: Cannot read spell IDs, OM not fully initialized.")
-            return spell_ids
+            return []
 
         try:
             known_spell_count_addr = offsets.SPELLBOOK_KNOWN_SPELL_COUNT_ADDRESS
@@ -431,30 +759,38 @@ class ObjectManager:
             max_reasonable_spells = 5000 # Increased limit slightly
             if not (0 < known_spell_count < max_reasonable_spells):
                 print(f"Warning: Spell count ({known_spell_count}) at {hex(known_spell_count_addr)} seems invalid. Aborting spell ID read.")
-                return spell_ids
+                return []
 
             spell_map_base_addr = offsets.SPELLBOOK_SLOT_MAP_ADDRESS
             if spell_map_base_addr == 0:
                  print("Error: SPELLBOOK_SLOT_MAP_ADDRESS is not defined or zero.")
-                 return spell_ids
-
-            # print(f"DEBUG: Reading {known_spell_count} spell IDs from {hex(spell_map_base_addr)}...") # Debug
-            for i in range(known_spell_count):
-                spell_id_addr = spell_map_base_addr + (i * 4)
-                spell_id = self.mem.read_uint(spell_id_addr)
-                if spell_id > 0: # Filter out potential zero entries
-                    spell_ids.append(spell_id)
-
-            # print(f"DEBUG: Successfully read {len(spell_ids)} positive spell IDs.") # Debug
-            return spell_ids
-
-        except pymem.exception.MemoryReadError as e:
+                 return []
+
+            with self.mem.tagged("spellbook"):
+                raw = self.mem.read_bytes(spell_map_base_addr, known_spell_count * 4)
+            if len(raw) != known_spell_count * 4:
+                print(f"Memory Error reading spellbook IDs: short read ({len(raw)} of {known_spell_count * 4} bytes).")
+                return []
+
+            block_hash = hash(raw) # The count is part of the block length
+            if block_hash != self.spellbook_hash:
+                spell_ids = array('I', raw) # uint32 slots, little-endian like the client
+                self.known_spell_ids = tuple(spell_id for spell_id in spell_ids if spell_id > 0) # Filter out potential zero entries
+                self.spellbook_hash = block_hash
+                self.spellbook_version += 1
+            return list(self.known_spell_ids)
+
+        except MemoryReadError as e:
             print(f"Memory Error reading spellbook IDs: {e}")
             return []
         except Exception as e:
             print(f"Unexpected Error reading spellbook IDs: {e}")
             return []
 
+    def spellbook_changed(self, version: Optional[int]) -> bool:
+        """Whether the spellbook changed since a caller saw `version` (as of the last read_known_spell_ids())."""
+        return version != self.spellbook_version
+
 
 # --- Example Usage ---
 if __name__ == "__main__":
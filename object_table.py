@@ -0,0 +1,119 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# --- Object Table Settings ---
+OBJECT_TABLE_INITIAL_CAPACITY = 256 # Rows; doubled when full (a busy city has ~1000 objects)
+
+# Column name -> dtype. One row ("slot") per live WowObject; the object reads and writes its
+# hot fields here instead of in instance attributes, so bulk updates and filters (distance,
+# health, flags) are single array expressions over every object.
+OBJECT_TABLE_COLUMNS = {
+    'guid': np.uint64,
+    'type': np.int16,
+    'x': np.float32,
+    'y': np.float32,
+    'z': np.float32,
+    'rotation': np.float32,
+    'level': np.uint32,
+    'health': np.uint32,
+    'max_health': np.uint32,
+    'power_type': np.int16,
+    'power': np.uint32,
+    'max_power': np.uint32,
+    'flags': np.uint32,
+    'target_guid': np.uint64,
+    'dead': np.bool_,
+    # Refresh bookkeeping (see RefreshScheduler)
+    'updated_at': np.float64,
+    'next_due': np.float64,
+    'refresh_tier': np.int8,
+}
+
+
+class ObjectTable:
+    """
+    Struct-of-arrays storage for WowObject fields: a NumPy array per column, a slot per live
+    object and a free list of released slots. `active` marks occupied slots.
+    """
+
+    def __init__(self, capacity: int = OBJECT_TABLE_INITIAL_CAPACITY):
+        self.capacity = max(1, capacity)
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(self.capacity, dtype=dtype)
+                                               for name, dtype in OBJECT_TABLE_COLUMNS.items()}
+        self.active = np.zeros(self.capacity, dtype=np.bool_)
+        self._free: List[int] = list(range(self.capacity - 1, -1, -1)) # Pop from the end -> low slots first
+        self._lock = threading.Lock() # Rows are allocated on the producer thread, released from whichever thread drops an object
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def allocate(self) -> int:
+        """Returns a zeroed, active slot, growing the table if needed."""
+        with self._lock:
+            if not self._free: self._grow(self.capacity * 2)
+            slot = self._free.pop()
+            for column in self.columns.values(): column[slot] = 0
+            self.active[slot] = True
+            self.count += 1
+        return slot
+
+    def release(self, slot: int):
+        """Returns `slot` to the free list (the owning object is gone)."""
+        with self._lock:
+            if slot < 0 or slot >= self.capacity or not self.active[slot]: return
+            self.active[slot] = False
+            self._free.append(slot)
+            self.count -= 1
+
+    def _grow(self, capacity: int):
+        old = self.capacity
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:old] = column
+            self.columns[name] = grown
+        active = np.zeros(capacity, dtype=np.bool_)
+        active[:old] = self.active
+        self.active = active
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def active_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.active)
+
+    def distances_from(self, x: float, y: float, z: float, slots: Optional[Iterable[int]] = None) -> np.ndarray:
+        """3D distances from (x, y, z) to every slot in `slots` (default: all active), in that order."""
+        slots = self.active_slots() if slots is None else np.asarray(slots, dtype=np.intp)
+        columns = self.columns
+        dx = columns['x'][slots] - np.float32(x)
+        dy = columns['y'][slots] - np.float32(y)
+        dz = columns['z'][slots] - np.float32(z)
+        return np.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def within_distance(self, x: float, y: float, z: float, max_distance: float,
+                        types: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Active slots within `max_distance` of (x, y, z), optionally only of the given object types."""
+        slots = self.active_slots()
+        if types is not None:
+            slots = slots[np.isin(self.columns['type'][slots], list(types))]
+        return slots[self.distances_from(x, y, z, slots) <= max_distance]
+
+
+class TableColumn:
+    """
+    Descriptor exposing one ObjectTable column of the owner's row (`self.table`, `self.slot`)
+    as a plain Python attribute, e.g. `x_pos = TableColumn('x', float)`.
+    """
+
+    def __init__(self, column: str, cast=int):
+        self.column = column
+        self.cast = cast
+
+    def __get__(self, obj, owner=None):
+        if obj is None: return self
+        return self.cast(obj.table.columns[self.column][obj.slot])
+
+    def __set__(self, obj, value):
+        obj.table.columns[self.column][obj.slot] = value
@@ -47,10 +47,16 @@ STATIC_CLIENT_CONNECTION = 0x00C79CE0
 OBJECT_MANAGER_OFFSET = 0x2ED0  # Relative to ClientConnection
 FIRST_OBJECT_OFFSET = 0xAC  # Relative to ObjectManager
 LOCAL_GUID_OFFSET = 0xC0  # Relative to ObjectManager
+# GUID -> object hash table inside the ObjectManager (TSHashTable, same bucket layout as the name store:
+# 12-byte buckets, +0 link offset, +8 first node; next node = [node + link offset + 4]) - NEEDS VERIFICATION
+OBJECT_HASH_BUCKETS_OFFSET = 0x1C # Relative to ObjectManager: pointer to the bucket array
+OBJECT_HASH_MASK_OFFSET = 0x24 # Relative to ObjectManager: bucket index mask (bucket count - 1)
 
 # GUIDs (Static addresses might be less reliable than dynamic reads)
 LOCAL_PLAYER_GUID_STATIC = 0xBD07A8 # Consider reading dynamically via ObjectManager + LOCAL_GUID_OFFSET
 LOCAL_TARGET_GUID_STATIC = 0x00BD07B0 # Consider reading dynamically
+FOCUS_GUID = 0x00BD07D0 # Focus target GUID (static) - NEEDS VERIFICATION
+FRAME_TIMESTAMP = 0x00B1D618 # Client time in ms, advanced once per rendered frame (static) - NEEDS VERIFICATION
 
 # Object Properties (Relative to Object Base Address)
 OBJECT_TYPE = 0x14
@@ -97,6 +103,11 @@ NAME_BASE_OFFSET = 0x1C # Offset for the base pointer within the name structure
 # NAME_STRING_OFFSET = 0x20 # Offset for the actual name string within a name entry
 NAME_NODE_NEXT_OFFSET = 0xC # Offset to the 'next' pointer within a name node (Changed from 0xC)
 NAME_NODE_NAME_OFFSET = 0x20 # Offset to the name string itself within a name node (Based on C# ReadString(current + 0x20))
+REALM_NAME = 0x00C79B9E # Current realm name (null-terminated string) - NEEDS VERIFICATION. Keys the persisted name cache.
+
+# Unit (NPC) Names: [[UnitBase + UNIT_NAME_CACHE_OFFSET] + UNIT_NAME_STRING_OFFSET] -> name string
+UNIT_NAME_CACHE_OFFSET = 0x964 # Pointer to the creature cache entry (Based on C# example)
+UNIT_NAME_STRING_OFFSET = 0x5C # Pointer to the name string within the cache entry
 
 # --- Lua Interface ---
 LUA_STATE = 0x00D3F78C # Pointer to the lua_State*
@@ -141,6 +152,16 @@ AURA_STRUCT_SPELL_ID_OFFSET = 0x8
 
 PLAYER_COMBO_POINTS_STATIC = 0x00BD084D
 
+# --- Record Layouts (decoded in one read via MemoryHandler.read_struct) ---
+# Object header: every core field of a list node sits in the first 0x40 bytes of the object.
+OBJECT_HEADER_SIZE = 0x40
+# Unit field block: covers every unit field read per tick, from UNIT_FIELD_TARGET_GUID (0x48) up to
+# UNIT_FIELD_FLAGS at 0xEC. Fields below the start (summoned-by GUID...) are lazy WowObject fields.
+UNIT_FIELD_BLOCK_START = UNIT_FIELD_TARGET_GUID
+UNIT_FIELD_BLOCK_SIZE = 0xF0 - UNIT_FIELD_BLOCK_START
+# Aura entry (AURA_STRUCT_SIZE bytes): CasterGUID, SpellID, Flags, Level, StackCount, Unknown, Duration, EndTime
+AURA_ENTRY_FORMAT = '<QIBBBBII'
+
 # --- Combat Log (Needs RE - Tentative) ---
 COMBAT_LOG_LIST_MANAGER = 0xADB974 # Updated based on AppendCombatLogEntry disassembly (was 0xC704F0)
 # Offsets relative to COMBAT_LOG_LIST_MANAGER value (Based on AppendLinkedListNode analysis 2024-07-19)
@@ -161,9 +182,38 @@ COMBAT_LOG_TIMESTAMP_SOURCE = 0x00CD76AC # (dword_CD76AC)
 # Pointer to the next node to be processed by the game internal systems
 COMBAT_LOG_NEXT_UNPROCESSED_NODE = 0x00CA1394 # (dword_CA1394)
 
-# --- GameObject Specific Offsets (Needs Verification) ---
-# OBJECT_GAMEOBJECT_INFO_PTR = 0x1EC # Removed
-# GAMEOBJECT_INFO_NAME_PTR = 0xB4   # Removed
+# --- GameObject / DynamicObject / Corpse Offsets (3.3.5a descriptor layouts - Needs Verification) ---
+# Descriptor fields are relative to the fields pointer in the object header (OBJECT_UNIT_FIELDS);
+# every type's fields start after the shared object fields (OBJECT_END = 6 dwords).
+GAMEOBJECT_FIELD_CREATED_BY = 0x18   # GUID of the creator (0 for world spawns like ore/herbs)
+GAMEOBJECT_FIELD_DISPLAY_ID = 0x20
+GAMEOBJECT_FIELD_FLAGS = 0x24
+GAMEOBJECT_FIELD_FACTION = 0x3C
+GAMEOBJECT_FIELD_LEVEL = 0x40
+GAMEOBJECT_FIELD_BYTES_1 = 0x44      # State, GO type, art kit, anim progress (byte 0 = state, byte 1 = type)
+GAMEOBJECT_POS_X = 0xE8              # Relative to the object base (not the descriptor)
+GAMEOBJECT_POS_Y = 0xEC
+GAMEOBJECT_POS_Z = 0xF0
+GAMEOBJECT_NAME_PTR1 = 0x1A4         # Base -> +0x1A4 -> +0x90 -> name string
+GAMEOBJECT_NAME_PTR2 = 0x90
+
+DYNAMICOBJECT_FIELD_CASTER = 0x18    # GUID of the caster
+DYNAMICOBJECT_FIELD_BYTES = 0x20
+DYNAMICOBJECT_FIELD_SPELL_ID = 0x24
+DYNAMICOBJECT_FIELD_RADIUS = 0x28    # Float, yards
+DYNAMICOBJECT_FIELD_CAST_TIME = 0x2C
+DYNAMICOBJECT_POS_X = 0xE8           # Relative to the object base << UNTESTED
+DYNAMICOBJECT_POS_Y = 0xEC
+DYNAMICOBJECT_POS_Z = 0xF0
+
+CORPSE_FIELD_OWNER = 0x18            # GUID of the dead player
+CORPSE_FIELD_PARTY = 0x20
+CORPSE_FIELD_DISPLAY_ID = 0x28
+CORPSE_FIELD_FLAGS = 0x84
+CORPSE_FIELD_DYNAMIC_FLAGS = 0x88
+CORPSE_POS_X = 0xE8                  # Relative to the object base << UNTESTED
+CORPSE_POS_Y = 0xEC
+CORPSE_POS_Z = 0xF0
 
 # --- Camera Offsets ---
 CAMERA_BASE_PTR_OFFSET = 0x00C7B5A8
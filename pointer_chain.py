@@ -0,0 +1,123 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+# --- Link Lifetimes ---
+# How long a resolved chain stays cached before its links are read again.
+LIFETIME_TICK = "tick"       # Until MemoryHandler.begin_tick() (mem.tick_id changes)
+LIFETIME_OBJECT = "object"   # Until the owning object is released (PointerResolver.release_object)
+LIFETIME_SESSION = "session" # Until PointerResolver.invalidate() (re-attach / re-init)
+
+# Object-lifetime entries are dropped wholesale past this many owners (objects released without notice)
+OBJECT_CACHE_MAX_OWNERS = 4096
+
+
+class PointerChain:
+    """
+    A fixed pointer chain: start at `base` (static address, an object base, or the result of
+    `parent`), then for each offset read the uint at (current + offset) and follow it.
+
+    E.g. PointerChain("unit_name", [0x964, 0x5C], LIFETIME_OBJECT) resolves
+    [[unit_base + 0x964] + 0x5C] -> address of the unit's name string.
+    """
+
+    def __init__(self, name: str, offsets: Sequence[int], lifetime: str = LIFETIME_TICK,
+                 parent: Optional['PointerChain'] = None, final_is_pointer: bool = True):
+        """
+        Args:
+            parent: Chain whose result is the base of this one. It is resolved (and cached) with its
+                    own lifetime, so a per-tick chain can hang off a per-session prefix.
+            final_is_pointer: False if the last link is a plain value (e.g. a hash mask), so it is only
+                              required to be non-zero instead of a valid pointer.
+        """
+        if lifetime not in (LIFETIME_TICK, LIFETIME_OBJECT, LIFETIME_SESSION):
+            raise ValueError(f"Unknown pointer chain lifetime '{lifetime}'")
+        self.name = name
+        self.offsets = tuple(offsets)
+        self.lifetime = lifetime
+        self.parent = parent
+        self.final_is_pointer = final_is_pointer
+
+    def __repr__(self):
+        path = " -> ".join(f"+{hex(offset)}" for offset in self.offsets)
+        return f"PointerChain({self.name}: {self.parent.name + ' ' if self.parent else ''}{path}, {self.lifetime})"
+
+
+class PointerResolver:
+    """Resolves PointerChains through a MemoryHandler, caching results by lifetime."""
+
+    def __init__(self, mem_handler):
+        self.mem = mem_handler
+        self._tick_cache: Dict[Tuple[str, int], int] = {}
+        self._tick_id = None # mem.tick_id the tick cache belongs to
+        self._object_cache: Dict[int, Dict[Tuple[str, int], int]] = {} # owner -> {(chain, base): value}
+        self._session_cache: Dict[Tuple[str, int], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, chain: PointerChain, base: int = 0, owner: Optional[int] = None) -> int:
+        """
+        Returns the chain's final value, or 0 if any link is unreadable / invalid (not cached).
+        `owner` identifies the object for LIFETIME_OBJECT chains (WowObject.generation).
+        """
+        if chain.lifetime == LIFETIME_TICK:
+            if self._tick_id != self.mem.tick_id:
+                self._tick_cache = {}
+                self._tick_id = self.mem.tick_id
+            cache, key = self._tick_cache, (chain.name, base)
+        elif chain.lifetime == LIFETIME_OBJECT:
+            if owner is None: # No owner identity -> nothing safe to key on, resolve uncached
+                self.misses += 1
+                if chain.parent is not None:
+                    base = self.resolve(chain.parent, base)
+                    if not base: return 0
+                return self._follow(chain, base)
+            cache = self._object_cache.get(owner)
+            if cache is None:
+                if len(self._object_cache) >= OBJECT_CACHE_MAX_OWNERS: self._object_cache = {}
+                cache = self._object_cache[owner] = {}
+            key = (chain.name, base)
+        else:
+            cache, key = self._session_cache, (chain.name, base)
+
+        value = cache.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        if chain.parent is not None:
+            base = self.resolve(chain.parent, base, owner)
+            if not base: return 0
+        value = self._follow(chain, base)
+        if value: cache[key] = value
+        return value
+
+    def _follow(self, chain: PointerChain, address: int) -> int:
+        mem = self.mem
+        last = len(chain.offsets) - 1
+        for i, offset in enumerate(chain.offsets):
+            address = mem.read_uint(address + offset)
+            if i < last or chain.final_is_pointer:
+                if not mem.is_valid_pointer(address): return 0
+            elif not address:
+                return 0
+        return address
+
+    def release_object(self, owner: int):
+        """Drops every LIFETIME_OBJECT entry of `owner` (object left the object list)."""
+        self._object_cache.pop(owner, None)
+
+    def invalidate(self, lifetime: Optional[str] = None):
+        """Drops cached chains of one lifetime, or all of them (e.g. after re-initializing)."""
+        if lifetime in (None, LIFETIME_TICK): self._tick_cache = {}
+        if lifetime in (None, LIFETIME_OBJECT): self._object_cache = {}
+        if lifetime in (None, LIFETIME_SESSION): self._session_cache = {}
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0,
+            'cached': {LIFETIME_TICK: len(self._tick_cache), LIFETIME_OBJECT: len(self._object_cache),
+                       LIFETIME_SESSION: len(self._session_cache)},
+        }
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Dict, List
+
+# Latency histogram buckets are powers of two in microseconds: bucket i holds reads that took
+# [2^(i-1), 2^i) us (bucket 0: < 1us). The last bucket collects everything slower.
+HISTOGRAM_BUCKETS = 24
+UNTAGGED = "untagged"
+
+
+class ReadCounter:
+    """Counters and latency histogram for one read method or caller tag."""
+    __slots__ = ('reads', 'bytes', 'failures', 'total_time', 'max_time', 'histogram')
+
+    def __init__(self):
+        self.reads = 0
+        self.bytes = 0
+        self.failures = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, length: int, ok: bool, elapsed: float):
+        self.reads += 1
+        if ok: self.bytes += length
+        else: self.failures += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time: self.max_time = elapsed
+        self.histogram[min(int(elapsed * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate latency (seconds) below which `fraction` of reads fall (bucket upper bound)."""
+        if not self.reads: return 0.0
+        threshold = fraction * self.reads
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                return (1 << bucket) / 1e6
+        return self.max_time
+
+    def as_dict(self) -> dict:
+        return {
+            'reads': self.reads,
+            'bytes': self.bytes,
+            'failures': self.failures,
+            'total_ms': self.total_time * 1000,
+            'avg_us': (self.total_time / self.reads * 1e6) if self.reads else 0.0,
+            'p50_us': self.percentile(0.5) * 1e6,
+            'p99_us': self.percentile(0.99) * 1e6,
+            'max_us': self.max_time * 1e6,
+            'histogram': list(self.histogram),
+        }
+
+
+class ReadStats:
+    """
+    Per read method and per caller tag read statistics for a MemoryHandler.
+    Only exists while instrumentation is enabled (MemoryHandler.enable_read_stats).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock() # GUI update loop and rotation thread both read memory
+        self.by_method: Dict[str, ReadCounter] = {}
+        self.by_tag: Dict[str, ReadCounter] = {}
+        self.started = time.time()
+
+    def record(self, method: str, tag: str, length: int, ok: bool, elapsed: float):
+        with self._lock:
+            counter = self.by_method.get(method)
+            if counter is None: counter = self.by_method[method] = ReadCounter()
+            counter.add(length, ok, elapsed)
+            counter = self.by_tag.get(tag)
+            if counter is None: counter = self.by_tag[tag] = ReadCounter()
+            counter.add(length, ok, elapsed)
+
+    def reset(self):
+        with self._lock:
+            self.by_method = {}
+            self.by_tag = {}
+            self.started = time.time()
+
+    def snapshot(self) -> dict:
+        """Returns a plain-dict copy of all counters (safe to keep while reads continue)."""
+        with self._lock:
+            return {
+                'window_s': time.time() - self.started,
+                'methods': {name: counter.as_dict() for name, counter in self.by_method.items()},
+                'tags': {name: counter.as_dict() for name, counter in self.by_tag.items()},
+            }
+
+    def format_summary(self, snapshot: dict = None) -> List[str]:
+        """Formats a snapshot as log lines, busiest tags/methods (by total read time) first."""
+        snapshot = snapshot or self.snapshot()
+        lines = [f"Memory reads over {snapshot['window_s']:.1f}s:"]
+        for section in ('tags', 'methods'):
+            rows = sorted(snapshot[section].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+            for name, row in rows:
+                lines.append(f"  {section[:-1]:<6} {name:<14} {row['reads']:7d} reads {row['bytes'] / 1024:9.1f} KiB "
+                             f"{row['failures']:5d} fail {row['total_ms']:8.1f} ms "
+                             f"(avg {row['avg_us']:.1f}us p50 {row['p50_us']:.0f}us p99 {row['p99_us']:.0f}us max {row['max_us']:.0f}us)")
+        return lines
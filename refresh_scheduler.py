@@ -0,0 +1,103 @@
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# --- Refresh Scheduler Settings ---
+TIER_CRITICAL = 0 # Local player, target, focus
+TIER_NEAR = 1     # Units within REFRESH_NEAR_DISTANCE of the player
+TIER_FAR = 2      # Everything else
+TIER_NAMES = {TIER_CRITICAL: "critical", TIER_NEAR: "near", TIER_FAR: "far"}
+
+REFRESH_TIER_INTERVALS = { # Seconds between dynamic updates per tier (0 = every tick)
+    TIER_CRITICAL: 0.0,
+    TIER_NEAR: 0.1,
+    TIER_FAR: 1.0,
+}
+REFRESH_NEAR_DISTANCE = 40.0 # Yards: max spell range, anything closer can matter to the rotation
+REFRESH_TICK_BUDGET = 0.005  # Seconds per tick for the batch update of due (non-critical) objects
+REFRESH_COST_SMOOTHING = 0.2 # Weight of the newest tick in the per-object cost estimate
+
+
+class RefreshScheduler:
+    """
+    Decides which cached objects ObjectManager.refresh() updates this tick.
+
+    Every object gets a tier (critical / near / far, by role and distance to the player) and a
+    next-due time (the `next_due` column of the ObjectTable). A tick only updates due objects,
+    closest tier and most overdue first, and stops at as many as fit the time budget (from the
+    measured cost per object); the rest stay due for the next tick. Critical objects are always
+    updated.
+    """
+
+    def __init__(self, table, budget: float = REFRESH_TICK_BUDGET, intervals: Optional[Dict[int, float]] = None,
+                 near_distance: float = REFRESH_NEAR_DISTANCE):
+        self.table = table
+        self.budget = budget
+        self.intervals = dict(REFRESH_TIER_INTERVALS if intervals is None else intervals)
+        self.near_distance = near_distance
+        self.cost_per_object: Optional[float] = None # Seconds, smoothed; None until the first batch
+        self.deferred = 0 # Due objects left for the next tick by the last select() (budget)
+
+    def assign_tiers(self, slots: np.ndarray, origin: Optional[Sequence[float]], critical: np.ndarray) -> np.ndarray:
+        """Tier per slot: critical where `critical`, else near/far by distance to origin (far without one)."""
+        tiers = np.full(len(slots), TIER_FAR, dtype=np.int8)
+        if origin is not None and len(slots):
+            distances = self.table.distances_from(origin[0], origin[1], origin[2], slots)
+            tiers[distances <= self.near_distance] = TIER_NEAR # NaN positions stay far
+        tiers[critical] = TIER_CRITICAL
+        self.table.columns['refresh_tier'][slots] = tiers
+        return tiers
+
+    def select(self, objects: Sequence, origin: Optional[Sequence[float]], critical_guids: Iterable[int] = (),
+               now: Optional[float] = None) -> List:
+        """
+        The objects to update this tick: every critical one, then due objects by tier (most
+        overdue first within a tier) as far as the budget goes. `origin` is the player position (x, y, z) used for tiering.
+        """
+        if not objects: return []
+        now = time.time() if now is None else now
+        columns = self.table.columns
+        slots = np.fromiter((obj.slot for obj in objects), dtype=np.intp, count=len(objects))
+        critical = np.isin(columns['guid'][slots], np.fromiter(critical_guids, dtype=np.uint64))
+        tiers = self.assign_tiers(slots, origin, critical)
+
+        overdue = now - columns['next_due'][slots]
+        due = np.flatnonzero(critical | (overdue >= 0))
+        due = due[np.lexsort((-overdue[due], tiers[due]))] # Closest tier first, most overdue first within a tier
+        limit = len(due)
+        if self.cost_per_object:
+            limit = max(int(np.count_nonzero(critical)), 1, int(self.budget / self.cost_per_object))
+        self.deferred = max(0, len(due) - limit)
+        return [objects[i] for i in due[:limit].tolist()]
+
+    def completed(self, objects: Sequence, elapsed: Optional[float] = None, now: Optional[float] = None):
+        """Records a finished update of `objects` (taking `elapsed` seconds) and schedules their next one."""
+        if not objects: return
+        now = time.time() if now is None else now
+        columns = self.table.columns
+        slots = np.fromiter((obj.slot for obj in objects), dtype=np.intp, count=len(objects))
+        intervals = np.array([self.intervals.get(tier, 0.0) for tier in range(max(TIER_NAMES) + 1)])
+        columns['next_due'][slots] = now + intervals[columns['refresh_tier'][slots]]
+        if elapsed is not None:
+            cost = elapsed / len(objects)
+            self.cost_per_object = cost if self.cost_per_object is None else \
+                self.cost_per_object + REFRESH_COST_SMOOTHING * (cost - self.cost_per_object)
+
+    def staleness(self, objects: Sequence, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Per tier (as of the last tiering): object count and the mean / max seconds since each
+        object's last update. `deferred` holds how many due objects the last tick left over.
+        """
+        now = time.time() if now is None else now
+        report = {name: {'count': 0, 'mean_age': 0.0, 'max_age': 0.0} for name in TIER_NAMES.values()}
+        if not objects: return report
+        columns = self.table.columns
+        slots = np.fromiter((obj.slot for obj in objects), dtype=np.intp, count=len(objects))
+        tiers = columns['refresh_tier'][slots]
+        ages = now - columns['updated_at'][slots]
+        for tier, name in TIER_NAMES.items():
+            tier_ages = ages[tiers == tier]
+            if len(tier_ages):
+                report[name] = {'count': len(tier_ages), 'mean_age': float(tier_ages.mean()), 'max_age': float(tier_ages.max())}
+        return report
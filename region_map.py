@@ -0,0 +1,63 @@
+import bisect
+import time
+from typing import Iterable, List, Tuple
+
+
+class RegionMap:
+    """
+    Sorted map of readable (start, size) regions of the target address space.
+    Lets MemoryHandler reject reads of unmapped addresses (stale object pointers, garbage
+    next pointers) with a bisect instead of a failed read + exception.
+
+    The region bounds are published as one (starts, ends) tuple: update() swaps it with a single
+    assignment and readers take it once, so lookups from other threads (sharded reads) never see
+    a new starts list with old ends.
+    """
+
+    def __init__(self, regions: Iterable[Tuple[int, int]] = ()):
+        self._bounds: Tuple[List[int], List[int]] = ([], [])
+        self.refreshed_at: float = 0.0
+        self.update(regions)
+
+    @property
+    def starts(self) -> List[int]:
+        return self._bounds[0]
+
+    @property
+    def ends(self) -> List[int]:
+        return self._bounds[1]
+
+    def update(self, regions: Iterable[Tuple[int, int]]):
+        """Replaces the map. Adjacent/overlapping regions are merged so reads may span them."""
+        starts, ends = [], []
+        for start, size in sorted(regions):
+            if size <= 0: continue
+            end = start + size
+            if ends and start <= ends[-1]:
+                if end > ends[-1]: ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._bounds = (starts, ends) # Atomic swap
+        self.refreshed_at = time.time()
+
+    def contains(self, address: int, length: int = 1) -> bool:
+        """True if [address, address + length) lies inside one readable region."""
+        starts, ends = self._bounds
+        i = bisect.bisect_right(starts, address) - 1
+        return i >= 0 and address + length <= ends[i]
+
+    def region_of(self, address: int) -> Tuple[int, int]:
+        """Returns the (start, end) of the region containing `address`, or (0, 0)."""
+        starts, ends = self._bounds
+        i = bisect.bisect_right(starts, address) - 1
+        if i >= 0 and address < ends[i]:
+            return starts[i], ends[i]
+        return 0, 0
+
+    @property
+    def total_size(self) -> int:
+        return sum(end - start for start, end in zip(*self._bounds))
+
+    def __len__(self) -> int:
+        return len(self.starts)
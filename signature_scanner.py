@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import re
+import struct
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import offsets
+
+# --- Signature Scanner Settings ---
+OFFSET_CACHE_FILE = "offset_cache.json" # Resolved offsets per client executable
+PE_HEADER_SIZE = 0x1000 # Read to locate SizeOfImage and the section table
+IMAGE_READ_CHUNK = 0x10000 # Module image is read in chunks so one unreadable page doesn't fail the scan
+EXECUTABLE_HASH_CHUNK = 0x100000 # Bytes per read while hashing the executable file
+IMAGE_SCN_MEM_WRITE = 0x80000000 # Section characteristics: writable (changes at runtime, not hashed)
+
+# How a match is turned into a value
+KIND_ABSOLUTE = "absolute" # uint32 operand at match + offset (e.g. mov ecx, [0xC79CE0])
+KIND_RELATIVE = "relative" # rel32 operand at match + offset (call/jmp target = operand end + rel32)
+KIND_MATCH = "match"       # match address + offset itself (e.g. a function start)
+
+
+class Signature:
+    """
+    A byte pattern with wildcards that locates one offset in the client.
+
+    Pattern syntax: hex bytes separated by spaces, '?' or '??' for any byte,
+    e.g. "8B 0D ?? ?? ?? ?? 8B 81 ?? ?? ?? ?? 85 C0".
+    """
+
+    def __init__(self, name: str, pattern: str, offset: int = 0, kind: str = KIND_ABSOLUTE, adjust: int = 0):
+        """
+        Args:
+            name: Attribute in offsets.py that receives the resolved value.
+            offset: Where the operand (or the wanted address for KIND_MATCH) sits relative to the match.
+            adjust: Added to the final value (e.g. the '+ 0x8' in NAME_STORE_BASE).
+        """
+        if kind not in (KIND_ABSOLUTE, KIND_RELATIVE, KIND_MATCH):
+            raise ValueError(f"Unknown signature kind '{kind}' for {name}")
+        self.name = name
+        self.pattern = pattern
+        self.offset = offset
+        self.kind = kind
+        self.adjust = adjust
+        self.length, self.segments = parse_pattern(pattern)
+        if not self.segments:
+            raise ValueError(f"Signature {name} has no fixed bytes")
+        # Whole pattern as one bytes regex, from the first fixed byte: the search and every wildcard
+        # check run inside the regex engine (a literal prefix is found with a fast substring search)
+        self.lead = self.segments[0][0] # Leading wildcards, added back to each match
+        parts = []
+        position = self.lead
+        for start, run in self.segments:
+            parts.append(b'.' * (start - position) + re.escape(run))
+            position = start + len(run)
+        parts.append(b'.' * (self.length - position)) # Trailing wildcards still have to fit in the image
+        self.regex = re.compile(b''.join(parts), re.DOTALL)
+
+    def __repr__(self):
+        return f"Signature({self.name}, '{self.pattern}', +{hex(self.offset)}, {self.kind})"
+
+
+def parse_pattern(pattern: str) -> Tuple[int, List[Tuple[int, bytes]]]:
+    """Splits a pattern into its length and the (position, bytes) runs of fixed bytes."""
+    segments = []
+    current = bytearray()
+    start = 0
+    tokens = pattern.split()
+    for position, token in enumerate(tokens):
+        if token in ('?', '??'):
+            if current: segments.append((start, bytes(current)))
+            current = bytearray()
+            continue
+        if not current: start = position
+        current.append(int(token, 16))
+    if current: segments.append((start, bytes(current)))
+    return len(tokens), segments
+
+
+def find_pattern(image: bytes, signature: Signature, first_only: bool = False) -> List[int]:
+    """Returns every offset in `image` where `signature` matches (the first one if first_only)."""
+    lead = signature.lead
+    if first_only:
+        match = signature.regex.search(image, lead)
+        return [match.start() - lead] if match else []
+    return [match.start() - lead for match in signature.regex.finditer(image, lead)]
+
+
+# --- Signature Registry ---
+# Signatures for the offsets in offsets.py that should follow client updates. resolve() only accepts
+# a pattern that matches exactly once, so a build where the code differs keeps the offsets.py value
+# (logged). Modules deriving values from offsets at import re-derive them through on_offsets_changed.
+#
+# Active player GUID getter, [[ClientConnection] + ObjectManager] + LocalGUID:
+#   mov ecx, [STATIC_CLIENT_CONNECTION] / mov ecx, [ecx + OBJECT_MANAGER_OFFSET] / test ecx, ecx / jz
+#   mov eax, [ecx + LOCAL_GUID_OFFSET] / mov edx, [ecx + LOCAL_GUID_OFFSET + 4]
+ACTIVE_PLAYER_GUID_PATTERN = "8B 0D ?? ?? ?? ?? 8B 89 ?? ?? ?? ?? 85 C9 74 ?? 8B 81 ?? ?? ?? ?? 8B 91 ?? ?? ?? ??"
+SIGNATURES: List[Signature] = [
+    Signature("STATIC_CLIENT_CONNECTION", ACTIVE_PLAYER_GUID_PATTERN, offset=2),
+    Signature("OBJECT_MANAGER_OFFSET", ACTIVE_PLAYER_GUID_PATTERN, offset=8),
+    Signature("LOCAL_GUID_OFFSET", ACTIVE_PLAYER_GUID_PATTERN, offset=18),
+]
+
+
+class SignatureScanner:
+    """Scans the client module image for SIGNATURES and applies the results to offsets.py."""
+
+    def __init__(self, mem_handler, cache_file: str = OFFSET_CACHE_FILE):
+        self.mem = mem_handler
+        self.cache_file = cache_file
+        self.module_base: int = mem_handler.base_address or 0
+        self.last_scan_time: float = 0.0
+
+    def executable_key(self) -> Optional[str]:
+        """
+        Fingerprint of the running executable: SHA-1 of the whole executable file when the backend
+        knows its path, else of every read-only section of the mapped module (code and constants -
+        writable sections change at runtime). None if neither can be read.
+        """
+        path = getattr(self.mem.backend, 'executable_path', None)
+        if path:
+            try:
+                digest = hashlib.sha1()
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(EXECUTABLE_HASH_CHUNK), b''): digest.update(chunk)
+                return digest.hexdigest()
+            except OSError as e:
+                print(f"Could not hash {path} ({e}), hashing the mapped module instead.")
+        header = self._pe_header()
+        if header is None: return None
+        digest = hashlib.sha1(header[:self._headers_size(header)])
+        for start, size in self._sections(header, writable=False):
+            digest.update(self._read_range(start, size))
+        return "image:" + digest.hexdigest()
+
+    def _pe_header(self) -> Optional[bytes]:
+        """The module's first PE_HEADER_SIZE bytes if they hold a valid PE header."""
+        header = self.mem.read_bytes(self.module_base, PE_HEADER_SIZE)
+        if len(header) < 0x40 or header[:2] != b'MZ': return None
+        pe_offset = struct.unpack_from('<I', header, 0x3C)[0]
+        if pe_offset + 0x54 > len(header) or header[pe_offset:pe_offset + 4] != b'PE\0\0': return None
+        return header
+
+    @staticmethod
+    def _headers_size(header: bytes) -> int:
+        pe_offset = struct.unpack_from('<I', header, 0x3C)[0]
+        return min(len(header), struct.unpack_from('<I', header, pe_offset + 0x54)[0]) # OptionalHeader.SizeOfHeaders
+
+    @staticmethod
+    def _sections(header: bytes, writable: bool) -> List[Tuple[int, int]]:
+        """(RVA, virtual size) of the sections from the section table, writable ones only if `writable`."""
+        pe_offset = struct.unpack_from('<I', header, 0x3C)[0]
+        count, optional_size = struct.unpack_from('<H12xH', header, pe_offset + 6)
+        table = pe_offset + 24 + optional_size
+        sections = []
+        for entry in range(table, min(len(header) - 39, table + count * 40), 40):
+            size, rva = struct.unpack_from('<II', header, entry + 8)
+            characteristics = struct.unpack_from('<I', header, entry + 36)[0]
+            if writable or not characteristics & IMAGE_SCN_MEM_WRITE: sections.append((rva, size))
+        return sections
+
+    def _read_range(self, start: int, size: int) -> bytes:
+        """Module bytes [start, start + size) as RVAs, in chunks. Unreadable chunks come back as zeros."""
+        data = bytearray(size)
+        for chunk_start in range(0, size, IMAGE_READ_CHUNK):
+            length = min(IMAGE_READ_CHUNK, size - chunk_start)
+            chunk = self.mem.read_bytes(self.module_base + start + chunk_start, length)
+            if len(chunk) == length: data[chunk_start:chunk_start + length] = chunk
+        return bytes(data)
+
+    def read_module_image(self) -> bytes:
+        """Reads the whole module image (SizeOfImage bytes). Unreadable chunks come back as zeros."""
+        header = self._pe_header()
+        if header is None: return b''
+        pe_offset = struct.unpack_from('<I', header, 0x3C)[0]
+        return self._read_range(0, struct.unpack_from('<I', header, pe_offset + 0x50)[0]) # OptionalHeader.SizeOfImage
+
+    def resolve(self, signature: Signature, image: bytes, matches: Optional[List[int]] = None) -> Optional[int]:
+        """Resolves one signature against the image (`matches`: its find_pattern result if known). None if not found or ambiguous."""
+        if matches is None: matches = find_pattern(image, signature)
+        if len(matches) != 1:
+            print(f"Signature {signature.name}: {len(matches)} matches, expected 1. Keeping offsets.py value.")
+            return None
+        at = matches[0] + signature.offset
+        if signature.kind == KIND_ABSOLUTE:
+            value = struct.unpack_from('<I', image, at)[0]
+        elif signature.kind == KIND_RELATIVE:
+            value = self.module_base + at + 4 + struct.unpack_from('<i', image, at)[0]
+        else:
+            value = self.module_base + at
+        return value + signature.adjust
+
+    def scan(self, signatures: Sequence[Signature]) -> Dict[str, int]:
+        """Cold scan: reads the module image and resolves every signature."""
+        start = time.perf_counter()
+        image = self.read_module_image()
+        results = {}
+        if image:
+            found: Dict[str, List[int]] = {} # pattern -> matches: signatures sharing a pattern search once
+            for signature in signatures:
+                matches = found.get(signature.pattern)
+                if matches is None: matches = found[signature.pattern] = find_pattern(image, signature)
+                value = self.resolve(signature, image, matches)
+                if value is not None: results[signature.name] = value
+        self.last_scan_time = time.perf_counter() - start
+        print(f"Signature scan: resolved {len(results)}/{len(signatures)} in {self.last_scan_time * 1000:.1f} ms ({len(image) / 1048576:.1f} MiB image)")
+        return results
+
+    def _load_cache(self) -> dict:
+        if not os.path.exists(self.cache_file): return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading offset cache {self.cache_file}: {e}")
+            return {}
+
+    def _save_cache(self, cache: dict):
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(cache, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print(f"Error writing offset cache {self.cache_file}: {e}")
+
+    def resolve_offsets(self, signatures: Sequence[Signature] = None, apply: bool = True) -> Dict[str, int]:
+        """
+        Returns resolved offsets for the running executable, from the on-disk cache when this executable
+        (and every requested signature) was scanned before, otherwise from a fresh scan that is then cached.
+        With apply=True the values are written into the offsets module.
+        """
+        signatures = SIGNATURES if signatures is None else signatures
+        if not signatures: return {}
+        key = self.executable_key()
+        if key is None:
+            print("Signature scan skipped: could not read the executable or its module PE header.")
+            return {}
+
+        cache = self._load_cache()
+        entry = cache.get(key, {})
+        fingerprint = {signature.name: signature.pattern for signature in signatures}
+        if entry.get('patterns') == fingerprint:
+            results = {name: value for name, value in entry.get('offsets', {}).items()}
+        else:
+            results = self.scan(signatures)
+            cache[key] = {'patterns': fingerprint, 'offsets': results, 'scanned': time.strftime("%Y-%m-%d %H:%M:%S")}
+            self._save_cache(cache)
+
+        if apply: apply_offsets(results)
+        return results
+
+
+# Callbacks run after apply_offsets() changed something, for modules that derive values from offsets at import
+_OFFSET_LISTENERS: List[Callable[[], None]] = []
+
+def on_offsets_changed(callback: Callable[[], None]):
+    """Registers `callback` to rebuild offset-derived module state (e.g. pointer chains) after a scan."""
+    _OFFSET_LISTENERS.append(callback)
+
+def apply_offsets(results: Dict[str, int]):
+    """Writes resolved values into offsets.py's namespace, logging every value that differs from the hardcoded one."""
+    changed = False
+    for name, value in results.items():
+        current = getattr(offsets, name, None)
+        if current != value:
+            print(f"Offset {name}: {hex(current) if isinstance(current, int) else current} -> {hex(value)} (signature)")
+            changed = True
+        setattr(offsets, name, value)
+    if changed:
+        for callback in _OFFSET_LISTENERS: callback()
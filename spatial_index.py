@@ -0,0 +1,119 @@
+import math
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# --- Spatial Index Settings ---
+SPATIAL_CELL_SIZE = 10.0 # Yards per grid cell (most queries are 5-40 yd: melee, AoE, cast range)
+
+# Filter: slots -> bool mask of the same length (e.g. ObjectManager.enemy_filter)
+SlotFilter = Callable[[np.ndarray], np.ndarray]
+
+
+class SpatialIndex:
+    """
+    Uniform 2D grid (x/y; z is only used for exact distances) over the position columns of an
+    ObjectTable, rebuilt from scratch each tick - a sort of a few hundred slots is cheaper than
+    maintaining a tree incrementally. Queries gather the cells overlapping the search area and
+    finish with an exact 3D distance test as one array expression.
+    """
+
+    def __init__(self, cell_size: float = SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.slots = np.empty(0, dtype=np.intp) # Indexed slots, sorted by cell
+        self.x = self.y = self.z = np.empty(0, dtype=np.float32) # Their positions (same order)
+        self.cells: Dict[Tuple[int, int], Tuple[int, int]] = {} # (cell x, cell y) -> [start, end) in slots
+        self.built_tick = None # MemoryHandler.tick_id of the positions indexed
+
+    def rebuild(self, table, slots: Optional[np.ndarray] = None, tick=None):
+        """Indexes `slots` (default: every active slot) of an ObjectTable at their current positions."""
+        columns = table.columns
+        slots = table.active_slots() if slots is None else np.asarray(slots, dtype=np.intp)
+        x, y, z = columns['x'][slots], columns['y'][slots], columns['z'][slots]
+        finite = np.isfinite(x) & np.isfinite(y) & np.isfinite(z) # Garbage positions are never "near"
+        slots, x, y, z = slots[finite], x[finite], y[finite], z[finite]
+
+        cell_x = np.floor(x / self.cell_size).astype(np.int64)
+        cell_y = np.floor(y / self.cell_size).astype(np.int64)
+        order = np.lexsort((cell_y, cell_x))
+        self.slots, self.x, self.y, self.z = slots[order], x[order], y[order], z[order]
+        cell_x, cell_y = cell_x[order], cell_y[order]
+
+        cells = {}
+        if len(order):
+            # Boundaries where the (cell x, cell y) pair changes -> one [start, end) run per cell
+            change = np.flatnonzero((cell_x[1:] != cell_x[:-1]) | (cell_y[1:] != cell_y[:-1])) + 1
+            starts = np.concatenate(([0], change))
+            ends = np.concatenate((change, [len(order)]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                cells[(int(cell_x[start]), int(cell_y[start]))] = (start, end)
+        self.cells = cells
+        self.built_tick = tick
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _candidates(self, x: float, y: float, radius: float) -> Tuple[np.ndarray, bool]:
+        """
+        Positions (indices into self.slots) in every cell overlapping the square around (x, y),
+        and whether that is simply every indexed slot.
+        """
+        cells = self.cells
+        size = self.cell_size
+        if math.isfinite(radius):
+            low_x, high_x = math.floor((x - radius) / size), math.floor((x + radius) / size)
+            low_y, high_y = math.floor((y - radius) / size), math.floor((y + radius) / size)
+        if not math.isfinite(radius) or (high_x - low_x + 1) * (high_y - low_y + 1) > len(cells):
+            return np.arange(len(self.slots)), True # Area covers more cells than exist -> scan everything
+        runs = [cells[key] for key in ((cx, cy) for cx in range(low_x, high_x + 1) for cy in range(low_y, high_y + 1)) if key in cells]
+        if not runs: return np.empty(0, dtype=np.intp), False
+        return np.concatenate([np.arange(start, end) for start, end in runs]), False
+
+    def _query(self, pos: Sequence[float], radius: float, filter: Optional[SlotFilter]) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """(indices into self.slots, their distances, scanned everything) for slots within `radius` passing `filter`."""
+        index, scanned_all = self._candidates(pos[0], pos[1], radius)
+        dx = self.x[index] - np.float32(pos[0])
+        dy = self.y[index] - np.float32(pos[1])
+        dz = self.z[index] - np.float32(pos[2])
+        distances = np.sqrt(dx * dx + dy * dy + dz * dz)
+        keep = distances <= radius
+        index, distances = index[keep], distances[keep]
+        if filter is not None and len(index):
+            keep = filter(self.slots[index])
+            index, distances = index[keep], distances[keep]
+        return index, distances, scanned_all
+
+    def within_radius(self, pos: Sequence[float], radius: float, filter: Optional[SlotFilter] = None) -> np.ndarray:
+        """Slots within `radius` (3D) of pos = (x, y, z) passing `filter`, nearest first."""
+        index, distances, _ = self._query(pos, radius, filter)
+        return self.slots[index[np.argsort(distances, kind='stable')]]
+
+    def k_nearest(self, pos: Sequence[float], k: int, filter: Optional[SlotFilter] = None,
+                  max_distance: float = math.inf) -> np.ndarray:
+        """Up to `k` slots nearest to pos (passing `filter`, within `max_distance`), nearest first."""
+        if k <= 0 or not len(self.slots): return np.empty(0, dtype=np.intp)
+        # Grow the search radius until it holds k matches: everything within the radius was
+        # considered, so the k nearest of those are the k nearest overall
+        radius = self.cell_size
+        while True:
+            search = min(radius, max_distance)
+            index, distances, scanned_all = self._query(pos, search, filter)
+            if len(index) >= k or search >= max_distance: break
+            if scanned_all: # Every indexed slot was a candidate -> just drop the radius limit
+                index, distances, _ = self._query(pos, max_distance, filter)
+                break
+            radius *= 2
+        nearest = np.argsort(distances, kind='stable')[:k]
+        return self.slots[index[nearest]]
+
+    def count_in_cone(self, pos: Sequence[float], facing: float, angle: float, radius: float,
+                      filter: Optional[SlotFilter] = None) -> int:
+        """
+        Number of slots within `radius` of pos inside the horizontal cone of total width `angle`
+        (radians) centred on `facing` (radians, as OBJECT_ROTATION: 0 = +x, counter-clockwise).
+        """
+        index, _, _ = self._query(pos, radius, filter)
+        if not len(index): return 0
+        bearing = np.arctan2(self.y[index] - np.float32(pos[1]), self.x[index] - np.float32(pos[0]))
+        delta = np.abs((bearing - facing + np.pi) % (2 * np.pi) - np.pi) # Wrapped to [0, pi]
+        return int(np.count_nonzero(delta <= angle / 2))
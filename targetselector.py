@@ -1,33 +1,44 @@
-from object_manager import ObjectManager
-from wow_object import WowObject
+from world_snapshot import WorldStateProducer, WorldSnapshot, UnitSnapshot
 from typing import Optional
 
 class TargetSelector:
     """Manages target selection logic."""
 
-    def __init__(self, om: ObjectManager):
+    def __init__(self, snapshots: Optional[WorldStateProducer] = None):
         """Initializes the TargetSelector.
 
         Args:
-            om: The ObjectManager instance.
+            snapshots: The WorldStateProducer whose latest snapshot is queried. World state is
+                       never read from memory on the caller's thread (see world_snapshot.py).
         """
-        self.om = om
+        self.snapshots = snapshots
 
-    def get_selected_target(self) -> Optional[WowObject]:
+    def _snapshot(self) -> Optional[WorldSnapshot]:
+        return self.snapshots.latest if self.snapshots else None
+
+    def get_selected_target(self) -> Optional[UnitSnapshot]:
         """Returns the currently selected target based on some logic.
 
-        Currently, just returns the ObjectManager's current target.
+        Currently, just returns the latest snapshot's target.
         Future logic could include focus target, mouseover, nearest enemy, etc.
 
         Returns:
-            The selected WowObject target, or None if no valid target.
+            The selected target's UnitSnapshot, or None if no valid target.
+        """
+        # Basic implementation: the snapshot's target (None once it despawned)
+        snapshot = self._snapshot()
+        return snapshot.target if snapshot is not None else None
+
+    def find_nearest_enemy(self, max_distance: float = 40.0) -> Optional[UnitSnapshot]:
+        """
+        Nearest attackable unit within `max_distance` of the player, from the latest snapshot's
+        spatial index (only the grid cells around the player are looked at).
         """
-        # Basic implementation: Return current target from ObjectManager
-        if self.om and self.om.target and self.om.target.is_valid():
-            return self.om.target
-        return None
+        snapshot = self._snapshot()
+        if snapshot is None or snapshot.player is None: return None
+        nearest = snapshot.k_nearest(1, enemies_only=True, max_distance=max_distance)
+        return nearest[0] if nearest else None
 
     # Add other methods as needed, e.g.:
     # def set_focus_target(self, guid):
     # def get_focus_target(self):
-    # def find_nearest_enemy(self):
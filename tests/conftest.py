@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import synthetic_world
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+
+
+@pytest.fixture
+def world_image(tmp_path):
+    """Builds a synthetic world image: world_image(count, extra, frame) -> image path (see benchmarks/synthetic_world.py)."""
+    def build(count: int = 50, extra: int = 0, frame: int = 0) -> str:
+        path = str(tmp_path / f"world_{count}_{extra}_{frame}")
+        synthetic_world.build_world(path, count, extra, frame)
+        return path
+    return build
+
+
+@pytest.fixture
+def image_mem(world_image):
+    """MemoryHandler over a 50-unit synthetic world image."""
+    return MemoryHandler(backend=MemoryImageBackend(world_image()))
@@ -0,0 +1,52 @@
+import offsets
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from object_manager import FRAME_EPOCH_MAX_SKIP_SECONDS, ObjectManager
+
+
+def _manager(world_image, frame=1234):
+    return ObjectManager(MemoryHandler(backend=MemoryImageBackend(world_image(20, frame=frame))))
+
+
+def test_same_frame_refresh_keeps_the_tick(world_image):
+    om = _manager(world_image)
+    assert om.refresh()
+    om.mem.write_uint(offsets.FRAME_TIMESTAMP, 1235) # Next frame: the epoch is seen to advance
+    assert om.refresh()
+    om.scan_objects()
+    mem = om.mem
+    tick, cached_pages = mem.tick_id, mem.cache_stats()['cached_pages']
+    index = om.spatial_index()
+
+    assert not om.refresh() # Same frame: skipped before begin_tick()
+    assert mem.tick_id == tick and mem.cache_stats()['cached_pages'] == cached_pages
+    assert om.spatial_index() is index # Not rebuilt
+    stats = om.epoch_dedup_stats()
+    assert (stats['requests'], stats['refreshes'], stats['skipped']) == (3, 2, 1)
+
+
+def test_constant_epoch_never_skips(world_image):
+    # An epoch that has never changed may not be a frame counter at all (unverified offset)
+    om = _manager(world_image)
+    assert om.refresh() and om.refresh() and om.refresh()
+    assert om.epoch_dedup_stats()['skipped'] == 0
+
+
+def test_stuck_epoch_forces_a_refresh(world_image, capsys):
+    om = _manager(world_image)
+    om.refresh()
+    om.mem.write_uint(offsets.FRAME_TIMESTAMP, 1235)
+    om.refresh()
+    assert not om.refresh()
+
+    om.last_refresh_time -= FRAME_EPOCH_MAX_SKIP_SECONDS # Epoch unchanged for longer than a skip may last
+    assert om.refresh()
+    om.last_refresh_time -= FRAME_EPOCH_MAX_SKIP_SECONDS
+    assert om.refresh()
+    assert capsys.readouterr().out.count("frame epoch stuck") == 1
+
+
+def test_unreadable_epoch_never_skips(world_image):
+    om = _manager(world_image, frame=0)
+    assert om.refresh() and om.refresh()
+    assert om.epoch_dedup_stats()['skipped'] == 0
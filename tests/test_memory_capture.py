@@ -0,0 +1,48 @@
+import pytest
+
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend, MemoryReadError
+from memory_capture import ReplayBackend
+from object_manager import ObjectManager
+
+
+def _unit_rows(om):
+    return sorted((obj.guid, obj.x_pos, obj.y_pos, obj.health, obj.max_health, obj.level) for obj in om.object_cache.values())
+
+
+def test_replay_reproduces_the_recorded_session(world_image, tmp_path):
+    capture = str(tmp_path / "session.cap")
+    mem = MemoryHandler(backend=MemoryImageBackend(world_image(20)))
+    assert mem.start_recording(capture) # Before the ObjectManager, so its initialization is recorded too
+    live = ObjectManager(mem)
+    for _ in range(3):
+        live.refresh()
+        live.scan_objects()
+    live.mem.stop_recording()
+    assert live.mem.backend.name != "recording"
+
+    replay = ReplayBackend(capture)
+    assert replay.tick_count >= 3
+    replayed = ObjectManager(MemoryHandler(backend=replay))
+    for _ in range(3):
+        replayed.refresh()
+        replayed.scan_objects()
+
+    assert len(replayed.object_cache) == 20
+    assert _unit_rows(replayed) == _unit_rows(live)
+    assert replayed.local_player.guid == 0x100 and replayed.target.guid == 0x101
+
+
+def test_replay_serves_sub_ranges_and_rejects_unrecorded_reads(world_image, tmp_path):
+    capture = str(tmp_path / "reads.cap")
+    mem = MemoryHandler(backend=MemoryImageBackend(world_image(5)))
+    mem.start_recording(capture)
+    mem.begin_tick()
+    data = mem.read_bytes(0x03000000, 0x40)
+    mem.stop_recording()
+
+    replay = ReplayBackend(capture)
+    replay.begin_tick() # The read was made in the second tick
+    assert replay.read(0x03000000 + 8, 8) == data[8:16] # Inside a recorded page
+    with pytest.raises(MemoryReadError):
+        replay.read(0x7000000, 4)
@@ -0,0 +1,35 @@
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from name_cache import NameCache
+from object_manager import ObjectManager
+
+
+def test_unreadable_realm_falls_back_to_the_executable(world_image, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path) # name_cache.json goes here
+    path = world_image(5) # The synthetic world has no realm name mapped
+    om = ObjectManager(MemoryHandler(backend=MemoryImageBackend(path)))
+    assert om.names.realm == "exe:wow.exe"
+    om.names.put(0x42, "Arthas")
+    om.names.save()
+
+    om._initialize_addresses() # Re-init: same section, logged only once
+    assert capsys.readouterr().out.count("Realm name unreadable") == 1
+
+    restarted = ObjectManager(MemoryHandler(backend=MemoryImageBackend(path)))
+    assert restarted.names.get(0x42) == "Arthas"
+
+
+def test_negative_entries_expire_and_are_not_persisted(tmp_path):
+    names = NameCache(str(tmp_path / "names.json"), negative_ttl=0.0)
+    names.load("Icecrown")
+    names.put(0x1, "Jaina")
+    names.put(0x2, "") # Not resolvable yet
+    assert names.get(0x2) is None # TTL 0: already expired, look it up again
+    names.negative_ttl = 60.0
+    names.put(0x2, "")
+    assert names.get(0x2) == ""
+    names.save()
+
+    reloaded = NameCache(str(tmp_path / "names.json"))
+    reloaded.load("Icecrown")
+    assert reloaded.get(0x1) == "Jaina" and reloaded.get(0x2) is None
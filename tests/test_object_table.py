@@ -0,0 +1,49 @@
+import numpy as np
+
+from object_table import ObjectTable, TableColumn
+
+
+class _Row:
+    x = TableColumn('x', float)
+    health = TableColumn('health')
+
+    def __init__(self, table):
+        self.table = table
+        self.slot = table.allocate()
+
+
+def test_growth_keeps_rows_and_hands_out_low_slots_first():
+    table = ObjectTable(capacity=2)
+    rows = [_Row(table) for _ in range(5)]
+    for i, row in enumerate(rows):
+        row.x, row.health = i * 1.5, 100 + i
+
+    assert table.capacity == 8 and len(table) == 5
+    assert [row.slot for row in rows] == [0, 1, 2, 3, 4]
+    assert [(row.x, row.health) for row in rows] == [(i * 1.5, 100 + i) for i in range(5)]
+    assert table.active_slots().tolist() == [0, 1, 2, 3, 4]
+
+
+def test_released_slots_are_reused_zeroed():
+    table = ObjectTable(capacity=4)
+    rows = [_Row(table) for _ in range(3)]
+    rows[1].health = 500
+    table.release(rows[1].slot)
+    table.release(rows[1].slot) # Double release is ignored
+    assert len(table) == 2
+
+    again = _Row(table)
+    assert again.slot == 1 and again.health == 0
+    assert len(table) == 3
+
+
+def test_within_distance_filters_by_type():
+    table = ObjectTable()
+    for i, object_type in enumerate([3, 3, 5, 4]):
+        row = _Row(table)
+        row.x = i * 10.0
+        table.columns['type'][row.slot] = object_type
+
+    assert table.within_distance(0.0, 0.0, 0.0, 25.0).tolist() == [0, 1, 2]
+    assert table.within_distance(0.0, 0.0, 0.0, 25.0, types=[3, 4]).tolist() == [0, 1]
+    assert np.allclose(table.distances_from(5.0, 0.0, 0.0, [0, 3]), [5.0, 25.0])
@@ -0,0 +1,38 @@
+import numpy as np
+
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from object_manager import ObjectManager
+from wow_object import update_dynamic_batch
+
+
+def _updated_manager(path, workers):
+    om = ObjectManager(MemoryHandler(backend=MemoryImageBackend(path)))
+    om.set_parallel_reads(workers, threshold=1)
+    om.refresh()
+    om.scan_objects()
+    objects = list(om.object_cache.values())
+    om.mem.begin_tick()
+    om.mem.reset_cache_stats()
+    update_dynamic_batch(objects, om.read_executor, om.read_workers, om.parallel_threshold)
+    return om, objects
+
+
+def test_sharded_update_matches_serial_and_merges_the_cache(world_image):
+    path = world_image(400)
+    serial, serial_objects = _updated_manager(path, 0)
+    sharded, sharded_objects = _updated_manager(path, 4)
+    try:
+        assert sharded.read_executor is not None
+        for column in ('x', 'y', 'health', 'max_health', 'level', 'power_type', 'dead'):
+            serial_values = serial.table.columns[column][[obj.slot for obj in serial_objects]]
+            sharded_values = sharded.table.columns[column][[obj.slot for obj in sharded_objects]]
+            assert np.array_equal(serial_values, sharded_values), column
+
+        # Worker pages and counters end up in the handler's cache on the calling thread
+        mem = sharded.mem
+        assert getattr(mem._worker, "reads", None) is None
+        assert mem.cache_hits + mem.cache_misses == serial.mem.cache_hits + serial.mem.cache_misses
+        assert mem.cache_misses == len(mem._page_cache) == len(serial.mem._page_cache)
+    finally:
+        sharded.close()
@@ -0,0 +1,48 @@
+import offsets
+import synthetic_world
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from pointer_chain import LIFETIME_OBJECT, LIFETIME_SESSION, LIFETIME_TICK, PointerChain, PointerResolver
+
+CLIENT_CONNECTION = PointerChain("client_connection", [offsets.STATIC_CLIENT_CONNECTION], LIFETIME_SESSION)
+OBJECT_MANAGER = PointerChain("object_manager", [offsets.OBJECT_MANAGER_OFFSET], LIFETIME_SESSION, parent=CLIENT_CONNECTION)
+FIRST_OBJECT = PointerChain("first_object", [offsets.FIRST_OBJECT_OFFSET], LIFETIME_TICK, parent=OBJECT_MANAGER)
+HASH_MASK = PointerChain("object_hash_mask", [offsets.OBJECT_HASH_MASK_OFFSET], LIFETIME_TICK, parent=OBJECT_MANAGER,
+                         final_is_pointer=False)
+UNIT_NAME = PointerChain("unit_name", [offsets.UNIT_NAME_CACHE_OFFSET, offsets.UNIT_NAME_STRING_OFFSET], LIFETIME_OBJECT)
+
+
+def test_resolves_chains_through_their_parents(image_mem):
+    resolver = PointerResolver(image_mem)
+    assert resolver.resolve(OBJECT_MANAGER) == synthetic_world.OBJECT_MANAGER
+    assert resolver.resolve(FIRST_OBJECT) == synthetic_world.OBJECT_AREA
+    assert resolver.resolve(HASH_MASK) == 63 # 50 units -> 64 hash buckets
+    unit = synthetic_world.OBJECT_AREA + 3 * 0x1000
+    assert image_mem.read_string(resolver.resolve(UNIT_NAME, unit, owner=7)) == "Mob3"
+
+
+def test_caches_by_lifetime(image_mem):
+    resolver = PointerResolver(image_mem)
+    resolver.resolve(FIRST_OBJECT)
+    assert (resolver.hits, resolver.misses) == (0, 3) # first_object, object_manager, client_connection
+    resolver.resolve(FIRST_OBJECT)
+    assert resolver.hits == 1
+
+    image_mem.begin_tick() # Tick entries expire, the session prefix stays cached
+    resolver.resolve(FIRST_OBJECT)
+    assert (resolver.hits, resolver.misses) == (2, 4)
+
+    unit = synthetic_world.OBJECT_AREA
+    resolver.resolve(UNIT_NAME, unit, owner=1)
+    resolver.resolve(UNIT_NAME, unit, owner=1)
+    assert resolver.stats()['cached'][LIFETIME_OBJECT] == 1
+    resolver.release_object(1)
+    assert resolver.stats()['cached'][LIFETIME_OBJECT] == 0
+
+
+def test_invalid_links_resolve_to_zero_and_are_not_cached(world_image):
+    mem = MemoryHandler(backend=MemoryImageBackend(world_image(10)))
+    resolver = PointerResolver(mem)
+    broken = PointerChain("broken", [offsets.STATIC_CLIENT_CONNECTION, 0x7FF0], LIFETIME_SESSION) # [[conn] + 0x7FF0] is unmapped
+    assert resolver.resolve(broken) == 0
+    assert resolver.stats()['cached'][LIFETIME_SESSION] == 0
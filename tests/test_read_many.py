@@ -0,0 +1,68 @@
+import offsets
+import synthetic_world
+from memory import READ_MERGE_MAX_SPAN, MemoryHandler
+from memory_backends import MemoryImageBackend
+
+
+class _LoggingImageBackend(MemoryImageBackend):
+    """MemoryImageBackend that logs the (address, length) of every read."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.reads = []
+
+    def read(self, address, length):
+        self.reads.append((address, length))
+        return super().read(address, length)
+
+
+def _mem(world_image):
+    mem = MemoryHandler(backend=_LoggingImageBackend(world_image(5)))
+    mem.page_cache_enabled = False # Every span is one backend read
+    mem.backend.reads.clear()
+    return mem
+
+
+def _fields(unit):
+    return synthetic_world.UNIT_FIELD_AREA + unit * 0x1000
+
+
+def test_nearby_requests_share_one_read_in_request_order(world_image):
+    mem = _mem(world_image)
+    health, level = _fields(2) + offsets.UNIT_FIELD_HEALTH, _fields(2) + offsets.UNIT_FIELD_LEVEL
+    guid = synthetic_world.OBJECT_AREA + 2 * 0x1000 + offsets.OBJECT_GUID
+
+    assert mem.read_many([(level, 'uint'), (health, 'uint'), (guid, 'ulonglong')]) == [80, 102, 0x102]
+    low, high = sorted([health, level])
+    assert (low, high + 4 - low) in mem.backend.reads # Health and level merged into one span
+    assert len(mem.backend.reads) == 2
+
+
+def test_gap_threshold_splits_spans(world_image):
+    mem = _mem(world_image)
+    first = _fields(0) + offsets.UNIT_FIELD_HEALTH
+    requests = [(first, 'uint'), (first + 4 + 0x40, 'uint')] # 0x40 bytes between the two values
+
+    mem.read_many(requests, max_gap=0x40)
+    assert mem.backend.reads == [(first, 0x48)]
+    mem.backend.reads.clear()
+    mem.read_many(requests, max_gap=0x3F)
+    assert mem.backend.reads == [(first, 4), (first + 0x44, 4)]
+
+
+def test_spans_are_capped(world_image):
+    mem = _mem(world_image)
+    base = _fields(1)
+    mem.read_many([(base + offset, 'uint') for offset in range(0, READ_MERGE_MAX_SPAN + 0x100, 0x80)])
+    assert len(mem.backend.reads) == 2
+    assert max(length for _, length in mem.backend.reads) <= READ_MERGE_MAX_SPAN
+
+
+def test_failed_span_only_defaults_its_own_values(world_image):
+    mem = _mem(world_image)
+    health = _fields(3) + offsets.UNIT_FIELD_HEALTH
+    unmapped = 0x07000000
+
+    values = mem.read_many([(unmapped, 'uint'), (health, 'uint'), (unmapped + 8, 'float'), (0, 'ulonglong')])
+    assert values == [0, 103, 0.0, 0]
+    assert all(address != 0 for address, _ in mem.backend.reads) # Null addresses are never read
@@ -0,0 +1,50 @@
+from object_table import ObjectTable
+from refresh_scheduler import TIER_CRITICAL, TIER_FAR, TIER_NEAR, RefreshScheduler
+
+
+class _Unit:
+    def __init__(self, table, guid, x):
+        self.slot = table.allocate()
+        self.guid = guid
+        table.columns['guid'][self.slot] = guid
+        table.columns['x'][self.slot] = x
+
+
+def _world():
+    table = ObjectTable()
+    units = [_Unit(table, 0x100 + i, x) for i, x in enumerate([0.0, 10.0, 30.0, 100.0, 500.0])]
+    return table, units
+
+
+def test_tiers_by_role_and_distance():
+    table, units = _world()
+    scheduler = RefreshScheduler(table)
+    selected = scheduler.select(units, origin=(0.0, 0.0, 0.0), critical_guids=[0x100, 0x104], now=10.0)
+
+    assert selected == [units[0], units[4], units[1], units[2], units[3]] # Critical, then near, then far
+    assert table.columns['refresh_tier'][[unit.slot for unit in units]].tolist() == \
+        [TIER_CRITICAL, TIER_NEAR, TIER_NEAR, TIER_FAR, TIER_CRITICAL]
+
+
+def test_objects_are_due_again_after_their_tier_interval():
+    table, units = _world()
+    scheduler = RefreshScheduler(table)
+    scheduler.completed(scheduler.select(units, (0.0, 0.0, 0.0), [0x100], now=10.0), now=10.0)
+
+    assert scheduler.select(units, (0.0, 0.0, 0.0), [0x100], now=10.05) == [units[0]] # Critical only
+    assert scheduler.select(units, (0.0, 0.0, 0.0), [0x100], now=10.2) == units[:3] # + near (0.1s)
+    assert scheduler.select(units, (0.0, 0.0, 0.0), [0x100], now=11.5) == units # + far (1s)
+
+
+def test_budget_defers_the_least_urgent_objects():
+    table, units = _world()
+    scheduler = RefreshScheduler(table, budget=0.002)
+    scheduler.completed(units, elapsed=0.005, now=0.0) # 1 ms per object -> 2 fit the budget
+
+    selected = scheduler.select(units, (0.0, 0.0, 0.0), [0x100], now=5.0)
+    assert selected == units[:2] and scheduler.deferred == 3
+
+    table.columns['updated_at'][[unit.slot for unit in units]] = 4.0
+    report = scheduler.staleness(units, now=5.0)
+    assert report['near'] == {'count': 2, 'mean_age': 1.0, 'max_age': 1.0}
+    assert report['critical']['count'] == 1 and report['far']['count'] == 2
@@ -0,0 +1,43 @@
+import threading
+
+from region_map import RegionMap
+
+
+def test_update_merges_adjacent_and_overlapping_regions():
+    regions = RegionMap([(0x3000, 0x1000), (0x1000, 0x1000), (0x2000, 0x800), (0x2400, 0x400), (0x8000, 0)])
+    assert (regions.starts, regions.ends) == ([0x1000, 0x3000], [0x2800, 0x4000])
+    assert len(regions) == 2 and regions.total_size == 0x2800
+
+
+def test_contains_and_region_of():
+    regions = RegionMap([(0x1000, 0x2000), (0x10000, 0x1000)])
+    assert regions.contains(0x1000, 0x2000)
+    assert not regions.contains(0x2FFF, 2) # Runs past the end
+    assert not regions.contains(0x0FFF)
+    assert not regions.contains(0x5000)
+    assert regions.region_of(0x10800) == (0x10000, 0x11000)
+    assert regions.region_of(0x4000) == (0, 0)
+
+
+def test_contains_during_concurrent_updates():
+    # Alternate between maps of different lengths while another thread looks up: a torn
+    # (new starts, old ends) pair would raise IndexError or answer wrongly
+    small = [(0x1000, 0x1000)]
+    large = [(0x1000 + i * 0x2000, 0x1000) for i in range(200)]
+    regions = RegionMap(large)
+    errors = []
+    stop = threading.Event()
+
+    def lookup():
+        while not stop.is_set():
+            try:
+                if not regions.contains(0x1800): errors.append("miss")
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=lookup)
+    reader.start()
+    for i in range(2000): regions.update(small if i % 2 else large)
+    stop.set()
+    reader.join()
+    assert errors == []
@@ -0,0 +1,121 @@
+import hashlib
+import struct
+
+import pytest
+
+import memory
+import offsets
+import signature_scanner
+import wow_object
+from signature_scanner import KIND_ABSOLUTE, KIND_MATCH, Signature, apply_offsets, find_pattern, parse_pattern
+from memory_backends import MemoryImageBackend, save_memory_image
+from world_objects import GameObject
+
+
+@pytest.fixture
+def restore_offsets():
+    """Puts back every offsets.py value a test changed through apply_offsets."""
+    saved = {name: getattr(offsets, name) for name in dir(offsets) if name.isupper()}
+    yield
+    apply_offsets({name: value for name, value in saved.items() if getattr(offsets, name) != value})
+
+
+def test_parse_pattern_splits_fixed_runs():
+    length, segments = parse_pattern("8B 0D ?? ?? ?? ?? 8B 81 ? 85 C0")
+    assert length == 11
+    assert segments == [(0, b'\x8b\x0d'), (6, b'\x8b\x81'), (9, b'\x85\xc0')]
+
+
+def test_find_pattern_checks_every_fixed_run():
+    signature = Signature("TEST", "8B 0D ?? ?? ?? ?? 85 C0", offset=2)
+    image = b'\x90' * 16 + b'\x8b\x0d\x11\x22\x33\x44\x85\x00' + b'\x8b\x0d\x78\x56\x34\x12\x85\xc0'
+    assert find_pattern(image, signature) == [24]
+
+
+def test_resolve_absolute_and_match():
+    image = b'\x90' * 8 + b'\xa1' + struct.pack('<I', 0xC79CE0) + b'\xc3'
+    scanner = signature_scanner.SignatureScanner.__new__(signature_scanner.SignatureScanner)
+    scanner.module_base = 0x400000
+    assert scanner.resolve(Signature("A", "A1 ?? ?? ?? ?? C3", offset=1, kind=KIND_ABSOLUTE), image) == 0xC79CE0
+    assert scanner.resolve(Signature("B", "90 A1", kind=KIND_MATCH), image) == 0x400000 + 7
+    assert scanner.resolve(Signature("C", "90 90"), image) is None # Ambiguous
+
+
+def test_apply_offsets_rederives_import_time_values(restore_offsets):
+    position_start = wow_object._POSITION_START
+    apply_offsets({'OBJECT_POS_Y': offsets.OBJECT_POS_Y - 0x10})
+    assert wow_object._POSITION_START == position_start - 0x10
+    apply_offsets({'GAMEOBJECT_POS_X': 0x123})
+    assert GameObject.x_pos.offset == 0x123
+
+
+def test_apply_offsets_rebuilds_object_header_format(restore_offsets, tmp_path):
+    # Swap the GUID and next pointer slots: the record order changes, the ObjectHeader fields must not
+    apply_offsets({'OBJECT_GUID': offsets.NEXT_OBJECT_OFFSET - 4, 'NEXT_OBJECT_OFFSET': offsets.OBJECT_GUID})
+    record = bytearray(0x1000)
+    struct.pack_into('<I', record, offsets.OBJECT_UNIT_FIELDS, 0x1000)
+    struct.pack_into('<h', record, offsets.OBJECT_TYPE, 3)
+    struct.pack_into('<Q', record, offsets.OBJECT_GUID, 0xABC)
+    struct.pack_into('<I', record, offsets.NEXT_OBJECT_OFFSET, 0x2000)
+    path = str(tmp_path / "header")
+    save_memory_image(path, [(0x10000, bytes(record))], 0x400000)
+    mem = memory.MemoryHandler(backend=MemoryImageBackend(path))
+    assert mem.read_object_header(0x10000) == memory.ObjectHeader(0x1000, 3, 0xABC, 0x2000)
+
+
+MODULE_BASE = 0x400000
+
+
+def _module_image(path, code: bytes, data: bytes = b''):
+    """Saves a minimal PE module: headers, a read-only .text at RVA 0x1000 holding `code`, a writable .data at 0x2000."""
+    image = bytearray(0x3000)
+    image[0:2] = b'MZ'
+    struct.pack_into('<I', image, 0x3C, 0x80)
+    image[0x80:0x84] = b'PE\0\0'
+    struct.pack_into('<HH', image, 0x84, 0x14C, 2) # Machine, NumberOfSections
+    struct.pack_into('<H', image, 0x94, 0xE0) # SizeOfOptionalHeader
+    struct.pack_into('<II', image, 0xD0, 0x3000, 0x400) # SizeOfImage, SizeOfHeaders
+    for entry, (name, rva, characteristics) in enumerate([(b'.text', 0x1000, 0x60000020), (b'.data', 0x2000, 0xC0000040)]):
+        at = 0x98 + 0xE0 + entry * 40
+        image[at:at + 8] = name.ljust(8, b'\0')
+        struct.pack_into('<II', image, at + 8, 0x1000, rva)
+        struct.pack_into('<I', image, at + 36, characteristics)
+    image[0x1010:0x1010 + len(code)] = code
+    image[0x2000:0x2000 + len(data)] = data
+    save_memory_image(path, [(MODULE_BASE, bytes(image))], MODULE_BASE)
+    return memory.MemoryHandler(backend=MemoryImageBackend(path))
+
+
+ACTIVE_PLAYER_GUID_CODE = bytes.fromhex('8B0D00DDCC008B89E02E000085C974108B81C80000008B91CC000000')
+
+
+def test_shipped_signatures_resolve_and_are_cached(restore_offsets, tmp_path):
+    mem = _module_image(str(tmp_path / "module"), ACTIVE_PLAYER_GUID_CODE)
+    cache_file = str(tmp_path / "offsets.json")
+    resolved = signature_scanner.SignatureScanner(mem, cache_file).resolve_offsets()
+    assert resolved == {'STATIC_CLIENT_CONNECTION': 0xCCDD00, 'OBJECT_MANAGER_OFFSET': 0x2EE0, 'LOCAL_GUID_OFFSET': 0xC8}
+    assert offsets.STATIC_CLIENT_CONNECTION == 0xCCDD00
+
+    scanner = signature_scanner.SignatureScanner(mem, cache_file)
+    scanner.scan = None # Warm start: served from the cache, no scan
+    assert scanner.resolve_offsets() == resolved
+
+
+def test_executable_key_ignores_writable_sections(tmp_path):
+    key = lambda mem: signature_scanner.SignatureScanner(mem).executable_key()
+    base = key(_module_image(str(tmp_path / "a"), ACTIVE_PLAYER_GUID_CODE, b'runtime state 1'))
+    assert base == key(_module_image(str(tmp_path / "b"), ACTIVE_PLAYER_GUID_CODE, b'runtime state 2'))
+    assert base != key(_module_image(str(tmp_path / "c"), ACTIVE_PLAYER_GUID_CODE[:-1] + b'\x01'))
+
+    executable = tmp_path / "Wow.exe"
+    executable.write_bytes(b'MZ' + bytes(100))
+    mem = _module_image(str(tmp_path / "d"), ACTIVE_PLAYER_GUID_CODE)
+    mem.backend.executable_path = str(executable)
+    assert key(mem) == hashlib.sha1(executable.read_bytes()).hexdigest() # The whole file, when it is known
+
+
+def test_find_pattern_handles_leading_and_trailing_wildcards():
+    signature = Signature("EDGES", "?? 8B ?? 0D ??")
+    image = b'\x8b\xff\x0d' + b'\x90\x8b\x00\x0d\x01' + b'\x90\x8b\x00\x0d'
+    assert find_pattern(image, signature) == [3] # The last candidate runs past the end
+    assert find_pattern(image, signature, first_only=True) == [3]
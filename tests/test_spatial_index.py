@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+
+from object_table import ObjectTable
+from spatial_index import SpatialIndex
+
+
+def _grid_table(positions):
+    table = ObjectTable()
+    columns = table.columns
+    for x, y, z in positions:
+        slot = table.allocate()
+        columns['x'][slot], columns['y'][slot], columns['z'][slot] = x, y, z
+    return table
+
+
+def _brute_force(table, pos, radius):
+    slots = table.active_slots()
+    distances = table.distances_from(*pos, slots)
+    keep = distances <= radius
+    return slots[keep][np.argsort(distances[keep], kind='stable')].tolist()
+
+
+def test_queries_match_a_full_scan():
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(-100, 100, size=(300, 3)).astype(np.float32)
+    positions[:, 2] /= 10
+    table = _grid_table(positions)
+    index = SpatialIndex(cell_size=10.0)
+    index.rebuild(table)
+
+    for pos, radius in [((0, 0, 0), 5.0), ((37.5, -12, 3), 25.0), ((-90, 90, 0), 40.0), ((0, 0, 0), math.inf)]:
+        assert index.within_radius(pos, radius).tolist() == _brute_force(table, pos, radius)
+    assert index.k_nearest((10, 10, 0), 7).tolist() == _brute_force(table, (10, 10, 0), math.inf)[:7]
+
+
+def test_k_nearest_respects_filter_and_max_distance():
+    table = _grid_table([(i * 5.0, 0.0, 0.0) for i in range(10)]) # Slots 0..9 at x = 0, 5, ..., 45
+    index = SpatialIndex()
+    index.rebuild(table)
+    odd = lambda slots: slots % 2 == 1
+
+    assert index.k_nearest((0, 0, 0), 3, filter=odd).tolist() == [1, 3, 5]
+    assert index.k_nearest((0, 0, 0), 3, max_distance=7.0).tolist() == [0, 1]
+    assert index.k_nearest((0, 0, 0), 0).tolist() == []
+
+
+def test_garbage_positions_are_not_indexed_and_cone_counts():
+    table = _grid_table([(10.0, 0.0, 0.0), (0.0, 10.0, 0.0), (-10.0, 0.0, 0.0), (float('nan'), 0.0, 0.0)])
+    index = SpatialIndex()
+    index.rebuild(table, tick=4)
+
+    assert len(index) == 3 and index.built_tick == 4
+    assert index.count_in_cone((0, 0, 0), 0.0, math.pi / 2, 20.0) == 1 # Facing +x
+    assert index.count_in_cone((0, 0, 0), math.pi / 2, math.pi * 1.5, 20.0) == 3
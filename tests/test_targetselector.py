@@ -0,0 +1,19 @@
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from object_manager import ObjectManager
+from targetselector import TargetSelector
+from world_snapshot import UnitSnapshot, WorldStateProducer
+
+
+def test_queries_the_latest_snapshot(world_image):
+    om = ObjectManager(MemoryHandler(backend=MemoryImageBackend(world_image(50))))
+    producer = WorldStateProducer(om)
+    selector = TargetSelector(producer)
+    assert selector.get_selected_target() is None and selector.find_nearest_enemy() is None # No snapshot yet
+
+    snapshot = producer.tick()
+    target = selector.get_selected_target()
+    assert isinstance(target, UnitSnapshot) and target is snapshot.target and target.guid == 0x101
+    nearest = selector.find_nearest_enemy(40.0)
+    assert nearest.guid == 0x101 # Synthetic unit 1 stands 5 yd from the player
+    assert selector.find_nearest_enemy(1.0) is None
@@ -0,0 +1,89 @@
+import struct
+
+import pytest
+
+import offsets
+from memory import MemoryField, MemoryHandler, TickField
+from memory_backends import MemoryImageBackend, save_memory_image
+from object_manager import ObjectManager
+from world_snapshot import WorldStateProducer
+from wow_object import update_dynamic_batch
+
+FIELDS = 0x10000
+
+
+class _Owner:
+    __slots__ = ('mem', 'unit_fields_address', '_tick_fields')
+    summoned_by_guid = TickField('UNIT_FIELD_SUMMONEDBY', 'ulonglong', base='unit_fields_address')
+    health = MemoryField('UNIT_FIELD_HEALTH', base='unit_fields_address')
+
+    def __init__(self, mem, address):
+        self.mem = mem
+        self.unit_fields_address = address
+        self._tick_fields = None
+
+
+@pytest.fixture
+def counted_mem(tmp_path):
+    block = bytearray(0x1000)
+    struct.pack_into('<Q', block, offsets.UNIT_FIELD_SUMMONEDBY, 0xF130000000001234)
+    struct.pack_into('<I', block, offsets.UNIT_FIELD_HEALTH, 4242)
+    path = str(tmp_path / "fields")
+    save_memory_image(path, [(FIELDS, bytes(block))], 0x400000)
+    mem = MemoryHandler(backend=MemoryImageBackend(path))
+    calls = []
+    read_ulonglong = mem.read_ulonglong
+    mem.read_ulonglong = lambda address: calls.append(address) or read_ulonglong(address)
+    return mem, calls
+
+
+def test_tick_field_reads_once_per_tick(counted_mem):
+    mem, calls = counted_mem
+    owner = _Owner(mem, FIELDS)
+    assert owner.summoned_by_guid == 0xF130000000001234
+    assert owner.summoned_by_guid == 0xF130000000001234
+    assert calls == [FIELDS + offsets.UNIT_FIELD_SUMMONEDBY] # Through the public reader, once
+
+    mem.begin_tick()
+    assert owner.summoned_by_guid == 0xF130000000001234
+    assert len(calls) == 2
+
+
+def test_fields_without_an_address_give_the_default(counted_mem):
+    mem, calls = counted_mem
+    owner = _Owner(mem, 0)
+    assert owner.summoned_by_guid == 0 and owner.health == 0 and calls == []
+    assert _Owner(mem, FIELDS).health == 4242
+
+
+def test_field_types_need_a_public_reader():
+    with pytest.raises(ValueError):
+        MemoryField('UNIT_FIELD_HEALTH', 'int')
+
+
+def test_batch_leaves_cold_fields_to_first_access(world_image):
+    mem = MemoryHandler(backend=MemoryImageBackend(world_image(10)))
+    om = ObjectManager(mem)
+    om.scan_objects()
+    mem.page_cache_enabled = False # Count reads, not page fetches
+    reads = []
+    read_bytes = mem.read_bytes
+    mem.read_bytes = lambda address, length: reads.append(address) or read_bytes(address, length)
+    read_uint = mem.read_uint
+    mem.read_uint = lambda address: reads.append(address) or read_uint(address)
+
+    units = list(om.object_cache.values())
+    update_dynamic_batch(units)
+    assert len(reads) == 2 * len(units) # Position and unit field block per unit, nothing cold
+
+    reads.clear()
+    target = om.object_cache[0x101]
+    assert not target.is_casting and not target.is_casting and not target.is_channeling
+    assert reads == [target.base_address + offsets.OBJECT_CASTING_SPELL_ID, target.base_address + offsets.OBJECT_CHANNEL_SPELL_ID]
+
+
+def test_snapshot_carries_casting_for_player_and_target_only(world_image):
+    snapshot = WorldStateProducer(ObjectManager(MemoryHandler(backend=MemoryImageBackend(world_image(10))))).tick()
+    assert snapshot.player.casting_spell_id == 0 and snapshot.target.channeling_spell_id == 0
+    other = snapshot.get(0x105)
+    assert other.casting_spell_id is None and not other.is_casting
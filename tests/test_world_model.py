@@ -0,0 +1,57 @@
+from collections import namedtuple
+
+import pytest
+
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from object_manager import ObjectManager
+from world_model import EVENT_DESPAWN, WorldModel
+
+_Object = namedtuple('_Object', ['guid', 'base_address'])
+
+
+def test_diff_reports_new_gone_and_moved():
+    world = WorldModel()
+    for guid, address in [(1, 0x1000), (2, 0x2000), (3, 0x3000)]:
+        world.spawn(_Object(guid, address))
+
+    new, gone, moved = world.diff({1: 0x1000, 3: 0x3800, 4: 0x4000})
+    assert (new, gone, moved) == ([4], [2], [3])
+    assert world.diff({1: 0x1000, 2: 0x2000, 3: 0x3000}) == ([], [], [])
+
+
+def test_events_reach_listeners_until_unsubscribed():
+    world = WorldModel()
+    events = []
+    world.on_spawn(lambda obj: events.append(('spawn', obj.guid)))
+    on_despawn = lambda obj: events.append(('despawn', obj.guid))
+    world.on_despawn(on_despawn)
+    world.on_despawn(lambda obj: 1 / 0) # A failing listener doesn't stop the others
+
+    world.spawn(_Object(1, 0x1000))
+    world.spawn(_Object(2, 0x2000))
+    assert world.despawn(1).guid == 1 and world.despawn(1) is None
+    world.unsubscribe(EVENT_DESPAWN, on_despawn)
+    world.clear()
+
+    assert events == [('spawn', 1), ('spawn', 2), ('despawn', 1)]
+    assert len(world) == 0 and world.order == []
+    with pytest.raises(ValueError):
+        world.subscribe("teleport", print)
+
+
+def test_scan_spawns_the_listed_units_once(world_image):
+    om = ObjectManager(MemoryHandler(backend=MemoryImageBackend(world_image(30, extra=6))))
+    assert sorted(om.world.objects) == [0x100, 0x101] # Player and target, looked up while initializing
+    spawned = []
+    om.world.on_spawn(lambda obj: spawned.append(obj.guid))
+    delta = om.scan_objects()
+
+    units = [0x100 + i for i in range(30)] # The 6 non-unit objects are not part of the model
+    assert sorted(spawned) == units[2:] and [obj.guid for obj in delta.spawned] == spawned
+    assert sorted(om.world.objects) == units and om.world.order == units
+    assert not delta.despawned and not delta.relocated
+
+    om.mem.begin_tick()
+    assert om.scan_objects() == ([], [], []) # Nothing changed in memory -> no events
+    assert len(spawned) == 28
@@ -0,0 +1,25 @@
+from memory import MemoryHandler
+from memory_backends import MemoryImageBackend
+from object_manager import ObjectManager
+from world_snapshot import WorldStateProducer
+
+
+def test_first_snapshot_carries_spawned_units_real_rows(world_image):
+    om = ObjectManager(MemoryHandler(backend=MemoryImageBackend(world_image(50))))
+    snapshot = WorldStateProducer(om).tick()
+
+    assert len(snapshot) == 50
+    unit = snapshot.get(0x100 + 25) # Synthetic unit i: x = (i % 20) * 5, y = (i // 20) * 5, health 100 + i
+    assert (unit.x_pos, unit.y_pos) == (25.0, 5.0)
+    assert (unit.health, unit.max_health, unit.level) == (125, 225, 80)
+    assert not unit.is_dead and unit.power_type == 0
+
+
+def test_snapshot_has_no_phantom_units_at_origin(world_image):
+    om = ObjectManager(MemoryHandler(backend=MemoryImageBackend(world_image(50))))
+    snapshot = WorldStateProducer(om).tick()
+
+    # Only synthetic unit 0 (the local player) really stands at the origin
+    at_origin = snapshot.within_radius(1.0, pos=(0.0, 0.0, 0.0))
+    assert [unit.guid for unit in at_origin] == [0x100]
+    assert all(unit.health > 0 for unit in snapshot)
@@ -0,0 +1,95 @@
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+# --- World Events ---
+EVENT_SPAWN = "spawn"       # callback(obj): object appeared in the object list
+EVENT_DESPAWN = "despawn"   # callback(obj): object left the object list (obj is the last known state)
+EVENT_RELOCATE = "relocate" # callback(obj, old_address): same GUID, new base address (obj updated in place)
+
+# Result of one scan. spawned/despawned/relocated hold WowObjects; relocated as (obj, old_address).
+WorldDelta = namedtuple('WorldDelta', ['spawned', 'despawned', 'relocated'])
+
+
+class WorldModel:
+    """
+    The set of live objects as (guid -> object at base address), updated incrementally from
+    object list scans. ObjectManager.scan_objects() feeds it the (guid, base_address) pairs it
+    walked; the model works out what spawned, despawned or moved and notifies listeners.
+
+    Nothing in the tree subscribes today: the GUI reads WorldSnapshots (the monitor tab diffs
+    consecutive snapshots, TargetSelector queries the latest one). The events are an extension
+    point for producer-side consumers; listeners run on the scanning (producer) thread and must
+    not block it.
+    """
+
+    def __init__(self):
+        self.objects: Dict[int, object] = {} # guid -> WowObject (ObjectManager.object_cache is this dict)
+        self.order: List[int] = [] # GUIDs in object list order as of the last scan
+        self.scans: int = 0
+        self._listeners: Dict[str, List[Callable]] = {EVENT_SPAWN: [], EVENT_DESPAWN: [], EVENT_RELOCATE: []}
+        self._lock = threading.Lock() # Listener list: subscribers come and go from the GUI thread
+
+    # --- Subscriptions ---
+    def subscribe(self, event: str, callback: Callable):
+        if event not in self._listeners:
+            raise ValueError(f"Unknown world event '{event}'")
+        with self._lock:
+            self._listeners[event] = self._listeners[event] + [callback] # Copy-on-write: emit() iterates unlocked
+
+    def unsubscribe(self, event: str, callback: Callable):
+        with self._lock:
+            self._listeners[event] = [listener for listener in self._listeners[event] if listener is not callback]
+
+    def on_spawn(self, callback: Callable): self.subscribe(EVENT_SPAWN, callback)
+    def on_despawn(self, callback: Callable): self.subscribe(EVENT_DESPAWN, callback)
+    def on_relocate(self, callback: Callable): self.subscribe(EVENT_RELOCATE, callback)
+
+    def emit(self, event: str, *args):
+        for callback in self._listeners[event]:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"[WorldModel] Error in {event} listener {getattr(callback, '__name__', callback)}: {e}")
+
+    # --- Updates ---
+    def diff(self, seen: Dict[int, int]) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Compares a scan's guid -> base_address pairs with the model.
+        Returns (new GUIDs, gone GUIDs, GUIDs whose base address changed).
+        """
+        objects = self.objects
+        new = [guid for guid in seen if guid not in objects]
+        moved = [guid for guid, address in seen.items() if guid in objects and objects[guid].base_address != address]
+        gone = [guid for guid in objects if guid not in seen]
+        return new, gone, moved
+
+    def spawn(self, obj):
+        """Adds an object (built by the caller for a real spawn) and notifies listeners."""
+        self.objects[obj.guid] = obj
+        self.emit(EVENT_SPAWN, obj)
+
+    def despawn(self, guid: int):
+        """Removes an object and notifies listeners. Returns the removed object (or None)."""
+        obj = self.objects.pop(guid, None)
+        if obj is not None: self.emit(EVENT_DESPAWN, obj)
+        return obj
+
+    def relocated(self, obj, old_address: int):
+        """Notifies listeners that `obj` (already updated in place) moved from `old_address`."""
+        self.emit(EVENT_RELOCATE, obj, old_address)
+
+    def clear(self):
+        """Despawns everything (e.g. the local player changed)."""
+        for guid in list(self.objects):
+            self.despawn(guid)
+        self.order = []
+
+    def get(self, guid: int):
+        return self.objects.get(guid)
+
+    def is_live(self, guid: int) -> bool:
+        return guid in self.objects
+
+    def __len__(self) -> int:
+        return len(self.objects)
@@ -0,0 +1,132 @@
+from typing import Dict, Optional, Type
+
+import offsets
+from memory import MemoryField, ObjectHeader
+from wow_object import WowObject
+
+
+class WorldObject:
+    """
+    Lightweight base for the non-unit object types (GameObject, DynamicObject, Corpse).
+
+    Construction reads nothing: GUID, type and descriptor pointer come from the object header
+    the list walk already read. Every other field is a MemoryField, read from memory only when
+    accessed - a city holds thousands of these and most are never looked at. No ObjectTable row,
+    no refresh scheduling: these objects are not part of the per-tick unit update.
+    """
+    __slots__ = ('base_address', 'mem', 'guid', 'type', 'descriptor_address', 'name')
+    TYPE = WowObject.TYPE_NONE
+
+    def __init__(self, base_address: int, mem_handler, header: ObjectHeader):
+        self.base_address = base_address
+        self.mem = mem_handler
+        self.guid = header.guid
+        self.type = header.type
+        self.descriptor_address = header.unit_fields # Same header slot as the unit fields pointer
+        self.name = "" # Resolved on first get_name()
+
+    # Per-type position offsets (relative to the object base), set by subclasses
+    x_pos = y_pos = z_pos = None
+
+    @property
+    def is_player(self) -> bool: return False
+
+    @property
+    def is_unit(self) -> bool: return False
+
+    @property
+    def generation(self) -> int:
+        return self.guid # See WowObject.generation
+
+    def _read_name(self) -> str:
+        return ""
+
+    def get_name(self) -> str:
+        if not self.name: self.name = self._read_name()
+        return self.name if self.name else f"Obj_{self.type}@{hex(self.base_address)}"
+
+    def get_type_str(self) -> str:
+        return WowObject.TYPE_NAMES.get(self.type, "Unknown")
+
+    def __repr__(self):
+        return f"{type(self).__name__}(GUID=0x{self.guid:X}, Base=0x{self.base_address:X})"
+
+
+class GameObject(WorldObject):
+    """Herbs, ore veins, chests, doors, mailboxes, fishing bobbers..."""
+    __slots__ = ()
+    TYPE = WowObject.TYPE_GAMEOBJECT
+
+    x_pos = MemoryField('GAMEOBJECT_POS_X', 'float', base='base_address')
+    y_pos = MemoryField('GAMEOBJECT_POS_Y', 'float', base='base_address')
+    z_pos = MemoryField('GAMEOBJECT_POS_Z', 'float', base='base_address')
+    created_by_guid = MemoryField('GAMEOBJECT_FIELD_CREATED_BY', 'ulonglong')
+    display_id = MemoryField('GAMEOBJECT_FIELD_DISPLAY_ID')
+    flags = MemoryField('GAMEOBJECT_FIELD_FLAGS')
+    faction = MemoryField('GAMEOBJECT_FIELD_FACTION')
+    level = MemoryField('GAMEOBJECT_FIELD_LEVEL')
+    bytes_1 = MemoryField('GAMEOBJECT_FIELD_BYTES_1')
+
+    @property
+    def state(self) -> int:
+        return self.bytes_1 & 0xFF
+
+    @property
+    def gameobject_type(self) -> int:
+        """GAMEOBJECT_TYPE_* (3 = chest, which includes herbs and ore; 17 = fishing node...)."""
+        return (self.bytes_1 >> 8) & 0xFF
+
+    def _read_name(self) -> str:
+        # Base -> +0x1A4 -> +0x90 -> name string
+        info = self.mem.read_uint(self.base_address + offsets.GAMEOBJECT_NAME_PTR1)
+        if not info: return ""
+        name_addr = self.mem.read_uint(info + offsets.GAMEOBJECT_NAME_PTR2)
+        if not name_addr: return ""
+        return self.mem.read_string(name_addr, max_length=100, generation=self.generation, site="gameobject_name")
+
+
+class DynamicObject(WorldObject):
+    """Persistent ground effects (Blizzard, Consecration, Death and Decay...)."""
+    __slots__ = ()
+    TYPE = WowObject.TYPE_DYNAMICOBJECT
+
+    x_pos = MemoryField('DYNAMICOBJECT_POS_X', 'float', base='base_address')
+    y_pos = MemoryField('DYNAMICOBJECT_POS_Y', 'float', base='base_address')
+    z_pos = MemoryField('DYNAMICOBJECT_POS_Z', 'float', base='base_address')
+    caster_guid = MemoryField('DYNAMICOBJECT_FIELD_CASTER', 'ulonglong')
+    spell_id = MemoryField('DYNAMICOBJECT_FIELD_SPELL_ID')
+    radius = MemoryField('DYNAMICOBJECT_FIELD_RADIUS', 'float')
+    cast_time = MemoryField('DYNAMICOBJECT_FIELD_CAST_TIME')
+
+    def _read_name(self) -> str:
+        spell_id = self.spell_id
+        return f"Spell {spell_id}" if spell_id else ""
+
+
+class Corpse(WorldObject):
+    """Player corpses (the owner's GUID resolves to a name through ObjectManager.get_player_name_from_guid)."""
+    __slots__ = ()
+    TYPE = WowObject.TYPE_CORPSE
+
+    x_pos = MemoryField('CORPSE_POS_X', 'float', base='base_address')
+    y_pos = MemoryField('CORPSE_POS_Y', 'float', base='base_address')
+    z_pos = MemoryField('CORPSE_POS_Z', 'float', base='base_address')
+    owner_guid = MemoryField('CORPSE_FIELD_OWNER', 'ulonglong')
+    party_guid = MemoryField('CORPSE_FIELD_PARTY', 'ulonglong')
+    display_id = MemoryField('CORPSE_FIELD_DISPLAY_ID')
+    flags = MemoryField('CORPSE_FIELD_FLAGS')
+    dynamic_flags = MemoryField('CORPSE_FIELD_DYNAMIC_FLAGS')
+
+    def _read_name(self) -> str:
+        owner = self.owner_guid
+        return f"Corpse of 0x{owner:X}" if owner else ""
+
+
+# Header type -> class, for ObjectManager (types not listed here and not units are not modelled)
+WORLD_OBJECT_CLASSES: Dict[int, Type[WorldObject]] = {cls.TYPE: cls for cls in (GameObject, DynamicObject, Corpse)}
+
+
+def make_world_object(base_address: int, mem_handler, header: ObjectHeader) -> Optional[WorldObject]:
+    """Builds the lazy object for a GameObject/DynamicObject/Corpse header (None for other types)."""
+    cls = WORLD_OBJECT_CLASSES.get(header.type)
+    return cls(base_address, mem_handler, header) if cls is not None else None
@@ -0,0 +1,283 @@
+import math
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from wow_object import WowObject
+
+# --- Snapshot Settings ---
+SNAPSHOT_RATE_HZ = 10.0          # Snapshots built per second by the producer thread
+SNAPSHOT_MAX_AGE = 1.0           # Seconds; consumers acting on the game (rotation) skip older snapshots
+COMBAT_EVENT_QUEUE_SIZE = 2000   # Combat log events buffered for the GUI (oldest dropped when full)
+PRODUCER_ERROR_BACKOFF = 0.5     # Seconds to wait after a failed tick
+MOVING_EPSILON = 0.01            # Yards a unit has to move between snapshots to count as moving
+SPELLBOOK_CHECK_INTERVAL = 1.0   # Seconds between spellbook reads (one bulk read, decoded only when it changed)
+
+# Object table column -> UnitSnapshot field
+_SNAPSHOT_COLUMNS = (
+    ('guid', 'guid'), ('type', 'type'), ('x', 'x_pos'), ('y', 'y_pos'), ('z', 'z_pos'),
+    ('rotation', 'rotation'), ('level', 'level'), ('health', 'health'), ('max_health', 'max_health'),
+    ('power', 'energy'), ('max_power', 'max_energy'), ('power_type', 'power_type'), ('flags', 'unit_flags'),
+    ('target_guid', 'target_guid'), ('dead', 'is_dead'), ('slot', 'slot'),
+)
+
+
+class UnitSnapshot(namedtuple('UnitSnapshot', [field for _, field in _SNAPSHOT_COLUMNS] +
+                                       ['name', 'is_moving', 'auras', 'casting_spell_id', 'channeling_spell_id'])):
+    """
+    Frozen copy of one object's state. Field and property names match WowObject, so rotation
+    conditions and GUI code work on either. `auras` holds the aura spell IDs for the local player
+    and the target, the casting IDs are read for those and the focus (None for everything else -
+    neither is read for every object, see WowObject).
+    """
+    __slots__ = ()
+
+    # Same logic as on the live object (it only looks at type/flags fields)
+    has_flag = WowObject.has_flag
+    is_player = WowObject.is_player
+    is_unit = WowObject.is_unit
+    is_attackable = WowObject.is_attackable
+    is_stunned = WowObject.is_stunned
+    get_power_label = WowObject.get_power_label
+    get_type_str = WowObject.get_type_str
+
+    @property
+    def is_casting(self) -> bool:
+        return bool(self.casting_spell_id) # None (not read) counts as not casting
+
+    @property
+    def is_channeling(self) -> bool:
+        return bool(self.channeling_spell_id)
+
+    @property
+    def health_percentage(self) -> float:
+        return (self.health / self.max_health) * 100 if self.max_health > 0 else 0.0
+
+    def has_aura_by_id(self, spell_id: int) -> bool:
+        return self.auras is not None and spell_id in self.auras
+
+    def get_name(self) -> str:
+        return self.name if self.name else f"Obj_{self.type}@{hex(self.guid)}"
+
+
+class WorldSnapshot:
+    """
+    Immutable view of the world at one producer tick: the local player, target and every cached
+    object as UnitSnapshots, plus the spatial index built for that tick (never modified once
+    built, see ObjectManager.spatial_index) for radius / nearest / cone queries. `known_spells`
+    is the spellbook as of `spellbook_version` (ObjectManager.spellbook_version).
+    """
+    __slots__ = ('tick', 'time', 'player', 'target', 'focus_guid', 'units', 'spellbook_version', 'known_spells',
+                 '_by_guid', '_by_slot', '_index', '_enemy')
+
+    def __init__(self, tick: int, timestamp: float, player: Optional[UnitSnapshot], target: Optional[UnitSnapshot],
+                 focus_guid: int, units: Tuple[UnitSnapshot, ...], index, enemy: np.ndarray,
+                 spellbook_version: int = 0, known_spells: FrozenSet[int] = frozenset()):
+        self.tick = tick
+        self.time = timestamp
+        self.player = player
+        self.target = target
+        self.focus_guid = focus_guid
+        self.units = units # Object list order
+        self.spellbook_version = spellbook_version
+        self.known_spells = known_spells
+        self._by_guid = MappingProxyType({unit.guid: unit for unit in units})
+        self._by_slot = {unit.slot: unit for unit in units}
+        self._index = index # SpatialIndex over the units' slots
+        self._enemy = enemy # Bool per object table slot: ObjectManager.enemy_filter at snapshot time
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __iter__(self):
+        return iter(self.units)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.time
+
+    def get(self, guid: int) -> Optional[UnitSnapshot]:
+        return self._by_guid.get(guid)
+
+    # --- Spatial Queries (default origin: the local player) ---
+    def _origin(self, pos: Optional[Sequence[float]]) -> Optional[Sequence[float]]:
+        if pos is not None: return pos
+        player = self.player
+        return (player.x_pos, player.y_pos, player.z_pos) if player is not None else None
+
+    def _enemy_filter(self, slots: np.ndarray) -> np.ndarray:
+        return self._enemy[slots]
+
+    def distance(self, unit: Optional[UnitSnapshot], other: Optional[UnitSnapshot] = None) -> float:
+        """3D distance from `other` (default: the local player) to `unit`, or -1.0 if either is missing."""
+        other = other if other is not None else self.player
+        if unit is None or other is None: return -1.0
+        return math.sqrt((unit.x_pos - other.x_pos) ** 2 + (unit.y_pos - other.y_pos) ** 2 + (unit.z_pos - other.z_pos) ** 2)
+
+    def within_radius(self, radius: float, pos: Optional[Sequence[float]] = None, enemies_only: bool = False) -> List[UnitSnapshot]:
+        """Units within `radius` of pos, nearest first (only attackable enemies with enemies_only)."""
+        pos = self._origin(pos)
+        if pos is None: return []
+        slots = self._index.within_radius(pos, radius, self._enemy_filter if enemies_only else None)
+        return [self._by_slot[slot] for slot in slots.tolist()]
+
+    def k_nearest(self, k: int, pos: Optional[Sequence[float]] = None, enemies_only: bool = False,
+                  max_distance: float = math.inf) -> List[UnitSnapshot]:
+        pos = self._origin(pos)
+        if pos is None: return []
+        slots = self._index.k_nearest(pos, k, self._enemy_filter if enemies_only else None, max_distance)
+        return [self._by_slot[slot] for slot in slots.tolist()]
+
+    def count_in_cone(self, facing: float, angle: float, radius: float, pos: Optional[Sequence[float]] = None,
+                      enemies_only: bool = False) -> int:
+        pos = self._origin(pos)
+        if pos is None: return 0
+        return self._index.count_in_cone(pos, facing, angle, radius, self._enemy_filter if enemies_only else None)
+
+
+def build_snapshot(om, previous: Optional[WorldSnapshot] = None) -> WorldSnapshot:
+    """
+    Copies the ObjectManager's current state (after refresh/scan_objects) into a WorldSnapshot.
+    Fields come from the object table as one array slice per column; auras are read for the
+    local player and target only, the casting IDs (TickFields) for those and the focus.
+    """
+    objects = [obj for obj in (om.object_cache.get(guid) for guid in om.world.order)
+               if obj is not None and obj.table is om.table]
+    listed = {obj.guid for obj in objects}
+    for obj in (om.local_player, om.target): # Found through the hash table before the list walk saw them
+        if obj is not None and obj.guid not in listed and obj.table is om.table:
+            objects.append(obj)
+            listed.add(obj.guid)
+
+    columns = om.table.columns
+    slots = np.fromiter((obj.slot for obj in objects), dtype=np.intp, count=len(objects))
+    values = [slots.tolist() if column == 'slot' else columns[column][slots].tolist() for column, _ in _SNAPSHOT_COLUMNS]
+    aura_owners = {obj.guid: obj for obj in (om.local_player, om.target) if obj is not None}
+    auras: Dict[int, FrozenSet[int]] = {guid: frozenset(aura.spell_id for aura in obj.get_auras())
+                                        for guid, obj in aura_owners.items()}
+    cast_owners = dict(aura_owners)
+    focus = om.object_cache.get(om.focus_guid) if om.focus_guid else None
+    if focus is not None: cast_owners[focus.guid] = focus
+    casts = {guid: (obj.casting_spell_id, obj.channeling_spell_id) for guid, obj in cast_owners.items()}
+
+    units = []
+    for obj, row in zip(objects, zip(*values)):
+        unit = UnitSnapshot(*row, obj.name, False, auras.get(obj.guid), *casts.get(obj.guid, (None, None)))
+        before = previous.get(unit.guid) if previous is not None else None
+        if before is not None and (abs(unit.x_pos - before.x_pos) > MOVING_EPSILON or abs(unit.y_pos - before.y_pos) > MOVING_EPSILON
+                                   or abs(unit.z_pos - before.z_pos) > MOVING_EPSILON):
+            unit = unit._replace(is_moving=True)
+        units.append(unit)
+    units = tuple(units)
+
+    enemy = np.zeros(om.table.capacity, dtype=np.bool_)
+    if len(slots): enemy[slots] = om.enemy_filter(slots)
+    by_guid = {unit.guid: unit for unit in units}
+    known_spells = previous.known_spells if previous is not None and previous.spellbook_version == om.spellbook_version \
+        else frozenset(om.known_spell_ids)
+    return WorldSnapshot(om.mem.tick_id, time.time(), by_guid.get(om.local_player_guid) if om.local_player else None,
+                         by_guid.get(om.target_guid) if om.target else None, om.focus_guid, units,
+                         om.spatial_index(), enemy, om.spellbook_version, known_spells)
+
+
+class WorldStateProducer:
+    """
+    Acquisition thread: the only reader of game memory during normal operation. Each tick it
+    refreshes the ObjectManager, walks the object list, builds a WorldSnapshot and publishes it
+    by replacing `latest` (a single reference assignment, so readers always see a complete
+    snapshot; the one they hold stays valid while the next is built). New combat log entries
+    go to a queue the GUI drains.
+    """
+
+    def __init__(self, om, combat_log_reader=None, rate_hz: float = SNAPSHOT_RATE_HZ):
+        self.om = om
+        self.combat_log_reader = combat_log_reader
+        self.interval = 1.0 / max(0.1, rate_hz)
+        self.latest: Optional[WorldSnapshot] = None
+        self.combat_events: "queue.Queue" = queue.Queue(maxsize=COMBAT_EVENT_QUEUE_SIZE) # (timestamp, event node)
+        self.snapshots = 0 # Published so far
+        self.errors = 0
+        self.dropped_events = 0
+        self.same_frame_ticks = 0 # Ticks that republished `latest` because the game hadn't drawn a new frame
+        self.last_tick_time = 0.0 # Seconds the last tick took
+        self._next_spellbook_check = 0.0 # monotonic time of the next read_known_spell_ids()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.is_running(): return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="WorldStateProducer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_rate(self, rate_hz: float):
+        self.interval = 1.0 / max(0.1, rate_hz)
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                self.tick()
+            except Exception as e:
+                self.errors += 1
+                print(f"[WorldStateProducer] Error building snapshot: {e}", file=sys.stderr)
+                self._stop.wait(PRODUCER_ERROR_BACKOFF)
+                continue
+            self.last_tick_time = time.monotonic() - start
+            self._stop.wait(max(0.0, self.interval - self.last_tick_time))
+
+    def tick(self) -> Optional[WorldSnapshot]:
+        """Builds and publishes one snapshot (also callable directly, without the thread)."""
+        om = self.om
+        refreshed = om.refresh()
+        if not om.is_ready(): return None
+        if not refreshed and self.latest is not None:
+            # Same frame epoch as the last refresh (see ObjectManager.refresh): nothing changed
+            self.same_frame_ticks += 1
+            return self.latest
+        om.scan_objects()
+        now = time.monotonic()
+        if now >= self._next_spellbook_check:
+            om.read_known_spell_ids() # Bumps om.spellbook_version only if the slot map changed
+            self._next_spellbook_check = now + SPELLBOOK_CHECK_INTERVAL
+        snapshot = build_snapshot(om, self.latest)
+        self.latest = snapshot # Atomic swap
+        self.snapshots += 1
+
+        reader = self.combat_log_reader
+        if reader is not None and reader.initialized and snapshot.player is not None:
+            for entry in reader.read_new_entries():
+                self._queue_event(entry)
+        return snapshot
+
+    def _queue_event(self, entry):
+        try:
+            self.combat_events.put_nowait(entry)
+        except queue.Full:
+            try: self.combat_events.get_nowait() # Drop the oldest: the GUI is behind anyway
+            except queue.Empty: pass
+            self.dropped_events += 1
+            self.combat_events.put_nowait(entry)
+
+    def drain_combat_events(self, limit: int = COMBAT_EVENT_QUEUE_SIZE) -> List:
+        """Queued (timestamp, event node) combat log entries, oldest first (at most `limit`)."""
+        events = []
+        while len(events) < limit:
+            try: events.append(self.combat_events.get_nowait())
+            except queue.Empty: break
+        return events
@@ -2,21 +2,41 @@ import offsets # Import offsets globally for constants
 import time
 import logging
 import sys
-from typing import Optional
-import pymem
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence
+import numpy as np
+from memory_backends import MemoryReadError
+from memory import AuraEntry, ObjectHeader, TickField
+from object_table import ObjectTable, TableColumn
+from signature_scanner import on_offsets_changed
 
 logger = logging.getLogger(__name__)
 
 class WowObject:
-    """Represents a generic World of Warcraft object (Player, NPC, Item, etc.)."""
-
-    # Object Types (Keep only Player and Unit)
+    """
+    Represents a generic World of Warcraft object (Player, NPC, Item, etc.).
+
+    Fields come in two kinds: hot fields live in the ObjectTable row and are written for the whole
+    refresh batch by update_dynamic_batch; cold fields are TickFields, read from memory on first
+    access in a tick and cached until the next one. `__slots__` keeps the instance itself small -
+    thousands are cached in a city.
+
+    The casting IDs sit in their own range of the object and only matter for the player, target
+    and focus, so they are cold. Level, flags and the other unit fields stay in the batch: they
+    share the one unit field block read, so reading them lazily would add reads, not save them.
+    """
+    __slots__ = ('base_address', 'mem', 'local_player_guid', 'table', 'slot', 'unit_fields_address',
+                 'descriptor_address', 'name', '_tick_fields')
+
+    # Object Types (WowObject models units/players; types 5-7 are the lazy classes in world_objects.py)
     TYPE_NONE = 0
     TYPE_UNIT = 3       # NPCs, Mobs
     TYPE_PLAYER = 4
-    # TYPE_GAMEOBJECT = 5 # Removed
-    # TYPE_DYNAMICOBJECT = 6 # Removed
-    # TYPE_CORPSE = 7 # Removed
+    TYPE_GAMEOBJECT = 5
+    TYPE_DYNAMICOBJECT = 6
+    TYPE_CORPSE = 7
+    TYPE_NAMES = {TYPE_NONE: "None", TYPE_UNIT: "Unit", TYPE_PLAYER: "Player",
+                  TYPE_GAMEOBJECT: "GameObject", TYPE_DYNAMICOBJECT: "DynamicObj", TYPE_CORPSE: "Corpse"}
 
     # --- Class IDs and Power Types for 3.3.5a ---
     CLASS_WARRIOR = 1
@@ -67,54 +87,72 @@ class WowObject:
 
     UNIT_FIELD_TARGET_GUID = 0x1C * 4
 
-    def __init__(self, base_address: int, mem_handler, local_player_guid: int = 0):
+    # --- Fields stored in the ObjectTable row (see object_table.py) ---
+    guid = TableColumn('guid')
+    type = TableColumn('type')
+    target_guid = TableColumn('target_guid') # Read early if Unit/Player
+    x_pos = TableColumn('x', float)
+    y_pos = TableColumn('y', float)
+    z_pos = TableColumn('z', float)
+    rotation = TableColumn('rotation', float)
+    level = TableColumn('level')
+    health = TableColumn('health')
+    max_health = TableColumn('max_health')
+    energy = TableColumn('power') # Current primary power
+    max_energy = TableColumn('max_power') # Max primary power
+    power_type = TableColumn('power_type') # Enum value (POWER_MANA, POWER_RAGE etc.)
+    unit_flags = TableColumn('flags') # Raw flags field
+    is_dead = TableColumn('dead', bool)
+    last_update_time = TableColumn('updated_at', float) # time.time() of the last dynamic update
+    next_due = TableColumn('next_due', float) # When the RefreshScheduler wants the next update
+
+    # --- Cold fields (TickField: read on first access per tick, not part of the batch update) ---
+    summoned_by_guid = TickField('UNIT_FIELD_SUMMONEDBY', 'ulonglong', base='unit_fields_address')
+    casting_spell_id = TickField('OBJECT_CASTING_SPELL_ID', base='base_address')
+    channeling_spell_id = TickField('OBJECT_CHANNEL_SPELL_ID', base='base_address')
+
+    def __init__(self, base_address: int, mem_handler, local_player_guid: int = 0, table: Optional[ObjectTable] = None,
+                 header: Optional[ObjectHeader] = None):
+        """
+        Args:
+            table: ObjectTable holding this object's row (ObjectManager.table). Objects created
+                   outside an ObjectManager get a private one-row table.
+            header: The object's header if the caller already read it (object list walk),
+                    so it is not read a second time.
+        """
         self.base_address = base_address
         self.mem = mem_handler
         self.local_player_guid = local_player_guid # Store the local player GUID if this is the local player
+        self.table = table if table is not None else ObjectTable(1)
+        self.slot = self.table.allocate() # Zeroed row: guid 0, TYPE_NONE, position 0...
+        self.power_type = -1
+        self._tick_fields = None # (tick_id, {field: value}) once a TickField was read
 
-        # --- Core properties read immediately ---
-        self.guid: int = 0
-        self.type: int = WowObject.TYPE_NONE
+        # --- Core properties read immediately (not table-backed: rarely touched in bulk) ---
         self.unit_fields_address: int = 0
         self.descriptor_address: int = 0
-        self.target_guid: int = 0 # Read early if Unit/Player
 
         # --- Properties updated dynamically or lazily ---
         self.name: str = ""
-        self.x_pos: float = 0.0
-        self.y_pos: float = 0.0
-        self.z_pos: float = 0.0
-        self.rotation: float = 0.0
-        self.level: int = 0
-        self.health: int = 0
-        self.max_health: int = 0
-        self.energy: int = 0 # Current primary power
-        self.max_energy: int = 0 # Max primary power
-        self.power_type: int = -1 # Enum value (POWER_MANA, POWER_RAGE etc.)
-        self.unit_flags: int = 0 # Raw flags field
-        self.summoned_by_guid: int = 0
-        self.casting_spell_id: int = 0
-        self.channeling_spell_id: int = 0
-        self.is_dead: bool = False
-        self.last_update_time: float = 0.0 # Track last dynamic update
 
         # Read initial essential data if base address is valid
         if self.base_address and self.mem and self.mem.is_attached():
-            self._read_core_data()
+            with self.mem.tagged("unit.core"):
+                self._read_core_data(header)
 
-    def _read_core_data(self):
+    def _read_core_data(self, header: Optional[ObjectHeader] = None):
         """Reads the most essential data (GUID, Type, Field/Descriptor Ptrs, TargetGUID)."""
-        # import offsets # Usually not needed here if imported globally
-
-        self.guid = self.mem.read_ulonglong(self.base_address + offsets.OBJECT_GUID)
-        self.type = self.mem.read_short(self.base_address + offsets.OBJECT_TYPE) # Use read_short for 2 bytes
+        # GUID, type and the field/descriptor pointers all sit in the object header -> one record read
+        if header is None: header = self.mem.read_object_header(self.base_address)
+        if header is None: return
+        self.guid = header.guid
+        self.type = header.type
+        unit_fields_ptr = header.unit_fields
+        descriptor_ptr = header.unit_fields # OBJECT_DESCRIPTOR_OFFSET == OBJECT_UNIT_FIELDS (0x8)
 
         if self.type == WowObject.TYPE_UNIT or self.type == WowObject.TYPE_PLAYER:
-            unit_fields_ptr_addr = self.base_address + offsets.OBJECT_UNIT_FIELDS
-            self.unit_fields_address = self.mem.read_uint(unit_fields_ptr_addr)
-
-            descriptor_ptr_addr = self.base_address + offsets.OBJECT_DESCRIPTOR_OFFSET
-            self.descriptor_address = self.mem.read_uint(descriptor_ptr_addr)
+            self.unit_fields_address = unit_fields_ptr
+            self.descriptor_address = descriptor_ptr
 
             # Read target GUID immediately if unit/player and fields ptr is valid
             if self.unit_fields_address:
@@ -122,139 +160,79 @@ class WowObject:
                  self.target_guid = self.mem.read_ulonglong(target_guid_addr)
 
 
+    def relocate(self, base_address: int, header: Optional[ObjectHeader] = None):
+        """Points this object at a new base address (same GUID, object moved) and re-reads its core data."""
+        self.base_address = base_address
+        self.unit_fields_address = 0
+        self.descriptor_address = 0
+        self._tick_fields = None
+        if self.base_address and self.mem and self.mem.is_attached():
+            with self.mem.tagged("unit.core"):
+                self._read_core_data(header)
+
+    def dynamic_read_ranges(self) -> list:
+        """(address, length) ranges update_dynamic_data reads, for MemoryHandler.prefetch."""
+        if not self.base_address: return []
+        base = self.base_address
+        ranges = [(base + _POSITION_START, _POSITION_SIZE)]
+        if self.unit_fields_address: ranges.append((self.unit_fields_address + offsets.UNIT_FIELD_BLOCK_START, offsets.UNIT_FIELD_BLOCK_SIZE))
+        return ranges
+
+    def __del__(self):
+        # Row goes back to the free list once nothing references this object any more. That can
+        # happen on any thread holding the last reference; ObjectTable.release takes the table lock,
+        # and only the producer allocates or writes rows, so the slot is not reused mid-batch.
+        table = getattr(self, 'table', None) # Unset if __init__ failed early
+        if table is not None: table.release(self.slot)
+
     def update_dynamic_data(self, force_update=False):
         """Updates frequently changing data. Optional throttling."""
-        now = time.time()
         # Throttle updates unless forced (e.g., reduce updates for non-target units)
         # Add more sophisticated throttling later if needed
-        # if not force_update and now < self.last_update_time + 0.1: # Update max 10 times/sec
+        # if not force_update and time.time() < self.last_update_time + 0.1: # Update max 10 times/sec
         #      return
-
-        if not self.base_address or not self.mem or not self.mem.is_attached():
-            return
-        # import offsets # Local import
-
-        # --- Position and Rotation ---
-        self.x_pos = self.mem.read_float(self.base_address + offsets.OBJECT_POS_X)
-        self.y_pos = self.mem.read_float(self.base_address + offsets.OBJECT_POS_Y)
-        self.z_pos = self.mem.read_float(self.base_address + offsets.OBJECT_POS_Z)
-        self.rotation = self.mem.read_float(self.base_address + offsets.OBJECT_ROTATION)
-
-        # --- DEBUG LOG --- Check Position Read
-        # if self.type in [WowObject.TYPE_UNIT, WowObject.TYPE_PLAYER] and self.guid != self.local_player_guid: # Log only other units/players
-        #     print(f"[DEBUG WOW_OBJ {self.guid:X}] Pos: ({self.x_pos:.1f}, {self.y_pos:.1f}, {self.z_pos:.1f}) from base {self.base_address:X}")
-
-        # --- Data primarily from Unit Fields (Check if pointer is valid!) ---
-        if self.unit_fields_address:
-            # --- Health and Level ---
-            self.health = self.mem.read_uint(self.unit_fields_address + offsets.UNIT_FIELD_HEALTH)
-            self.max_health = self.mem.read_uint(self.unit_fields_address + offsets.UNIT_FIELD_MAXHEALTH)
-            self.level = self.mem.read_uint(self.unit_fields_address + offsets.UNIT_FIELD_LEVEL)
-
-            # --- DEBUG LOG --- Check Health Read
-            # if self.type in [WowObject.TYPE_UNIT, WowObject.TYPE_PLAYER] and self.guid != self.local_player_guid:
-            #     print(f"[DEBUG WOW_OBJ {self.guid:X}] Health: {self.health}/{self.max_health} from UnitFields {self.unit_fields_address:X}")
-
-            # --- Flags ---
-            self.unit_flags = self.mem.read_uint(self.unit_fields_address + offsets.UNIT_FIELD_FLAGS)
-
-            # --- Summoner ---
-            self.summoned_by_guid = self.mem.read_ulonglong(self.unit_fields_address + offsets.UNIT_FIELD_SUMMONEDBY)
-
-            # --- Target (might have changed) ---
-            self.target_guid = self.mem.read_ulonglong(self.unit_fields_address + offsets.UNIT_FIELD_TARGET_GUID)
-
-            # --- Power Reading (Needs Power Type first) ---
-            # Determine Power Type (Descriptor preferred)
-            current_power_type = -1
-
-            # Try reading power type from UNIT_FIELD_BYTES_0 (Byte 3) first - often reliable
-            bytes_0_addr = self.unit_fields_address + offsets.UNIT_FIELD_BYTES_0
-            bytes_0_val = self.mem.read_uint(bytes_0_addr)
-            current_power_type = (bytes_0_val >> 24) & 0xFF # 4th byte
-            if current_power_type > 10: # If invalid, try descriptor
-                 current_power_type = -1 # Reset before trying descriptor
-                 if self.descriptor_address:
-                      power_type_addr = self.descriptor_address + offsets.UNIT_FIELD_POWER_TYPE_BYTE_FROM_DESCRIPTOR # Offset 0x47
-                      current_power_type = self.mem.read_uchar(power_type_addr)
-                      if current_power_type > 10: current_power_type = -1 # Sanity check descriptor result
-
-            # Fallback if descriptor fails or type invalid (This part is now less likely to be needed)
-            # if current_power_type == -1:
-            #    # Already tried bytes_0 above, so this fallback is redundant
-            #    pass
-
-            self.power_type = current_power_type
-
-            # Read Current and Max Power based on determined type
-            if self.power_type != -1:
-                # --- Current Power ---
-                # Reverting to original logic that used specific offsets per type
-                current_power_addr = 0
-                if self.power_type == WowObject.POWER_MANA: current_power_addr = self.unit_fields_address + (0x19 * 4) # UNIT_FIELD_POWER1 ?
-                elif self.power_type == WowObject.POWER_RAGE: current_power_addr = self.unit_fields_address + (0x19 * 4) # UNIT_FIELD_POWER1 ?
-                elif self.power_type == WowObject.POWER_FOCUS: current_power_addr = self.unit_fields_address + (0x1A * 4) # UF + 0x68 << UNTESTED
-                elif self.power_type == WowObject.POWER_ENERGY:
-                    # User confirmation: Address UF + 0x70 (calculated MaxEnergy offset) shows current energy
-                    current_power_addr = self.unit_fields_address + 0x70
-                    # current_power_addr = self.unit_fields_address + 0x64 # Tried this - Incorrect
-                    # current_power_addr = self.unit_fields_address + 0x58 # UF + 0x58 << IDA Offset - FAILED
-                # elif self.power_type == WowObject.POWER_HAPPINESS: current_power_addr = self.unit_fields_address + (0x1C * 4) # UNIT_FIELD_POWER4 ?
-                # Skip Runes (complex)
-                elif self.power_type == WowObject.POWER_RUNIC_POWER: current_power_addr = self.unit_fields_address + (0x1E * 4) # UF + 0x78 << UNTESTED
-                else: current_power_addr = self.unit_fields_address + (0x19 * 4) # Default to POWER1
-
-                read_value = 0 # Initialize before read
-                if current_power_addr:
-                    # Try reading as bytes and converting manually (as per original logic)
-                    raw_bytes = self.mem.read_bytes(current_power_addr, 4)
-                    if raw_bytes and len(raw_bytes) == 4:
-                        try:
-                            read_value = int.from_bytes(raw_bytes, 'little')
-                        except ValueError:
-                            # print(f\"[WOW_OBJECT] Error converting bytes {raw_bytes.hex()} to int at {current_power_addr:X}\", \"ERROR\")
-                            read_value = 0 # Ensure it's zero on conversion failure
-                    else:
-                        read_value = 0 # Ensure it's zero if read fails
-                else:
-                    read_value = 0 # Ensure it's zero if address was not determined
-
-                self.energy = read_value # Assign whatever was read (or 0) to self.energy
-
-                # --- Max Power ---
-                # Using the original logic that was present
-                if self.power_type == WowObject.POWER_ENERGY:
-                    max_power_addr = self.unit_fields_address + 0x6C
-                else: # Use the offset that worked for Max Mana
-                    max_power_base_offset = 0x64
-                    max_power_addr = self.unit_fields_address + max_power_base_offset + (self.power_type * 4)
-
-                self.max_energy = self.mem.read_uint(max_power_addr)
-
-                # --- Fallback for Max Energy (Keep this) ---
-                if self.power_type == WowObject.POWER_ENERGY and (self.max_energy <= 0 or self.max_energy > 150):
-                    self.max_energy = 100
-                    #print(\"DEBUG: Max Energy read failed or invalid, using fallback 100\", \"DEBUG\")
-
-            else: # Invalid or unhandled power type
-                self.energy = 0
-                self.max_energy = 0
-
-        # --- Casting/Channeling Info (from object base offsets) ---
-        # These seem more reliable based on common usage
-        self.casting_spell_id = self.mem.read_uint(self.base_address + offsets.OBJECT_CASTING_SPELL_ID)
-        self.channeling_spell_id = self.mem.read_uint(self.base_address + offsets.OBJECT_CHANNEL_SPELL_ID)
-
-        # --- Derived States ---
-        self.is_dead = (self.health <= 0) or self.has_flag(WowObject.UNIT_FLAG_SKINNABLE)
-
-        self.last_update_time = now # Record update time
+        update_dynamic_batch([self])
+
+    @staticmethod
+    def power_field_offsets(power_type: int):
+        """(current, max) power offsets in the unit field block for a power type."""
+        # --- Current Power ---
+        # Reverting to original logic that used specific offsets per type
+        if power_type == WowObject.POWER_MANA: current_power_offset = 0x19 * 4 # UNIT_FIELD_POWER1 ?
+        elif power_type == WowObject.POWER_RAGE: current_power_offset = 0x19 * 4 # UNIT_FIELD_POWER1 ?
+        elif power_type == WowObject.POWER_FOCUS: current_power_offset = 0x1A * 4 # UF + 0x68 << UNTESTED
+        elif power_type == WowObject.POWER_ENERGY:
+            # User confirmation: Address UF + 0x70 (calculated MaxEnergy offset) shows current energy
+            current_power_offset = 0x70
+            # current_power_offset = 0x64 # Tried this - Incorrect
+            # current_power_offset = 0x58 # UF + 0x58 << IDA Offset - FAILED
+        # elif power_type == WowObject.POWER_HAPPINESS: current_power_offset = 0x1C * 4 # UNIT_FIELD_POWER4 ?
+        # Skip Runes (complex)
+        elif power_type == WowObject.POWER_RUNIC_POWER: current_power_offset = 0x1E * 4 # UF + 0x78 << UNTESTED
+        else: current_power_offset = 0x19 * 4 # Default to POWER1
+
+        # --- Max Power ---
+        # Using the original logic that was present
+        if power_type == WowObject.POWER_ENERGY:
+            max_power_offset = 0x6C
+        else: # Use the offset that worked for Max Mana
+            max_power_base_offset = 0x64
+            max_power_offset = max_power_base_offset + (power_type * 4)
+        return current_power_offset, max_power_offset
 
     # --- Property helpers for Flags ---
     def has_flag(self, flag: int) -> bool:
         """Checks if the unit has a specific flag set."""
         return bool(self.unit_flags & flag)
 
+    @property
+    def generation(self) -> int:
+        """
+        Identity of this object incarnation, for caches keyed on memory addresses (string cache).
+        A freed address can be reused by another object, but never under the same GUID.
+        """
+        return self.guid
+
     @property
     def is_player(self) -> bool:
         return self.type == WowObject.TYPE_PLAYER
@@ -303,26 +281,11 @@ class WowObject:
 
     def get_type_str(self) -> str:
         """Returns a human-readable string for the object's type."""
-        type_map = {
-            WowObject.TYPE_NONE: "None",
-            WowObject.TYPE_UNIT: "Unit",
-            WowObject.TYPE_PLAYER: "Player",
-            # WowObject.TYPE_GAMEOBJECT: "GameObject", # Removed
-            # WowObject.TYPE_DYNAMICOBJECT: "DynamicObj", # Removed
-            # WowObject.TYPE_CORPSE: "Corpse" # Removed
-        }
-        return type_map.get(self.type, "Unknown")
+        return WowObject.TYPE_NAMES.get(self.type, "Unknown")
 
     def __str__(self):
         name_str = self.get_name()
-        type_map = {
-            WowObject.TYPE_NONE: "None",
-            WowObject.TYPE_UNIT: "Unit", WowObject.TYPE_PLAYER: "Player",
-            # WowObject.TYPE_GAMEOBJECT: "GameObject", # Removed
-            # WowObject.TYPE_DYNAMICOBJECT: "DynObj", # Removed
-            # WowObject.TYPE_CORPSE: "Corpse", # Removed
-        }
-        obj_type_str = type_map.get(self.type, f"Type{self.type}")
+        obj_type_str = WowObject.TYPE_NAMES.get(self.type, f"Type{self.type}")
         guid_hex = f"0x{self.guid:X}"
 
         details = f"<{obj_type_str} '{name_str}' GUID:{guid_hex}"
@@ -347,71 +310,206 @@ class WowObject:
         # Provide a concise representation, useful for debugging collections
         return f"WowObject(GUID=0x{self.guid:X}, Base=0x{self.base_address:X}, Type={self.type})"
 
-    def has_aura_by_id(self, spell_id_to_find: int) -> bool:
+    def get_auras(self) -> List[AuraEntry]:
         """
-        Checks if this object has an aura with the specified spell ID by reading memory directly.
+        Reads this object's aura table (AuraEntry records) directly from memory.
         Uses the logic derived from the 3.3.5a client's internal functions/structures.
         Corrected logic based on disassembly analysis for Table 1 vs Table 2.
         """
-        # print(f"[AuraCheck DEBUG {self.guid:X}] Checking for SpellID {spell_id_to_find}", file=sys.stderr) # DEBUG START - Keep if needed
-
-        if not self.base_address or not self.mem or not self.mem.is_attached() or spell_id_to_find <= 0:
-            # print(f"[AuraCheck DEBUG {self.guid:X}] Pre-check failed (Base: {self.base_address:X}, Mem: {self.mem is not None}, Attached: {self.mem.is_attached() if self.mem else False}, SpellID: {spell_id_to_find})", file=sys.stderr) # DEBUG
-            return False
+        if not self.base_address or not self.mem or not self.mem.is_attached():
+            # print(f"[AuraCheck DEBUG {self.guid:X}] Pre-check failed (Base: {self.base_address:X}, Mem: {self.mem is not None}, Attached: {self.mem.is_attached() if self.mem else False})", file=sys.stderr) # DEBUG
+            return []
 
         aura_count = 0
         aura_table_base_addr = 0 # Corrected variable name for clarity
         max_auras_sanity_check = 100 # Reasonable upper limit for auras
 
         try:
-            # Determine which aura count and table to use based on AURA_COUNT_1
-            count1_addr = self.base_address + offsets.AURA_COUNT_1_OFFSET
-            count1 = self.mem.read_uint(count1_addr)
-            # print(f"[AuraCheck DEBUG {self.guid:X}] Read Count1 from {count1_addr:X}: {count1}", file=sys.stderr) # DEBUG
-
-            if count1 == 0xFFFFFFFF:
-                # Use Table 2 / Count 2 - Logic is pointer-based
-                count2_addr = self.base_address + offsets.AURA_COUNT_2_OFFSET
-                table2_ptr_addr = self.base_address + offsets.AURA_TABLE_2_OFFSET
-                aura_count = self.mem.read_uint(count2_addr)
-                aura_table_base_addr = self.mem.read_uint(table2_ptr_addr) # Read the pointer
-                # print(f"[AuraCheck DEBUG {self.guid:X}] Using Table 2. Count={aura_count} from {count2_addr:X}, TableAddr={aura_table_base_addr:X} from {table2_ptr_addr:X}", file=sys.stderr) # DEBUG
-            else:
-                # Use Table 1 / Count 1 - Logic is direct offset-based
-                aura_count = count1
-                # The base address of the table *is* UnitBase + AURA_TABLE_1_OFFSET
-                aura_table_base_addr = self.base_address + offsets.AURA_TABLE_1_OFFSET
-                # print(f"[AuraCheck DEBUG {self.guid:X}] Using Table 1. Count={aura_count}, TableAddr={aura_table_base_addr:X} (Direct Offset)", file=sys.stderr) # DEBUG
-
-            # Validate count and pointer/address
-            if aura_table_base_addr == 0 or aura_count <= 0 or aura_count > max_auras_sanity_check:
-                # print(f"[AuraCheck DEBUG {self.guid:X}] Validation Failed (Addr: {aura_table_base_addr:X}, Count: {aura_count})", file=sys.stderr) # DEBUG
-                return False # No auras or invalid data
-
-            # Iterate through the aura table
-            # print(f"[AuraCheck DEBUG {self.guid:X}] Iterating {aura_count} auras from table base {aura_table_base_addr:X}...", file=sys.stderr) # DEBUG
-            for i in range(aura_count):
-                aura_struct_addr = aura_table_base_addr + i * offsets.AURA_STRUCT_SIZE
-                spell_id_offset_addr = aura_struct_addr + offsets.AURA_STRUCT_SPELL_ID_OFFSET
-                # Read the Spell ID from the aura structure
-                current_spell_id = self.mem.read_uint(spell_id_offset_addr)
-
-                # Optional: Print details for debugging specific spells
-                # if i < 5 or current_spell_id == spell_id_to_find:
-                #     print(f"[AuraCheck DEBUG {self.guid:X}] Index {i}: Struct@{aura_struct_addr:X}, SpellID@{spell_id_offset_addr:X} -> Found SpellID: {current_spell_id}", file=sys.stderr) # DEBUG
-
-                if current_spell_id == spell_id_to_find:
-                    # print(f"[AuraCheck DEBUG {self.guid:X}] Found matching SpellID {spell_id_to_find} at index {i}", file=sys.stderr) # DEBUG FOUND
-                    return True # Found the aura
-
-        except pymem.exception.MemoryReadError as e:
+            with self.mem.tagged("aura"):
+                # Determine which aura count and table to use based on AURA_COUNT_1
+                count1_addr = self.base_address + offsets.AURA_COUNT_1_OFFSET
+                count1 = self.mem.read_uint(count1_addr)
+                # print(f"[AuraCheck DEBUG {self.guid:X}] Read Count1 from {count1_addr:X}: {count1}", file=sys.stderr) # DEBUG
+
+                if count1 == 0xFFFFFFFF:
+                    # Use Table 2 / Count 2 - Logic is pointer-based
+                    count2_addr = self.base_address + offsets.AURA_COUNT_2_OFFSET
+                    table2_ptr_addr = self.base_address + offsets.AURA_TABLE_2_OFFSET
+                    aura_count, aura_table_base_addr = self.mem.read_many([(count2_addr, 'uint'), (table2_ptr_addr, 'uint')]) # Count + table pointer
+                    # print(f"[AuraCheck DEBUG {self.guid:X}] Using Table 2. Count={aura_count} from {count2_addr:X}, TableAddr={aura_table_base_addr:X} from {table2_ptr_addr:X}", file=sys.stderr) # DEBUG
+                else:
+                    # Use Table 1 / Count 1 - Logic is direct offset-based
+                    aura_count = count1
+                    # The base address of the table *is* UnitBase + AURA_TABLE_1_OFFSET
+                    aura_table_base_addr = self.base_address + offsets.AURA_TABLE_1_OFFSET
+                    # print(f"[AuraCheck DEBUG {self.guid:X}] Using Table 1. Count={aura_count}, TableAddr={aura_table_base_addr:X} (Direct Offset)", file=sys.stderr) # DEBUG
+
+                # Validate count and pointer/address
+                if aura_table_base_addr == 0 or aura_count <= 0 or aura_count > max_auras_sanity_check:
+                    # print(f"[AuraCheck DEBUG {self.guid:X}] Validation Failed (Addr: {aura_table_base_addr:X}, Count: {aura_count})", file=sys.stderr) # DEBUG
+                    return [] # No auras or invalid data
+
+                # Read the whole aura table as records in one go
+                # print(f"[AuraCheck DEBUG {self.guid:X}] Reading {aura_count} auras from table base {aura_table_base_addr:X}...", file=sys.stderr) # DEBUG
+                return self.mem.read_aura_entries(aura_table_base_addr, aura_count)
+
+        except MemoryReadError as e:
             # print(f"[AuraCheck ERROR {self.guid:X}] MemoryReadError: {e}", file=sys.stderr) # DEBUG ERROR
-            return False
+            return []
         except Exception as e:
             # print(f"[AuraCheck ERROR {self.guid:X}] Unexpected Error: {e}", file=sys.stderr) # DEBUG ERROR
-            return False
+            return []
 
-        # print(f"[AuraCheck DEBUG {self.guid:X}] SpellID {spell_id_to_find} not found after checking {aura_count} auras.", file=sys.stderr) # DEBUG NOT FOUND
+    def has_aura_by_id(self, spell_id_to_find: int) -> bool:
+        """Checks if this object has an aura with the specified spell ID by reading memory directly (see get_auras)."""
+        # print(f"[AuraCheck DEBUG {self.guid:X}] Checking for SpellID {spell_id_to_find}", file=sys.stderr) # DEBUG START - Keep if needed
+        if spell_id_to_find <= 0: return False
+        for i, aura in enumerate(self.get_auras()):
+            # Optional: Print details for debugging specific spells
+            # if i < 5 or aura.spell_id == spell_id_to_find:
+            #     print(f"[AuraCheck DEBUG {self.guid:X}] Index {i}: SpellID {aura.spell_id}, Caster 0x{aura.caster_guid:X}, Stacks {aura.stack_count}", file=sys.stderr) # DEBUG
+
+            if aura.spell_id == spell_id_to_find:
+                # print(f"[AuraCheck DEBUG {self.guid:X}] Found matching SpellID {spell_id_to_find} at index {i}", file=sys.stderr) # DEBUG FOUND
+                return True # Found the aura
+
+        # print(f"[AuraCheck DEBUG {self.guid:X}] SpellID {spell_id_to_find} not found.", file=sys.stderr) # DEBUG NOT FOUND
         return False # Aura not found
 
-    
\ No newline at end of file
+
+
+# --- Parallel Read Settings (see update_dynamic_batch) ---
+PARALLEL_READ_WORKERS = 0      # Threads in ObjectManager's read pool (0 = reads stay on the refreshing thread)
+PARALLEL_READ_THRESHOLD = 200  # Batches smaller than this are read on the calling thread even with a pool
+PARALLEL_MIN_SHARD = 50        # Objects per shard at least (smaller shards cost more to hand off than they save)
+
+# --- Bulk Dynamic Update ---
+_MAX_POWER_TYPE = 10
+
+def _derive_offsets():
+    """(Re)computes the read ranges below from offsets.py - again whenever the signature scanner updates offsets."""
+    global _POSITION_START, _POSITION_SIZE, _POWER_WORDS
+    # Byte range of the object base that holds position/rotation
+    _POSITION_START = min(offsets.OBJECT_POS_X, offsets.OBJECT_POS_Y, offsets.OBJECT_POS_Z, offsets.OBJECT_ROTATION)
+    _POSITION_SIZE = max(offsets.OBJECT_POS_X, offsets.OBJECT_POS_Y, offsets.OBJECT_POS_Z, offsets.OBJECT_ROTATION) + 4 - _POSITION_START
+    # Word index (uint32) in the unit field block of the current / max power field per power type 0..10
+    _POWER_WORDS = (np.array([WowObject.power_field_offsets(power_type) for power_type in range(_MAX_POWER_TYPE + 1)], dtype=np.intp)
+                    - offsets.UNIT_FIELD_BLOCK_START) // 4
+
+_derive_offsets()
+on_offsets_changed(_derive_offsets)
+
+def _block_word(offset: int) -> int:
+    """Word index in the unit field block of the unit field at byte `offset` from the UnitFields pointer."""
+    return (offset - offsets.UNIT_FIELD_BLOCK_START) // 4
+
+def _uint64_column(words: np.ndarray, offset: int) -> np.ndarray:
+    """uint64 unit field at byte `offset` of each row of a block word matrix (fields are only 4-byte aligned)."""
+    index = _block_word(offset)
+    return words[:, index].astype(np.uint64) | (words[:, index + 1].astype(np.uint64) << np.uint64(32))
+
+def _read_dynamic_rows(objects: Sequence[WowObject], rows: range, position_raw: bytearray, block_raw: bytearray):
+    """
+    Reads the dynamic records of objects[rows] into their rows of the raw buffers. Shards write
+    disjoint slices of the same buffers, so several can run at once (see update_dynamic_batch,
+    which runs them through _read_shard).
+    """
+    mem = objects[0].mem
+    block_size = offsets.UNIT_FIELD_BLOCK_SIZE
+    with mem.tagged("unit.dynamic"): # Tags are per thread: set in the worker
+        for i in rows:
+            obj = objects[i]
+            base = obj.base_address
+            data = mem.read_bytes(base + _POSITION_START, _POSITION_SIZE)
+            if data: position_raw[i * _POSITION_SIZE:(i + 1) * _POSITION_SIZE] = data
+            if obj.unit_fields_address:
+                data = mem.read_bytes(obj.unit_fields_address + offsets.UNIT_FIELD_BLOCK_START, block_size)
+                if data: block_raw[i * block_size:(i + 1) * block_size] = data
+
+def _read_shard(objects: Sequence[WowObject], rows: range, position_raw: bytearray, block_raw: bytearray):
+    """_read_dynamic_rows on a pool thread. Returns the worker's WorkerReads for the caller to merge."""
+    with objects[0].mem.worker_reads() as reads:
+        _read_dynamic_rows(objects, rows, position_raw, block_raw)
+    return reads
+
+def update_dynamic_batch(objects: Sequence[WowObject], executor: Optional[Executor] = None, workers: int = 0,
+                         threshold: int = PARALLEL_READ_THRESHOLD):
+    """
+    Reads the dynamic fields of every object in `objects` (all sharing one ObjectTable) and
+    writes them into the table as column-wide array assignments. The reads are the same
+    per-object records update_dynamic_data always used (position, unit field block);
+    only decoding and storing happen once for the whole batch. This replaces a per-object unit
+    field block record reader: one np.frombuffer over every block beats a struct unpack per object.
+
+    With an `executor` (`workers` threads) and at least `threshold` objects, the reads are split
+    into contiguous shards run on the pool - backend reads (ReadProcessMemory, process_vm_readv)
+    release the GIL - and joined before anything is decoded. Not while a capture is recording
+    (the recorder expects one reading thread).
+    """
+    objects = [obj for obj in objects if obj.base_address]
+    if not objects: return
+    mem = objects[0].mem
+    table = objects[0].table
+    if not mem or not mem.is_attached(): return
+
+    count = len(objects)
+    now = time.time()
+    position_raw = bytearray(count * _POSITION_SIZE) # Unreadable records stay zero (as failed reads did)
+    block_size = offsets.UNIT_FIELD_BLOCK_SIZE
+    block_raw = bytearray(count * block_size)
+    unit_rows = [i for i, obj in enumerate(objects) if obj.unit_fields_address] # Units/players with a unit field pointer
+
+    shards = min(workers, count // PARALLEL_MIN_SHARD) if executor is not None and count >= threshold and mem.recorder is None else 1
+    if shards > 1:
+        bounds = [count * shard // shards for shard in range(shards + 1)]
+        futures = [executor.submit(_read_shard, objects, range(start, end), position_raw, block_raw)
+                   for start, end in zip(bounds, bounds[1:])]
+        # Join (re-raises a worker's exception); worker pages/counters go into the cache on this thread
+        for future in futures: mem.merge_worker_reads(future.result())
+    else:
+        _read_dynamic_rows(objects, range(count), position_raw, block_raw)
+
+    columns = table.columns
+    slots = np.fromiter((obj.slot for obj in objects), dtype=np.intp, count=count)
+    columns['updated_at'][slots] = now
+
+    # --- Position and Rotation (from object base offsets) ---
+    positions = np.frombuffer(position_raw, dtype='<f4').reshape(count, _POSITION_SIZE // 4)
+    columns['x'][slots] = positions[:, (offsets.OBJECT_POS_X - _POSITION_START) // 4]
+    columns['y'][slots] = positions[:, (offsets.OBJECT_POS_Y - _POSITION_START) // 4]
+    columns['z'][slots] = positions[:, (offsets.OBJECT_POS_Z - _POSITION_START) // 4]
+    columns['rotation'][slots] = positions[:, (offsets.OBJECT_ROTATION - _POSITION_START) // 4]
+
+    # --- Data primarily from Unit Fields (unreadable blocks decode as all-zero) ---
+    if unit_rows:
+        unit_slots = slots[unit_rows]
+        words = np.frombuffer(block_raw, dtype='<u4').reshape(count, block_size // 4)[unit_rows]
+        columns['health'][unit_slots] = words[:, _block_word(offsets.UNIT_FIELD_HEALTH)]
+        columns['max_health'][unit_slots] = words[:, _block_word(offsets.UNIT_FIELD_MAXHEALTH)]
+        columns['level'][unit_slots] = words[:, _block_word(offsets.UNIT_FIELD_LEVEL)]
+        columns['flags'][unit_slots] = words[:, _block_word(offsets.UNIT_FIELD_FLAGS)]
+        columns['target_guid'][unit_slots] = _uint64_column(words, offsets.UNIT_FIELD_TARGET_GUID)
+
+        # --- Power Reading (Needs Power Type first) ---
+        # Try reading power type from UNIT_FIELD_BYTES_0 (Byte 3) first - often reliable
+        power_types = ((words[:, _block_word(offsets.UNIT_FIELD_BYTES_0)] >> 24) & 0xFF).astype(np.intp) # 4th byte
+        for row in np.flatnonzero(power_types > _MAX_POWER_TYPE): # If invalid, try descriptor (rare)
+            descriptor = objects[unit_rows[row]].descriptor_address
+            power_type = mem.read_uchar(descriptor + offsets.UNIT_FIELD_POWER_TYPE_BYTE_FROM_DESCRIPTOR) if descriptor else -1
+            power_types[row] = power_type if 0 <= power_type <= _MAX_POWER_TYPE else -1 # Sanity check descriptor result
+        columns['power_type'][unit_slots] = power_types
+
+        # Read Current and Max Power based on determined type (invalid or unhandled type -> 0)
+        valid = power_types >= 0
+        lookup = np.where(valid, power_types, 0)
+        rows = np.arange(len(unit_rows))
+        energy = np.where(valid, words[rows, _POWER_WORDS[lookup, 0]], 0)
+        max_energy = np.where(valid, words[rows, _POWER_WORDS[lookup, 1]], 0)
+        # --- Fallback for Max Energy (Keep this) ---
+        energy_fallback = (power_types == WowObject.POWER_ENERGY) & ((max_energy <= 0) | (max_energy > 150))
+        max_energy[energy_fallback] = 100
+        columns['power'][unit_slots] = energy
+        columns['max_power'][unit_slots] = max_energy
+
+    # --- Derived States ---
+    columns['dead'][slots] = (columns['health'][slots] <= 0) | ((columns['flags'][slots] & WowObject.UNIT_FLAG_SKINNABLE) != 0)